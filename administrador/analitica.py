@@ -0,0 +1,375 @@
+"""
+Analítica operativa vectorizada con NumPy - Salud Rural
+
+Métricas de un periodo (desde/hasta, por fecha de la agenda) por médico,
+especialidad, vereda y semana:
+
+- cupos: franjas de Agenda publicadas
+- citas: citas agendadas en esas franjas (demanda)
+- utilizacion: citas no canceladas / cupos
+- tasa_cancelacion: canceladas / citas
+- tasa_inasistencia: citas ya pasadas que no se completaron ni cancelaron
+  (no hay un estado de inasistencia; es la mejor aproximación) / citas
+- horas_aceptacion (media y mediana): de 'cita_creada' a 'cita_aceptada'
+  según la bandeja de salida (notificacion_saliente). Solo cuenta citas con
+  ambos eventos registrados
+
+Carga: tres consultas que devuelven solo enteros (ID, días desde 'desde',
+código de estado), leídas por bloques y convertidas a arreglos NumPy. Toda
+la agregación es bincount / repeat / lexsort sobre esos arreglos: no hay
+un bucle de Python por cita, así que millones de citas se resumen en
+segundos y con pocos MB (unos 20 bytes por cita).
+
+Especialidad es muchos-a-muchos con médico: una cita cuenta una vez en cada
+especialidad de su médico (las filas se expanden con np.repeat).
+
+Los resultados se guardan en la caché por periodo (resumen_cacheado).
+"""
+
+from datetime import timedelta
+
+import numpy as np
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+from django.utils import timezone
+
+
+# Filas leídas por bloque al cargar columnas
+LOTE_LECTURA = 50_000
+
+# Códigos de estado de cita (se calculan en el SQL)
+PENDIENTE, CANCELADA, COMPLETADA = 0, 1, 2
+
+# Segundos en caché: periodos cerrados no cambian; el abierto sí
+CACHE_SEGUNDOS = getattr(settings, "ANALITICA_CACHE_SEGUNDOS", 600)
+CACHE_SEGUNDOS_CERRADO = 24 * 3600
+
+SQL_MEDICOS = """
+    SELECT m.ID_Medico, COALESCE(m.Vereda, ''),
+           CONCAT_WS(' ', u.Nombre, u.Apellidos)
+    FROM medico m
+    JOIN usuario u ON u.ID_Usuario = m.ID_Usuario
+    ORDER BY m.ID_Medico
+"""
+
+SQL_ESPECIALIDADES = """
+    SELECT me.ID_Medico, e.ID_Especialidad, e.Nombre
+    FROM Medico_Especialidad me
+    JOIN Especialidad e ON e.ID_Especialidad = me.ID_Especialidad
+"""
+
+SQL_AGENDA = """
+    SELECT ID_Medico, DATEDIFF(Fecha, %s)
+    FROM Agenda
+    WHERE Fecha BETWEEN %s AND %s
+"""
+
+SQL_CITAS = """
+    SELECT c.ID_Cita, c.ID_Medico, DATEDIFF(a.Fecha, %s),
+           CASE c.Estado
+               WHEN 'Cancelada' THEN 1
+               WHEN 'Completada' THEN 2
+               WHEN 'Atendida' THEN 2
+               ELSE 0
+           END
+    FROM cita c
+    JOIN Agenda a ON a.ID_Agenda = c.ID_Agenda
+    WHERE a.Fecha BETWEEN %s AND %s
+    ORDER BY c.ID_Cita
+"""
+
+SQL_ACEPTACION = """
+    SELECT ID_Cita,
+           TIMESTAMPDIFF(
+               SECOND,
+               MIN(CASE WHEN Evento = 'cita_creada' THEN Creado END),
+               MIN(CASE WHEN Evento = 'cita_aceptada' THEN Creado END)
+           ) AS segundos
+    FROM notificacion_saliente
+    WHERE ID_Cita BETWEEN %s AND %s
+      AND Evento IN ('cita_creada', 'cita_aceptada')
+    GROUP BY ID_Cita
+    HAVING segundos IS NOT NULL
+"""
+
+
+# =============================================================================
+# CARGA
+# =============================================================================
+
+def _columnas(sql, params, n_columnas):
+    """Ejecuta una consulta de enteros y devuelve una matriz int64 (filas × columnas)."""
+    bloques = []
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        while True:
+            filas = cursor.fetchmany(LOTE_LECTURA)
+            if not filas:
+                break
+            bloques.append(np.array(filas, dtype=np.int64))
+    if not bloques:
+        return np.empty((0, n_columnas), dtype=np.int64)
+    return np.concatenate(bloques)
+
+
+def _catalogos():
+    """Médicos (con vereda y nombre) y pares médico-especialidad."""
+    with connection.cursor() as cursor:
+        cursor.execute(SQL_MEDICOS)
+        medicos = cursor.fetchall()
+        cursor.execute(SQL_ESPECIALIDADES)
+        especialidades = cursor.fetchall()
+    return medicos, especialidades
+
+
+# =============================================================================
+# AGREGACIÓN
+# =============================================================================
+
+def _expandir(fila_medico, par_medico, par_grupo, n_medicos):
+    """
+    Repite cada fila una vez por grupo de su médico (relación N:M).
+
+    Returns:
+        tuple: (índices de fila, grupo de cada repetición)
+    """
+    orden = np.argsort(par_medico, kind="stable")
+    par_medico, par_grupo = par_medico[orden], par_grupo[orden]
+    por_medico = np.bincount(par_medico, minlength=n_medicos)
+    inicio = np.cumsum(por_medico) - por_medico
+
+    repeticiones = por_medico[fila_medico]
+    filas = np.repeat(np.arange(len(fila_medico)), repeticiones)
+    base = np.repeat(np.cumsum(repeticiones) - repeticiones, repeticiones)
+    posicion = np.arange(repeticiones.sum()) - base
+    grupo = par_grupo[np.repeat(inicio[fila_medico], repeticiones) + posicion]
+    return filas, grupo
+
+
+def _mediana_por_grupo(grupo, valores, n):
+    """Mediana de 'valores' por grupo (NaN donde el grupo no tiene datos)."""
+    medianas = np.full(n, np.nan)
+    if len(valores) == 0:
+        return medianas
+    orden = np.lexsort((valores, grupo))
+    grupo, valores = grupo[orden], valores[orden]
+    conteo = np.bincount(grupo, minlength=n)
+    inicio = np.cumsum(conteo) - conteo
+    con_datos = conteo > 0
+    bajo = inicio + (conteo - 1) // 2
+    alto = inicio + conteo // 2
+    medianas[con_datos] = (valores[bajo[con_datos]] + valores[alto[con_datos]]) / 2
+    return medianas
+
+
+def _proporcion(numerador, denominador):
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(denominador > 0, numerador / np.maximum(denominador, 1), np.nan)
+
+
+def _metricas(n, agenda_grupo, cita_grupo, estado, pasada, horas):
+    """
+    Métricas por grupo a partir del grupo de cada cupo y de cada cita.
+
+    Args:
+        n: Número de grupos
+        agenda_grupo / cita_grupo: Índice de grupo (0..n-1) por fila
+        estado, pasada, horas: Columnas de las citas (ya alineadas con
+            cita_grupo); horas es NaN si no hay dato de aceptación
+
+    Returns:
+        dict: nombre de métrica → arreglo de tamaño n
+    """
+    cupos = np.bincount(agenda_grupo, minlength=n)
+    citas = np.bincount(cita_grupo, minlength=n)
+    canceladas = np.bincount(cita_grupo, weights=estado == CANCELADA, minlength=n)
+    completadas = np.bincount(cita_grupo, weights=estado == COMPLETADA, minlength=n)
+    inasistencias = np.bincount(
+        cita_grupo, weights=(estado == PENDIENTE) & pasada, minlength=n
+    )
+
+    con_horas = ~np.isnan(horas)
+    n_horas = np.bincount(cita_grupo[con_horas], minlength=n)
+    suma_horas = np.bincount(cita_grupo[con_horas], weights=horas[con_horas], minlength=n)
+
+    return {
+        "cupos": cupos,
+        "citas": citas,
+        "canceladas": canceladas,
+        "completadas": completadas,
+        "inasistencias": inasistencias,
+        "utilizacion": _proporcion(citas - canceladas, cupos),
+        "tasa_cancelacion": _proporcion(canceladas, citas),
+        "tasa_inasistencia": _proporcion(inasistencias, citas),
+        "horas_aceptacion_media": _proporcion(suma_horas, n_horas),
+        "horas_aceptacion_mediana": _mediana_por_grupo(
+            cita_grupo[con_horas], horas[con_horas], n
+        ),
+        "citas_con_aceptacion": n_horas,
+    }
+
+
+def _filas(metricas, etiquetas, incluir_vacios=False):
+    """Convierte arreglos por grupo en una lista de dicts (omite grupos vacíos)."""
+    if incluir_vacios:
+        activos = np.arange(len(etiquetas))
+    else:
+        activos = np.flatnonzero((metricas["cupos"] > 0) | (metricas["citas"] > 0))
+    resultado = []
+    for i in activos:
+        fila = dict(etiquetas[i])
+        for nombre, valores in metricas.items():
+            valor = valores[i]
+            if np.isnan(valor):
+                fila[nombre] = None
+            elif nombre.startswith("tasa_") or nombre == "utilizacion":
+                fila[nombre] = round(float(valor), 4)
+            elif nombre.startswith("horas_"):
+                fila[nombre] = round(float(valor), 2)
+            else:
+                fila[nombre] = int(valor)
+        resultado.append(fila)
+    return resultado
+
+
+# =============================================================================
+# RESUMEN
+# =============================================================================
+
+def resumen(desde, hasta, hoy=None):
+    """
+    Calcula las métricas del periodo [desde, hasta].
+
+    Returns:
+        dict: {"periodo", "generado", "totales", "por_medico",
+               "por_especialidad", "por_vereda", "por_semana"}
+    """
+    hoy = hoy or timezone.localdate()
+    medicos, especialidades = _catalogos()
+
+    ids_medico = np.array([m[0] for m in medicos], dtype=np.int64)
+    n_medicos = len(ids_medico)
+
+    def indice_medico(columna):
+        """ID_Medico → índice denso, y máscara de los que existen."""
+        if n_medicos == 0:
+            return np.zeros(len(columna), dtype=np.int64), np.zeros(len(columna), dtype=bool)
+        posicion = np.minimum(np.searchsorted(ids_medico, columna), n_medicos - 1)
+        return posicion, ids_medico[posicion] == columna
+
+    agenda = _columnas(SQL_AGENDA, [desde, desde, hasta], 2)
+    agenda_medico, valido = indice_medico(agenda[:, 0])
+    agenda_medico, agenda_dia = agenda_medico[valido], agenda[valido, 1]
+
+    citas = _columnas(SQL_CITAS, [desde, desde, hasta], 4)
+    cita_medico, valido = indice_medico(citas[:, 1])
+    cita_medico, citas = cita_medico[valido], citas[valido]
+    id_cita, cita_dia, estado = citas[:, 0], citas[:, 2], citas[:, 3]
+    pasada = cita_dia < (hoy - desde).days
+
+    # Horas de creación a aceptación, alineadas con las citas (NaN si falta)
+    horas = np.full(len(id_cita), np.nan)
+    if len(id_cita):
+        aceptacion = _columnas(SQL_ACEPTACION, [int(id_cita[0]), int(id_cita[-1])], 2)
+        posicion = np.minimum(np.searchsorted(id_cita, aceptacion[:, 0]), len(id_cita) - 1)
+        encontrada = id_cita[posicion] == aceptacion[:, 0]
+        horas[posicion[encontrada]] = np.maximum(aceptacion[encontrada, 1], 0) / 3600
+
+    # --- Totales (un solo grupo)
+    totales = _filas(
+        _metricas(
+            1,
+            np.zeros(len(agenda_medico), dtype=np.int64),
+            np.zeros(len(cita_medico), dtype=np.int64),
+            estado, pasada, horas,
+        ),
+        [{}],
+        incluir_vacios=True,
+    )[0]
+
+    # --- Por médico
+    por_medico = _filas(
+        _metricas(n_medicos, agenda_medico, cita_medico, estado, pasada, horas),
+        [{"id_medico": m[0], "medico": m[2], "vereda": m[1] or None} for m in medicos],
+    )
+
+    # --- Por vereda
+    veredas, medico_vereda = np.unique(
+        np.array([m[1] for m in medicos], dtype=str), return_inverse=True
+    )
+    por_vereda = _filas(
+        _metricas(
+            len(veredas),
+            medico_vereda[agenda_medico],
+            medico_vereda[cita_medico],
+            estado, pasada, horas,
+        ),
+        [{"vereda": str(v) or None} for v in veredas],
+    )
+
+    # --- Por especialidad (N:M: cupos y citas se repiten por especialidad)
+    catalogo = sorted({(e[1], e[2]) for e in especialidades})
+    posicion_especialidad = {id_especialidad: i for i, (id_especialidad, _) in enumerate(catalogo)}
+    par_medico, valido = indice_medico(
+        np.array([e[0] for e in especialidades], dtype=np.int64)
+    )
+    par_especialidad = np.array(
+        [posicion_especialidad[e[1]] for e in especialidades], dtype=np.int64
+    )
+    par_medico, par_especialidad = par_medico[valido], par_especialidad[valido]
+
+    _, agenda_especialidad = _expandir(agenda_medico, par_medico, par_especialidad, n_medicos)
+    cita_filas, cita_especialidad = _expandir(cita_medico, par_medico, par_especialidad, n_medicos)
+    por_especialidad = _filas(
+        _metricas(
+            len(catalogo),
+            agenda_especialidad,
+            cita_especialidad,
+            estado[cita_filas], pasada[cita_filas], horas[cita_filas],
+        ),
+        [{"id_especialidad": i, "especialidad": nombre} for i, nombre in catalogo],
+    )
+
+    # --- Por semana (de lunes a domingo)
+    desfase = desde.weekday()
+    lunes = desde - timedelta(days=desfase)
+    n_semanas = (hasta - lunes).days // 7 + 1
+    por_semana = _filas(
+        _metricas(
+            n_semanas,
+            (agenda_dia + desfase) // 7,
+            (cita_dia + desfase) // 7,
+            estado, pasada, horas,
+        ),
+        [{"semana": (lunes + timedelta(weeks=i)).isoformat()} for i in range(n_semanas)],
+    )
+
+    return {
+        "periodo": {"desde": desde.isoformat(), "hasta": hasta.isoformat()},
+        "generado": timezone.now().isoformat(),
+        "totales": totales,
+        "por_medico": por_medico,
+        "por_especialidad": por_especialidad,
+        "por_vereda": por_vereda,
+        "por_semana": por_semana,
+    }
+
+
+def resumen_cacheado(desde, hasta, refrescar=False):
+    """
+    resumen() guardado en la caché por periodo.
+
+    Un periodo que ya terminó se guarda un día; uno que incluye hoy o el
+    futuro, CACHE_SEGUNDOS (las citas siguen cambiando).
+    """
+    clave = f"analitica:resumen:{desde.isoformat()}:{hasta.isoformat()}"
+    if not refrescar:
+        datos = cache.get(clave)
+        if datos is not None:
+            return datos
+
+    datos = resumen(desde, hasta)
+    cerrado = hasta < timezone.localdate()
+    cache.set(clave, datos, CACHE_SEGUNDOS_CERRADO if cerrado else CACHE_SEGUNDOS)
+    return datos
@@ -0,0 +1,195 @@
+"""
+Exportaciones CSV/JSONL para administradores - Salud Rural
+
+Cada exportación abre su propia conexión MySQL con un cursor del lado del
+servidor (MySQLdb SSCursor, mysql_use_result): las filas llegan de MySQL a
+medida que se leen, en lugar de cargarse todas en memoria como hace el
+cursor normal. El generador las convierte a texto por bloques y
+StreamingHttpResponse las envía de inmediato:
+
+- memoria constante (un bloque de LOTE filas), sin importar el total
+- la descarga empieza con el primer bloque, no al terminar la consulta
+
+La conexión es dedicada porque un resultado sin leer por completo bloquea
+la conexión para cualquier otra consulta: así la de Django queda libre
+durante la descarga. Se cierra al terminar o si el cliente se desconecta.
+
+Bajo ASGI (uvicorn) StreamingHttpResponse lee un iterador síncrono
+COMPLETO con sync_to_async(list) antes de enviar el primer byte; por eso
+ahí se usa exportar_async(), que pide cada bloque en un hilo y lo envía
+en cuanto está listo. Bajo WSGI se usa exportar() directamente.
+"""
+
+import csv
+import io
+import json
+
+from asgiref.sync import sync_to_async
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connection
+
+
+# Filas leídas de MySQL y escritas por bloque
+LOTE = 1000
+
+FORMATOS = {
+    "csv": "text/csv; charset=utf-8",
+    "jsonl": "application/x-ndjson; charset=utf-8",
+}
+
+# Columnas que nunca se exportan, aunque el SP las devuelva
+COLUMNAS_EXCLUIDAS = {"contrasena"}
+
+SQL_CITAS = """
+    SELECT c.ID_Cita AS id_cita, c.Estado AS estado,
+           a.Fecha AS fecha, a.Hora AS hora,
+           up.ID_Usuario AS id_usuario_paciente,
+           CONCAT_WS(' ', up.Nombre, up.Apellidos) AS paciente,
+           up.Documento AS documento_paciente,
+           um.ID_Usuario AS id_usuario_medico,
+           CONCAT_WS(' ', um.Nombre, um.Apellidos) AS medico,
+           m.Vereda AS vereda,
+           c.MotivoConsulta AS motivo_consulta
+    FROM cita c
+    JOIN paciente p ON p.ID_Paciente = c.ID_Paciente
+    JOIN usuario up ON up.ID_Usuario = p.ID_Usuario
+    JOIN medico m ON m.ID_Medico = c.ID_Medico
+    JOIN usuario um ON um.ID_Usuario = m.ID_Usuario
+    LEFT JOIN Agenda a ON a.ID_Agenda = c.ID_Agenda
+    WHERE (%s IS NULL OR a.Fecha >= %s) AND (%s IS NULL OR a.Fecha <= %s)
+    ORDER BY c.ID_Cita
+"""
+
+SQL_VALIDACIONES = """
+    SELECT v.ID_Validacion AS id_validacion, v.Estado AS estado,
+           v.FechaValidacion AS fecha_validacion, v.Observaciones AS observaciones,
+           v.ID_Admin AS id_admin,
+           d.ID_Documento AS id_documento, t.Nombre AS tipo_documento,
+           d.FechaSubida AS fecha_subida,
+           um.ID_Usuario AS id_usuario_medico,
+           CONCAT_WS(' ', um.Nombre, um.Apellidos) AS medico
+    FROM validacion_documento v
+    JOIN documento d ON d.ID_Documento = v.ID_Documento
+    LEFT JOIN tipo_documento t ON t.ID_TipoDocumento = d.ID_TipoDocumento
+    LEFT JOIN medico m ON m.ID_Medico = d.ID_Medico
+    LEFT JOIN usuario um ON um.ID_Usuario = m.ID_Usuario
+    WHERE (%s IS NULL OR v.FechaValidacion >= %s) AND (%s IS NULL OR v.FechaValidacion <= %s)
+    ORDER BY v.ID_Validacion
+"""
+
+
+def _rango(desde, hasta):
+    return [desde, desde, hasta, hasta]
+
+
+# conjunto → (tipo, SP o SQL, usa rango de fechas)
+CONJUNTOS = {
+    "usuarios": ("sp", "sp_usuario_list", False),
+    "pacientes": ("sp", "sp_paciente_list", False),
+    "medicos": ("sp", "sp_medico_list", False),
+    "citas": ("sql", SQL_CITAS, True),
+    "validaciones": ("sql", SQL_VALIDACIONES, True),
+}
+
+
+def _conexion_sin_buffer():
+    """Conexión nueva (mismos parámetros que la de Django) y un SSCursor."""
+    from MySQLdb.cursors import SSCursor
+
+    conexion = connection.get_new_connection(connection.get_connection_params())
+    return conexion, conexion.cursor(SSCursor)
+
+
+def filas(conjunto, desde=None, hasta=None, lote=LOTE):
+    """
+    Genera (columnas, bloque de filas) leyendo del cursor sin buffer.
+
+    El primer elemento trae solo las columnas (bloque vacío) para poder
+    escribir el encabezado antes de la primera fila.
+    """
+    tipo, consulta, con_rango = CONJUNTOS[conjunto]
+    conexion, cursor = _conexion_sin_buffer()
+    try:
+        if tipo == "sp":
+            cursor.callproc(consulta)
+        else:
+            cursor.execute(consulta, _rango(desde, hasta) if con_rango else [])
+
+        columnas = [c[0] for c in cursor.description]
+        visibles = [
+            i for i, c in enumerate(columnas) if c.lower() not in COLUMNAS_EXCLUIDAS
+        ]
+        yield [columnas[i] for i in visibles], []
+
+        while True:
+            bloque = cursor.fetchmany(lote)
+            if not bloque:
+                break
+            yield None, [[fila[i] for i in visibles] for fila in bloque]
+    finally:
+        # Cerrar la conexión descarta lo que falte por leer (cliente
+        # desconectado): no hace falta consumir el resto del resultado
+        conexion.close()
+
+
+def _csv(bloques):
+    salida = io.StringIO()
+    escritor = csv.writer(salida)
+    # BOM: Excel abre el CSV como UTF-8 (tildes y ñ correctas)
+    yield "\ufeff"
+    for columnas, bloque in bloques:
+        if columnas is not None:
+            escritor.writerow(columnas)
+        escritor.writerows(bloque)
+        yield salida.getvalue()
+        salida.seek(0)
+        salida.truncate()
+
+
+def _jsonl(bloques):
+    columnas = None
+    for encabezado, bloque in bloques:
+        if encabezado is not None:
+            columnas = encabezado
+            continue
+        yield "".join(
+            json.dumps(dict(zip(columnas, fila)), cls=DjangoJSONEncoder, ensure_ascii=False) + "\n"
+            for fila in bloque
+        )
+
+
+def exportar(conjunto, formato="csv", desde=None, hasta=None):
+    """
+    Returns:
+        iterator: Fragmentos de texto listos para StreamingHttpResponse
+    """
+    bloques = filas(conjunto, desde, hasta)
+    if formato == "jsonl":
+        return _jsonl(bloques)
+    return _csv(bloques)
+
+
+async def exportar_async(conjunto, formato="csv", desde=None, hasta=None):
+    """
+    Igual que exportar(), como iterador asíncrono para ASGI.
+
+    Cada bloque se genera en un hilo (lectura del SSCursor + formato) y se
+    entrega de inmediato; nunca hay más de un bloque en memoria. Al
+    terminar, o si el cliente se desconecta (aclose), se cierra el
+    generador y con él la conexión dedicada.
+    """
+    fragmentos = exportar(conjunto, formato, desde, hasta)
+    siguiente = sync_to_async(next, thread_sensitive=False)
+    try:
+        while True:
+            fragmento = await siguiente(fragmentos, None)
+            if fragmento is None:
+                return
+            yield fragmento
+    finally:
+        try:
+            await sync_to_async(fragmentos.close, thread_sensitive=False)()
+        except ValueError:
+            # Cancelado mientras un hilo aún lee un bloque: el generador se
+            # cierra (y la conexión con él) al ser recolectado
+            pass
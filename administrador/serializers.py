@@ -3,3 +3,27 @@ from rest_framework import serializers
 
 class AdminIDSerializer(serializers.Serializer):
     id_admin = serializers.IntegerField()
+
+
+class ExportacionSerializer(serializers.Serializer):
+    formato = serializers.ChoiceField(choices=["csv", "jsonl"], default="csv")
+    # Solo citas (fecha de la agenda) y validaciones (fecha de validación)
+    desde = serializers.DateField(required=False, allow_null=True, default=None)
+    hasta = serializers.DateField(required=False, allow_null=True, default=None)
+
+    def validate(self, attrs):
+        if attrs["desde"] and attrs["hasta"] and attrs["desde"] > attrs["hasta"]:
+            raise serializers.ValidationError("desde no puede ser posterior a hasta.")
+        return attrs
+
+
+class AnaliticaSerializer(serializers.Serializer):
+    # Por defecto: las últimas 12 semanas hasta hoy (ver AdministradorViewSet.analitica)
+    desde = serializers.DateField(required=False)
+    hasta = serializers.DateField(required=False)
+    refrescar = serializers.BooleanField(default=False)
+
+    def validate(self, attrs):
+        if "desde" in attrs and "hasta" in attrs and attrs["desde"] > attrs["hasta"]:
+            raise serializers.ValidationError("desde no puede ser posterior a hasta.")
+        return attrs
@@ -1,8 +1,17 @@
+from datetime import timedelta
+
 from rest_framework import status, viewsets
+from rest_framework.decorators import action
 from rest_framework.response import Response
 from django.db import DatabaseError
+from django.core.handlers.asgi import ASGIRequest
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+
+from backend.permissions import IsAdministrador
 
-from .serializers import AdminIDSerializer
+from . import exportacion
+from .serializers import AdminIDSerializer, AnaliticaSerializer, ExportacionSerializer
 from .services import sp_admin_get_id_by_usuario
 
 
@@ -14,8 +23,17 @@ class AdministradorViewSet(viewsets.ViewSet):
     - Solo expone:
         GET /api/administrador/<id_usuario>/
         Para saber si un usuario es administrador y obtener su ID_Admin.
+        GET /api/administrador/exportar/<conjunto>/ (solo admin)
+        Descarga CSV/JSONL en streaming (ver exportacion.py).
+        GET /api/administrador/analitica/ (solo admin)
+        Métricas operativas del periodo (ver analitica.py).
     """
 
+    def get_permissions(self):
+        if self.action in ['exportar', 'analitica']:
+            return [IsAdministrador()]
+        return super().get_permissions()
+
     # GET /api/administrador/<id_usuario>/
     def retrieve(self, request, pk=None):
         try:
@@ -37,3 +55,92 @@ class AdministradorViewSet(viewsets.ViewSet):
         serializer = AdminIDSerializer(data=data)
         serializer.is_valid(raise_exception=True)
         return Response(serializer.data, status=status.HTTP_200_OK)
+
+    # GET /api/administrador/exportar/<conjunto>/?formato=csv|jsonl&desde=&hasta=
+    @action(detail=False, methods=['get'], url_path=r'exportar/(?P<conjunto>[^/.]+)')
+    def exportar(self, request, conjunto=None):
+        if conjunto not in exportacion.CONJUNTOS:
+            return Response(
+                {
+                    "detail": "Conjunto no soportado.",
+                    "conjuntos": sorted(exportacion.CONJUNTOS),
+                },
+                status=status.HTTP_404_NOT_FOUND
+            )
+
+        serializer = ExportacionSerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        formato = serializer.validated_data["formato"]
+
+        # Bajo ASGI un iterador síncrono se leería completo antes de enviar
+        if isinstance(request._request, ASGIRequest):
+            contenido = exportacion.exportar_async(conjunto, **serializer.validated_data)
+        else:
+            contenido = exportacion.exportar(conjunto, **serializer.validated_data)
+
+        response = StreamingHttpResponse(
+            contenido,
+            content_type=exportacion.FORMATOS[formato],
+        )
+        nombre = f"{conjunto}-{timezone.localdate():%Y%m%d}.{formato}"
+        response["Content-Disposition"] = f'attachment; filename="{nombre}"'
+        response["Cache-Control"] = "no-store"
+        # Sin buffer en el proxy (nginx): cada bloque sale apenas se genera
+        response["X-Accel-Buffering"] = "no"
+        return response
+
+    # GET /api/administrador/analitica/?desde=YYYY-MM-DD&hasta=YYYY-MM-DD&refrescar=true
+    @action(detail=False, methods=['get'], url_path='analitica')
+    def analitica(self, request):
+        from .analitica import resumen_cacheado
+
+        serializer = AnaliticaSerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        datos = serializer.validated_data
+
+        hasta = datos.get("hasta") or timezone.localdate()
+        desde = datos.get("desde") or hasta - timedelta(weeks=12) + timedelta(days=1)
+        if desde > hasta:
+            return Response(
+                {"detail": "desde no puede ser posterior a hasta."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        try:
+            data = resumen_cacheado(desde, hasta, refrescar=datos["refrescar"])
+        except DatabaseError as e:
+            return Response(
+                {"detail": str(e)},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        return Response(data, status=status.HTTP_200_OK)
+
+
+# =============================================================================
+# NOTAS PARA EL DESARROLLADOR
+# =============================================================================
+#
+# 1. EXPORTACIONES (exportar):
+#    - Conjuntos: usuarios, pacientes, medicos (SP *_list), citas y
+#      validaciones (consulta con joins; aceptan desde/hasta)
+#    - Cursor sin buffer en una conexión dedicada + StreamingHttpResponse:
+#      memoria constante y la descarga empieza de inmediato
+#    - Bajo ASGI (uvicorn backend.asgi:application) se entrega un iterador
+#      asíncrono (exportar_async); uno síncrono se leería completo en
+#      memoria antes de enviar el primer byte
+#    - Bajo WSGI (gunicorn sync) una exportación larga ocupa un worker
+#      mientras dura
+#    - Nunca se exporta la columna de contraseña, aunque el SP la devuelva
+#
+# 2. ANALÍTICA (analitica):
+#    - Utilización, cancelación, inasistencia, demanda y horas hasta la
+#      aceptación por médico, especialidad, vereda y semana
+#    - Columnas de Agenda/cita cargadas como arreglos NumPy y agregadas sin
+#      bucles por cita (analitica.py)
+#    - En caché por periodo: 1 día si ya terminó, ANALITICA_CACHE_SEGUNDOS
+#      si incluye hoy; ?refrescar=true recalcula. Con varios procesos,
+#      la caché debe ser compartida para no calcular una vez por proceso
+#    - Horas hasta la aceptación salen de notificacion_saliente: solo hay
+#      datos desde que existe la bandeja y si hay canales configurados
+#
+# =============================================================================
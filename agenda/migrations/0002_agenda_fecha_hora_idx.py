@@ -0,0 +1,18 @@
+# Índice para buscar horarios por ventana de tiempo (recordatorios de citas).
+# Agenda no es gestionada por Django, así que se crea con SQL directo.
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('agenda', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql="CREATE INDEX agenda_fecha_hora_idx ON Agenda (Fecha, Hora)",
+            reverse_sql="DROP INDEX agenda_fecha_hora_idx ON Agenda",
+        ),
+    ]
@@ -0,0 +1,97 @@
+"""
+Hasher PBKDF2 con iteraciones calibradas - Salud Rural
+
+Mismo formato que el PBKDF2 de Django (pbkdf2_sha256$iter$sal$hash), así
+que los hashes existentes siguen validando. Lo que cambia es de dónde sale
+el número de iteraciones:
+
+1. settings.PASSWORD_HASH_ITERACIONES, si está definido
+2. la fila de auth_parametro_hash que guarda calibrar_hash (midiendo en
+   este hardware cuántas iteraciones caben en PASSWORD_HASH_OBJETIVO_MS)
+3. el valor por defecto de Django
+
+must_update solo pide re-hashear cuando el hash guardado tiene MENOS
+iteraciones que el objetivo: un hash más fuerte nunca se degrada.
+"""
+
+import time
+
+from django.conf import settings
+from django.contrib.auth.hashers import PBKDF2PasswordHasher
+from django.db import DatabaseError
+
+
+# Segundos que se reutiliza el valor leído de la BD en cada proceso
+CACHE_SEGUNDOS = 300
+
+# Piso de seguridad (recomendación OWASP para PBKDF2-SHA256)
+ITERACIONES_MINIMAS = 600_000
+
+_cache = {"valor": None, "leido": 0.0}
+
+# Valor fijado por el proceso padre en los hijos del pool de hashing.py
+# (así los hijos no consultan la BD)
+_fijadas = None
+
+
+def fijar_iteraciones(iteraciones):
+    global _fijadas
+    _fijadas = iteraciones
+
+
+def iteraciones_objetivo():
+    if _fijadas is not None:
+        return _fijadas
+
+    configuradas = getattr(settings, "PASSWORD_HASH_ITERACIONES", None)
+    if configuradas:
+        return configuradas
+
+    if time.monotonic() - _cache["leido"] > CACHE_SEGUNDOS:
+        from .models import ParametroHash
+        try:
+            fila = ParametroHash.objects.filter(
+                algoritmo=PBKDF2CalibradoHasher.algorithm
+            ).values_list("iteraciones", flat=True).first()
+        except DatabaseError:
+            fila = None
+        _cache["valor"] = fila
+        _cache["leido"] = time.monotonic()
+
+    return _cache["valor"] or PBKDF2PasswordHasher.iterations
+
+
+class PBKDF2CalibradoHasher(PBKDF2PasswordHasher):
+    """PBKDF2-SHA256 con iteraciones de iteraciones_objetivo()."""
+
+    @property
+    def iterations(self):
+        return iteraciones_objetivo()
+
+    def must_update(self, encoded):
+        return self.decode(encoded)["iterations"] < self.iterations
+
+
+def medir(iteraciones, repeticiones=3):
+    """Milisegundos de un hash con 'iteraciones' (el mejor de varias corridas)."""
+    hasher = PBKDF2PasswordHasher()
+    mejor = float("inf")
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        hasher.encode("calibracion", hasher.salt(), iteraciones)
+        mejor = min(mejor, (time.perf_counter() - inicio) * 1000)
+    return mejor
+
+
+def calibrar(objetivo_ms, base=100_000):
+    """
+    Iteraciones para que un hash tarde ~objetivo_ms en este hardware
+    (PBKDF2 es lineal en iteraciones), redondeadas a 10.000.
+
+    Returns:
+        tuple: (iteraciones, ms medidos con ese valor)
+    """
+    por_iteracion = medir(base) / base
+    iteraciones = int(objetivo_ms / por_iteracion) // 10_000 * 10_000
+    iteraciones = max(iteraciones, ITERACIONES_MINIMAS)
+    return iteraciones, medir(iteraciones, repeticiones=1)
@@ -0,0 +1,236 @@
+"""
+Hasheo de contraseñas fuera del hilo de la petición - Salud Rural
+
+PBKDF2 está hecho para ser lento (cientos de miles de iteraciones). Si
+cada login lo calcula en el hilo del worker web, una ráfaga de logins al
+inicio del turno ocupa todos los workers y el resto de endpoints espera.
+
+Aquí el cálculo corre en un ProcessPoolExecutor pequeño y acotado:
+- PROCESOS: cuántos hashes se calculan a la vez (CPU dedicada a logins)
+- COLA_MAXIMA: cuántos pueden esperar turno; si se llena, la petición
+  recibe 503 de inmediato en lugar de acumularse (HashingSaturado)
+- Con AUTH_HASH_PROCESOS = 0 se calcula en el mismo hilo (desarrollo)
+
+Importaciones masivas: hashear_lote() agrupa varias contraseñas por tarea
+y espera cupo en lugar de responder 503, sin ocupar más de PROCESOS cupos.
+
+Actualización transparente: si un login correcto usa un hash con menos
+iteraciones que el objetivo actual (hashers.py), se re-hashea en segundo
+plano y se guarda, sin hacer esperar al usuario.
+"""
+
+import logging
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, TimeoutError
+
+from django.conf import settings
+from django.contrib.auth.hashers import check_password, make_password
+from django.db import DatabaseError, connection
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+from .hashers import fijar_iteraciones, iteraciones_objetivo
+
+
+logger = logging.getLogger(__name__)
+
+
+PROCESOS = getattr(settings, "AUTH_HASH_PROCESOS", max((os.cpu_count() or 2) // 2, 1))
+
+COLA_MAXIMA = getattr(settings, "AUTH_HASH_COLA_MAXIMA", PROCESOS * 4)
+
+# Segundos máximos esperando un resultado
+TIEMPO_MAXIMO = 10
+
+
+class HashingSaturado(APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = "El servicio de autenticación está ocupado. Intenta de nuevo en unos segundos."
+    default_code = "hashing_saturado"
+
+
+# =============================================================================
+# TRABAJO EN EL PROCESO HIJO
+# =============================================================================
+
+def _iniciar():
+    import django
+    django.setup()
+
+
+def _verificar(contrasena, hash_guardado, iteraciones):
+    """Returns: (correcta, hash desactualizado)"""
+    fijar_iteraciones(iteraciones)
+    desactualizado = []
+    correcta = check_password(
+        contrasena, hash_guardado, setter=lambda _: desactualizado.append(True)
+    )
+    return correcta, bool(desactualizado)
+
+
+def _hashear(contrasena, iteraciones):
+    fijar_iteraciones(iteraciones)
+    return make_password(contrasena)
+
+
+def _hashear_varios(contrasenas, iteraciones):
+    fijar_iteraciones(iteraciones)
+    return [make_password(contrasena) for contrasena in contrasenas]
+
+
+# =============================================================================
+# POOL ACOTADO POR PROCESO WEB
+# =============================================================================
+
+_lock = threading.Lock()
+_pool = None
+
+# Cupos = calculando + esperando; sin cupo → 503
+_cupos = threading.BoundedSemaphore(PROCESOS + COLA_MAXIMA)
+
+# Tareas de hashear_lote en vuelo: a lo sumo PROCESOS, el resto de cupos
+# queda para los logins
+_cupos_lote = threading.BoundedSemaphore(max(PROCESOS, 1))
+
+
+def _obtener_pool():
+    global _pool
+    with _lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=PROCESOS, initializer=_iniciar)
+        return _pool
+
+
+# Guardado de hashes re-calculados. Los done callbacks de un
+# ProcessPoolExecutor corren en su hilo administrador, el mismo que entrega
+# los resultados a todos los logins en espera: el UPDATE no puede ir ahí.
+_guardado = None
+
+
+def _obtener_guardado():
+    global _guardado
+    with _lock:
+        if _guardado is None:
+            _guardado = ThreadPoolExecutor(max_workers=1, thread_name_prefix="rehash")
+        return _guardado
+
+
+def _ejecutar(funcion, *args):
+    if PROCESOS == 0:
+        return funcion(*args)
+
+    if not _cupos.acquire(blocking=False):
+        raise HashingSaturado()
+    try:
+        futuro = _obtener_pool().submit(funcion, *args)
+    except BaseException:
+        _cupos.release()
+        raise
+    futuro.add_done_callback(lambda _: _cupos.release())
+    try:
+        return futuro.result(timeout=TIEMPO_MAXIMO)
+    except TimeoutError:
+        raise HashingSaturado()
+
+
+def verificar_contrasena(contrasena, hash_guardado, al_desactualizar=None):
+    """
+    check_password en el pool. Lanza HashingSaturado si no hay cupo.
+
+    Args:
+        al_desactualizar: Se llama si la contraseña es correcta pero el
+            hash usa parámetros viejos (como el 'setter' de Django)
+    """
+    if not hash_guardado:
+        return False
+    correcta, desactualizado = _ejecutar(
+        _verificar, contrasena, hash_guardado, iteraciones_objetivo()
+    )
+    if correcta and desactualizado and al_desactualizar is not None:
+        al_desactualizar()
+    return correcta
+
+
+def hashear_contrasena(contrasena):
+    """make_password en el pool. Lanza HashingSaturado si no hay cupo."""
+    return _ejecutar(_hashear, contrasena, iteraciones_objetivo())
+
+
+def _liberar_lote(_futuro=None):
+    _cupos.release()
+    _cupos_lote.release()
+
+
+def hashear_lote(contrasenas, por_tarea=16):
+    """
+    make_password de muchas contraseñas (importaciones masivas).
+
+    Reparte el trabajo en tareas de por_tarea contraseñas. A diferencia de
+    hashear_contrasena, cada tarea espera su cupo en lugar de responder
+    503, pero nunca ocupa más de PROCESOS cupos: los logins siguen
+    entrando entre una tarea y otra.
+
+    Returns:
+        list: Hashes en el mismo orden de contrasenas
+    """
+    contrasenas = list(contrasenas)
+    iteraciones = iteraciones_objetivo()
+    tareas = [
+        contrasenas[i:i + por_tarea] for i in range(0, len(contrasenas), por_tarea)
+    ]
+
+    if PROCESOS == 0:
+        return [h for tarea in tareas for h in _hashear_varios(tarea, iteraciones)]
+
+    futuros = []
+    for tarea in tareas:
+        _cupos_lote.acquire()
+        if not _cupos.acquire(timeout=TIEMPO_MAXIMO):
+            _cupos_lote.release()
+            raise HashingSaturado()
+        try:
+            futuro = _obtener_pool().submit(_hashear_varios, tarea, iteraciones)
+        except BaseException:
+            _liberar_lote()
+            raise
+        futuro.add_done_callback(_liberar_lote)
+        futuros.append(futuro)
+
+    return [h for futuro in futuros for h in futuro.result()]
+
+
+def rehashear_en_segundo_plano(id_usuario, contrasena, hash_anterior):
+    """
+    Calcula el hash nuevo en el pool y lo guarda al terminar, sin bloquear.
+
+    Es de baja prioridad: si el pool no tiene cupo se omite (se intenta en
+    el próximo login). Solo se guarda si el hash no cambió mientras tanto
+    (p. ej. un cambio de contraseña simultáneo).
+    """
+    from usuarios.models import Usuario
+
+    def guardar(hash_nuevo):
+        try:
+            Usuario.objects.filter(
+                id_usuario=id_usuario, contrasena=hash_anterior
+            ).update(contrasena=hash_nuevo)
+        except DatabaseError:
+            logger.exception("No se pudo actualizar el hash del usuario %s", id_usuario)
+        finally:
+            # Hilo de guardado: no dejar la conexión abierta
+            connection.close()
+
+    if PROCESOS == 0:
+        _obtener_guardado().submit(guardar, _hashear(contrasena, iteraciones_objetivo()))
+        return
+
+    if not _cupos.acquire(blocking=False):
+        return
+    futuro = _obtener_pool().submit(_hashear, contrasena, iteraciones_objetivo())
+    futuro.add_done_callback(lambda _: _cupos.release())
+    # El callback solo encola el guardado: no bloquea el hilo del pool
+    futuro.add_done_callback(
+        lambda f: _obtener_guardado().submit(guardar, f.result())
+        if f.exception() is None else None
+    )
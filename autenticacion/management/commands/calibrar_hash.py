@@ -0,0 +1,59 @@
+"""
+Calibra las iteraciones de PBKDF2 para este hardware.
+
+Uso:
+    python manage.py calibrar_hash                    # solo medir
+    python manage.py calibrar_hash --guardar          # medir y aplicar
+    python manage.py calibrar_hash --objetivo-ms 300 --guardar
+
+Correr en el mismo tipo de servidor que atiende los logins. Al guardar,
+los hashes con menos iteraciones se actualizan solos en el próximo login.
+"""
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from autenticacion.hashers import ITERACIONES_MINIMAS, PBKDF2CalibradoHasher, calibrar
+from autenticacion.models import ParametroHash
+
+
+class Command(BaseCommand):
+    help = "Mide cuántas iteraciones de PBKDF2 caben en el tiempo objetivo."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--objetivo-ms",
+            type=int,
+            default=getattr(settings, "PASSWORD_HASH_OBJETIVO_MS", 250),
+            help="Milisegundos objetivo por hash (PASSWORD_HASH_OBJETIVO_MS).",
+        )
+        parser.add_argument(
+            "--guardar",
+            action="store_true",
+            help="Guardar el resultado en auth_parametro_hash.",
+        )
+
+    def handle(self, *args, **options):
+        objetivo = options["objetivo_ms"]
+        iteraciones, medido = calibrar(objetivo)
+
+        self.stdout.write(f"{iteraciones} iteraciones → {medido:.0f} ms por hash (objetivo {objetivo} ms).")
+        if iteraciones == ITERACIONES_MINIMAS and medido > objetivo:
+            self.stdout.write(self.style.WARNING(
+                f"Se usa el mínimo de {ITERACIONES_MINIMAS} iteraciones aunque supera el objetivo."
+            ))
+        if getattr(settings, "PASSWORD_HASH_ITERACIONES", None):
+            self.stdout.write(self.style.WARNING(
+                "PASSWORD_HASH_ITERACIONES está definido en settings y tiene prioridad."
+            ))
+
+        if options["guardar"]:
+            ParametroHash.objects.update_or_create(
+                algoritmo=PBKDF2CalibradoHasher.algorithm,
+                defaults={
+                    "iteraciones": iteraciones,
+                    "objetivo_ms": objetivo,
+                    "medido_ms": medido,
+                },
+            )
+            self.stdout.write(self.style.SUCCESS("Guardado."))
@@ -0,0 +1,27 @@
+"""
+Borra los refresh tokens vencidos (token_blacklist) por lotes.
+
+Uso:
+    python manage.py podar_tokens
+    python manage.py podar_tokens --lote 2000 --pausa 0.2
+
+A diferencia de flushexpiredtokens de simplejwt (un solo DELETE), borra
+en lotes cortos para no bloquear las tablas mientras se hacen refresh.
+Programar en cron una vez al día.
+"""
+
+from django.core.management.base import BaseCommand
+
+from autenticacion.tokens import podar_tokens
+
+
+class Command(BaseCommand):
+    help = "Borra por lotes los tokens vencidos y su entrada en la lista negra."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--lote", type=int, default=5000, help="Tokens por lote (5000).")
+        parser.add_argument("--pausa", type=float, default=0.0, help="Segundos entre lotes.")
+
+    def handle(self, *args, **options):
+        borrados = podar_tokens(options["lote"], options["pausa"])
+        self.stdout.write(self.style.SUCCESS(f"{borrados} tokens vencidos eliminados."))
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.7 on 2026-10-19 17:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ParametroHash',
+            fields=[
+                ('algoritmo', models.CharField(db_column='Algoritmo', max_length=30, primary_key=True, serialize=False)),
+                ('iteraciones', models.IntegerField(db_column='Iteraciones')),
+                ('objetivo_ms', models.IntegerField(db_column='ObjetivoMs')),
+                ('medido_ms', models.FloatField(db_column='MedidoMs')),
+                ('actualizado', models.DateTimeField(auto_now=True, db_column='Actualizado')),
+            ],
+            options={
+                'db_table': 'auth_parametro_hash',
+            },
+        ),
+    ]
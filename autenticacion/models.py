@@ -1,3 +1,19 @@
 from django.db import models
 
-# Create your models here.
+
+class ParametroHash(models.Model):
+    """
+    Iteraciones de PBKDF2 calibradas para el hardware actual.
+
+    Tabla gestionada por Django. La escribe el comando calibrar_hash
+    (midiendo cuánto tarda un hash aquí) y la lee hashers.iteraciones_objetivo.
+    Una fila por algoritmo.
+    """
+    algoritmo = models.CharField(db_column='Algoritmo', max_length=30, primary_key=True)
+    iteraciones = models.IntegerField(db_column='Iteraciones')
+    objetivo_ms = models.IntegerField(db_column='ObjetivoMs')
+    medido_ms = models.FloatField(db_column='MedidoMs')
+    actualizado = models.DateTimeField(db_column='Actualizado', auto_now=True)
+
+    class Meta:
+        db_table = 'auth_parametro_hash'
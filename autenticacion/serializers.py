@@ -95,6 +95,20 @@ class LogoutSerializer(serializers.Serializer):
     )
 
 
+class RefreshSerializer(serializers.Serializer):
+    """
+    Serializer para renovar tokens.
+    
+    Campos:
+    - refresh: Token de refresco vigente (se rota en cada uso)
+    """
+    
+    refresh = serializers.CharField(
+        required=True,
+        help_text="Token de refresco obtenido en login o en el último refresh"
+    )
+
+
 class ChangePasswordSerializer(serializers.Serializer):
     """
     Serializer para cambio de contraseña.
@@ -0,0 +1,77 @@
+"""
+Límites de intentos de login - Salud Rural
+
+Token bucket por IP y por cuenta (correo) en la caché de Django:
+- Cada clave tiene hasta CAPACIDAD intentos acumulados y recupera uno
+  cada 1/TASA segundos; un login legítimo casi nunca los agota, un ataque
+  de credential stuffing sí.
+- Por IP frena a un cliente que prueba muchas cuentas; por cuenta frena
+  a muchos clientes probando la misma cuenta.
+- Al agotarse: 429 con Retry-After (DRF).
+
+Con la caché local por defecto (LocMemCache) los contadores son por
+proceso; con una caché compartida (Redis/Memcached) valen para todos.
+"""
+
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.throttling import BaseThrottle
+
+
+class TokenBucketThrottle(BaseThrottle):
+    """
+    Throttle de token bucket. Las subclases definen 'alcance' y
+    obtener_clave(); capacidad y tasa (intentos por segundo) salen de
+    settings.AUTH_LIMITES[alcance].
+    """
+
+    alcance = None
+
+    def __init__(self):
+        self.capacidad, self.tasa = getattr(settings, "AUTH_LIMITES", {}).get(
+            self.alcance, (10, 1 / 30)
+        )
+        self.espera = None
+
+    def obtener_clave(self, request, view):
+        raise NotImplementedError
+
+    def allow_request(self, request, view):
+        clave = self.obtener_clave(request, view)
+        if clave is None:
+            return True
+        clave = f"limite:{self.alcance}:{clave}"
+
+        ahora = time.time()
+        fichas, ultimo = cache.get(clave, (self.capacidad, ahora))
+        fichas = min(self.capacidad, fichas + (ahora - ultimo) * self.tasa)
+
+        if fichas < 1:
+            self.espera = (1 - fichas) / self.tasa
+            return False
+
+        # La clave vence cuando el balde ya estaría lleno otra vez
+        cache.set(clave, (fichas - 1, ahora), timeout=int(self.capacidad / self.tasa) + 1)
+        return True
+
+    def wait(self):
+        return self.espera
+
+
+class LoginIPThrottle(TokenBucketThrottle):
+    alcance = "login_ip"
+
+    def obtener_clave(self, request, view):
+        return self.get_ident(request)
+
+
+class LoginCuentaThrottle(TokenBucketThrottle):
+    alcance = "login_cuenta"
+
+    def obtener_clave(self, request, view):
+        correo = request.data.get("correo") if hasattr(request.data, "get") else None
+        if not correo:
+            return None
+        return str(correo).lower().strip()
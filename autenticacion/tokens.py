@@ -0,0 +1,397 @@
+"""
+Refresh tokens con lista negra en memoria - Salud Rural
+
+Con ROTATE_REFRESH_TOKENS + BLACKLIST_AFTER_ROTATION cada /api/auth/refresh/
+agrega una fila a token_blacklist_blacklistedtoken, y simplejwt consulta esa
+tabla en cada refresh. La tabla crece sin límite y la consulta se vuelve
+más lenta con el tiempo.
+
+Aquí:
+- Cada proceso mantiene un filtro de Bloom con los JTI en lista negra.
+  Se sincroniza de forma incremental (filas con id > último visto, por
+  llave primaria) cada SINCRONIZAR_SEGUNDOS y se reconstruye completo cada
+  RECONSTRUIR_SEGUNDOS (para olvidar lo podado). Cada sincronización relee
+  las filas de los últimos SOLAPE_SEGUNDOS: en InnoDB un id menor puede
+  confirmarse después de uno mayor. La reconstrucción se hace fuera del
+  candado; mientras dura se sigue usando el filtro anterior.
+- Un JTI que el filtro no contiene no está en la lista negra: no se
+  consulta la BD. Si el filtro dice "quizás", se confirma con la BD (los
+  falsos positivos son ~FALSOS_POSITIVOS).
+- podar_tokens() borra por lotes los tokens vencidos; los llama el
+  comando podar_tokens.
+
+Lo que otro proceso agregó a la lista negra en el último
+SINCRONIZAR_SEGUNDOS puede no estar aún en el filtro de este proceso.
+
+Refresh concurrentes del mismo token (varias pestañas, Promise.all con
+varios 401): renovar() los agrupa. El primero rota el token; los demás,
+en este proceso (single-flight) o en otro (candado en la caché), reciben
+el mismo par nuevo, que se guarda en la caché por GRACIA_SEGUNDOS. Así
+solo hay una rotación y una escritura en la lista negra por token. Para
+que el agrupamiento cubra varios procesos, la caché debe ser compartida.
+"""
+
+import hashlib
+import math
+import threading
+import time
+from collections import deque
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+from rest_framework_simplejwt.tokens import RefreshToken, UntypedToken
+
+
+CONFIGURACION = getattr(settings, "AUTH_LISTA_NEGRA", {})
+
+CAPACIDAD = CONFIGURACION.get("capacidad", 200_000)
+FALSOS_POSITIVOS = CONFIGURACION.get("falsos_positivos", 0.001)
+SINCRONIZAR_SEGUNDOS = CONFIGURACION.get("sincronizar_segundos", 1.0)
+RECONSTRUIR_SEGUNDOS = CONFIGURACION.get("reconstruir_segundos", 3600)
+SOLAPE_SEGUNDOS = CONFIGURACION.get("solape_segundos", 30)
+
+# Filas leídas por consulta al sincronizar
+LOTE_LECTURA = 10_000
+
+# Segundos que un token recién rotado sigue devolviendo el mismo par nuevo
+GRACIA_SEGUNDOS = getattr(settings, "AUTH_REFRESH_GRACIA_SEGUNDOS", 10)
+
+# Segundos máximos esperando la rotación que hace otro proceso
+ESPERA_SEGUNDOS = 5
+
+
+class FiltroBloom:
+    """Filtro de Bloom sobre un bytearray, con k posiciones derivadas de blake2b."""
+
+    def __init__(self, capacidad, falsos_positivos):
+        self.bits = max(int(-capacidad * math.log(falsos_positivos) / math.log(2) ** 2), 8)
+        self.funciones = max(round(self.bits / capacidad * math.log(2)), 1)
+        self.arreglo = bytearray((self.bits + 7) // 8)
+        self.capacidad = capacidad
+        self.elementos = 0
+
+    def _posiciones(self, valor):
+        digest = hashlib.blake2b(valor.encode(), digest_size=16).digest()
+        a = int.from_bytes(digest[:8], "little")
+        b = int.from_bytes(digest[8:], "little") | 1
+        return ((a + i * b) % self.bits for i in range(self.funciones))
+
+    def agregar(self, valor):
+        nuevo = False
+        for posicion in self._posiciones(valor):
+            bit = 1 << (posicion & 7)
+            if not self.arreglo[posicion >> 3] & bit:
+                self.arreglo[posicion >> 3] |= bit
+                nuevo = True
+        # Releer un JTI (solape de la sincronización) no lo cuenta dos veces
+        if nuevo:
+            self.elementos += 1
+
+    def __contains__(self, valor):
+        return all(
+            self.arreglo[posicion >> 3] & (1 << (posicion & 7))
+            for posicion in self._posiciones(valor)
+        )
+
+    @property
+    def lleno(self):
+        return self.elementos > self.capacidad
+
+
+class ListaNegra:
+    """Filtro de JTI en lista negra de este proceso, sincronizado con la BD."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.filtro = None
+        self.ultimo_id = 0
+        self.sincronizado = 0.0
+        self.construido = 0.0
+        # (instante, último id leído) de las lecturas recientes, para releer
+        # con solape (ver _desde)
+        self.marcas = deque()
+        # JTI agregados mientras otro hilo reconstruye (None = no reconstruye)
+        self._durante_reconstruccion = None
+
+    def _leer_desde(self, filtro, desde_id):
+        """Agrega al filtro las filas con id > desde_id; devuelve el último id."""
+        while True:
+            filas = list(
+                BlacklistedToken.objects.filter(id__gt=desde_id)
+                .order_by("id")
+                .values_list("id", "token__jti")[:LOTE_LECTURA]
+            )
+            for id_fila, jti in filas:
+                filtro.agregar(jti)
+            if filas:
+                desde_id = filas[-1][0]
+            if len(filas) < LOTE_LECTURA:
+                return desde_id
+
+    def _desde(self, ahora):
+        """
+        Id desde el que releer: el último leído hace SOLAPE_SEGUNDOS.
+
+        Los id autoincrementales de InnoDB se asignan al insertar pero se
+        confirman en otro orden: una fila con id menor al último visto
+        puede aparecer después. Releer el tramo de los últimos
+        SOLAPE_SEGUNDOS la incluye (agregar dos veces al filtro no cambia
+        nada).
+        """
+        while len(self.marcas) > 1 and ahora - self.marcas[1][0] >= SOLAPE_SEGUNDOS:
+            self.marcas.popleft()
+        if not self.marcas:
+            return self.ultimo_id
+        return min(self.marcas[0][1], self.ultimo_id)
+
+    def _sincronizar(self):
+        """
+        Sincronización incremental (con self._lock tomado).
+
+        Returns:
+            bool: True si hay que reconstruir el filtro (fuera del candado)
+        """
+        ahora = time.monotonic()
+        if self.filtro is None:
+            # Primera vez: no hay filtro con el que responder mientras tanto
+            self._construir(ahora)
+            return False
+        if self._durante_reconstruccion is None and (
+            self.filtro.lleno or ahora - self.construido > RECONSTRUIR_SEGUNDOS
+        ):
+            self._durante_reconstruccion = []
+            return True
+        if ahora - self.sincronizado > SINCRONIZAR_SEGUNDOS:
+            self.ultimo_id = max(
+                self._leer_desde(self.filtro, self._desde(ahora)), self.ultimo_id
+            )
+            self.marcas.append((ahora, self.ultimo_id))
+            self.sincronizado = ahora
+        return False
+
+    def _construir(self, ahora):
+        """Filtro nuevo con toda la tabla; devuelve (filtro, último id)."""
+        # Dimensionar por lo que ya contiene el filtro actual: si creció
+        # (o se llenó), la reconstrucción periódica no vuelve a CAPACIDAD
+        capacidad = CAPACIDAD
+        if self.filtro is not None:
+            capacidad = max(CAPACIDAD, 2 * self.filtro.elementos)
+        filtro = FiltroBloom(capacidad, FALSOS_POSITIVOS)
+        ultimo_id = self._leer_desde(filtro, 0)
+        if self.filtro is None:
+            self._instalar(filtro, ultimo_id, ahora)
+        return filtro, ultimo_id
+
+    def _instalar(self, filtro, ultimo_id, ahora):
+        self.filtro = filtro
+        self.ultimo_id = ultimo_id
+        self.construido = self.sincronizado = ahora
+        self.marcas.append((ahora, ultimo_id))
+
+    def _reconstruir(self):
+        """
+        Reconstruye sin tener self._lock: las demás verificaciones siguen
+        usando el filtro actual mientras se lee la tabla completa.
+        """
+        ahora = time.monotonic()
+        try:
+            filtro, ultimo_id = self._construir(ahora)
+        except Exception:
+            with self._lock:
+                self._durante_reconstruccion = None
+            raise
+        with self._lock:
+            # Lo que este proceso agregó mientras tanto pudo no estar
+            # confirmado aún cuando se leyó la tabla
+            for jti in self._durante_reconstruccion:
+                filtro.agregar(jti)
+            self._durante_reconstruccion = None
+            self._instalar(filtro, ultimo_id, ahora)
+
+    def contiene(self, jti):
+        with self._lock:
+            reconstruir = self._sincronizar()
+        if reconstruir:
+            self._reconstruir()
+        with self._lock:
+            if jti not in self.filtro:
+                return False
+        # Posible falso positivo: confirmar con la BD
+        return BlacklistedToken.objects.filter(token__jti=jti).exists()
+
+    def agregar(self, jti):
+        """Registra un JTI recién puesto en lista negra por este proceso."""
+        with self._lock:
+            if self.filtro is not None:
+                self.filtro.agregar(jti)
+            if self._durante_reconstruccion is not None:
+                self._durante_reconstruccion.append(jti)
+
+
+lista_negra = ListaNegra()
+
+
+class RefreshTokenFiltrado(RefreshToken):
+    """RefreshToken que consulta el filtro en lugar de la tabla en cada verificación."""
+
+    def check_blacklist(self):
+        if lista_negra.contiene(self.payload[api_settings.JTI_CLAIM]):
+            raise TokenError("El token está en la lista negra.")
+
+    def blacklist(self):
+        resultado = super().blacklist()
+        lista_negra.agregar(self.payload[api_settings.JTI_CLAIM])
+        return resultado
+
+
+class _Vuelo:
+    """Rotación en curso de un token; los demás hilos esperan su resultado."""
+
+    def __init__(self):
+        self.listo = threading.Event()
+        self.resultado = None
+        self.error = None
+
+    def esperar(self):
+        self.listo.wait()
+        if self.error is not None:
+            raise self.error
+        return self.resultado
+
+
+_vuelos_lock = threading.Lock()
+_vuelos = {}
+
+
+def _jti_verificado(refresh):
+    """JTI de un refresh con firma y vencimiento válidos (sin mirar la lista negra)."""
+    token = UntypedToken(refresh)
+    if token.payload.get(api_settings.TOKEN_TYPE_CLAIM) != RefreshToken.token_type:
+        raise TokenError("El token no es de tipo refresh.")
+    return token.payload[api_settings.JTI_CLAIM]
+
+
+def _esperar_otro_proceso(clave, candado):
+    """
+    Espera el par que está rotando otro proceso.
+
+    Si el candado desaparece sin resultado, la rotación del otro proceso
+    falló (borra el candado al fallar): no tiene sentido seguir esperando.
+    """
+    limite = time.monotonic() + ESPERA_SEGUNDOS
+    while time.monotonic() < limite:
+        time.sleep(0.05)
+        resultado = cache.get(clave)
+        if resultado is not None:
+            return resultado
+        if cache.get(candado) is None:
+            # El líder pudo guardar el resultado justo antes de soltarlo
+            resultado = cache.get(clave)
+            if resultado is not None:
+                return resultado
+            break
+    raise TokenError("No se pudo renovar el token. Intenta de nuevo.")
+
+
+def renovar(refresh):
+    """
+    Valida un refresh token y devuelve un par nuevo.
+
+    Con ROTATE_REFRESH_TOKENS el refresh también cambia y, con
+    BLACKLIST_AFTER_ROTATION, el anterior queda en lista negra. Si el
+    mismo token se renovó hace menos de GRACIA_SEGUNDOS (o se está
+    renovando), se devuelve ese mismo par en lugar de rechazarlo, salvo
+    que el refresh de ese par ya esté en lista negra (logout).
+
+    Returns:
+        dict: {"access", "refresh", "user_id"}
+
+    Raises:
+        TokenError: Token inválido, vencido o en lista negra
+    """
+    jti = _jti_verificado(refresh)
+    clave = f"auth:renovacion:{jti}"
+
+    resultado = cache.get(clave)
+    if resultado is not None:
+        # El par nuevo pudo quedar en lista negra (logout) dentro de la
+        # ventana de gracia: el token viejo ya no debe servir
+        if lista_negra.contiene(_jti_verificado(resultado["refresh"])):
+            cache.delete(clave)
+            raise TokenError("El token está en la lista negra.")
+        return resultado
+
+    with _vuelos_lock:
+        vuelo = _vuelos.get(jti)
+        lider = vuelo is None
+        if lider:
+            vuelo = _vuelos[jti] = _Vuelo()
+    if not lider:
+        return vuelo.esperar()
+
+    candado = f"{clave}:candado"
+    try:
+        if cache.add(candado, True, timeout=ESPERA_SEGUNDOS):
+            try:
+                resultado = _rotar(refresh)
+            except Exception:
+                cache.delete(candado)
+                raise
+            cache.set(clave, resultado, timeout=GRACIA_SEGUNDOS)
+        else:
+            resultado = _esperar_otro_proceso(clave, candado)
+        vuelo.resultado = resultado
+        return resultado
+    except Exception as e:
+        vuelo.error = e
+        raise
+    finally:
+        vuelo.listo.set()
+        with _vuelos_lock:
+            _vuelos.pop(jti, None)
+
+
+def _rotar(refresh):
+    token = RefreshTokenFiltrado(refresh)
+    datos = {"access": str(token.access_token), "refresh": refresh}
+
+    if api_settings.ROTATE_REFRESH_TOKENS:
+        if api_settings.BLACKLIST_AFTER_ROTATION:
+            token.blacklist()
+        token.set_jti()
+        token.set_exp()
+        token.set_iat()
+        datos["refresh"] = str(token)
+
+    datos["user_id"] = token.payload.get(api_settings.USER_ID_CLAIM)
+    return datos
+
+
+def podar_tokens(lote=5000, pausa=0.0):
+    """
+    Borra por lotes los tokens vencidos y su entrada en la lista negra.
+
+    Los vencidos son los más viejos: recorrer por id desde el inicio los
+    encuentra sin escanear la tabla completa.
+
+    Returns:
+        int: Tokens borrados
+    """
+    borrados = 0
+    while True:
+        ids = list(
+            OutstandingToken.objects.filter(expires_at__lt=timezone.now())
+            .order_by("id")
+            .values_list("id", flat=True)[:lote]
+        )
+        if not ids:
+            return borrados
+        BlacklistedToken.objects.filter(token_id__in=ids).delete()
+        OutstandingToken.objects.filter(id__in=ids).delete()
+        borrados += len(ids)
+        if pausa:
+            time.sleep(pausa)
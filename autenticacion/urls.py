@@ -7,6 +7,7 @@ Usa DefaultRouter de DRF para generar automáticamente las rutas REST.
 Rutas generadas:
 - POST   /api/auth/login/           - Iniciar sesión
 - POST   /api/auth/logout/          - Cerrar sesión
+- POST   /api/auth/refresh/         - Renovar tokens (rotación)
 - GET    /api/auth/me/              - Info usuario autenticado
 - POST   /api/auth/change-password/ - Cambiar contraseña
 """
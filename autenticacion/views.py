@@ -20,9 +20,12 @@ from rest_framework_simplejwt.exceptions import TokenError
 from django.db import DatabaseError
 
 from usuarios.models import Usuario
+from .throttles import LoginCuentaThrottle, LoginIPThrottle
+from .tokens import RefreshTokenFiltrado, renovar
 from .serializers import (
     LoginSerializer,
     LogoutSerializer,
+    RefreshSerializer,
     ChangePasswordSerializer,
 )
 
@@ -40,7 +43,11 @@ class AuthViewSet(viewsets.ViewSet):
     # Los endpoints protegidos especifican su permiso individualmente
     permission_classes = [AllowAny]
     
-    @action(detail=False, methods=['post'])
+    @action(
+        detail=False,
+        methods=['post'],
+        throttle_classes=[LoginIPThrottle, LoginCuentaThrottle]
+    )
     def login(self, request):
         """
         Endpoint de inicio de sesión.
@@ -71,6 +78,8 @@ class AuthViewSet(viewsets.ViewSet):
             - 400: Datos inválidos
             - 401: Credenciales incorrectas
             - 403: Usuario desactivado
+            - 429: Demasiados intentos (por IP o por cuenta, con Retry-After)
+            - 503: Pool de hasheo saturado (reintentar en unos segundos)
         """
         # 1. Validar datos de entrada
         serializer = LoginSerializer(data=request.data)
@@ -100,7 +109,8 @@ class AuthViewSet(viewsets.ViewSet):
             )
         
         # 4. Validar contraseña
-        # Nota: check_password compara el texto plano con el hash en BD
+        # Nota: check_password compara el texto plano con el hash en BD;
+        # el PBKDF2 corre en el pool de autenticacion.hashing
         if not usuario.check_password(contrasena):
             return Response(
                 {"detail": "Credenciales inválidas."},
@@ -162,7 +172,8 @@ class AuthViewSet(viewsets.ViewSet):
         # 2. Intentar invalidar el token
         try:
             # Crear instancia del token para agregar a blacklist
-            token = RefreshToken(serializer.validated_data['refresh'])
+            # (RefreshTokenFiltrado también lo registra en el filtro en memoria)
+            token = RefreshTokenFiltrado(serializer.validated_data['refresh'])
             
             # Agregar a blacklist (requiere rest_framework_simplejwt.token_blacklist)
             token.blacklist()
@@ -179,6 +190,59 @@ class AuthViewSet(viewsets.ViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
     
+    @action(detail=False, methods=['post'])
+    def refresh(self, request):
+        """
+        Endpoint para renovar el access token.
+        
+        Con ROTATE_REFRESH_TOKENS también devuelve un refresh nuevo y el
+        anterior queda en lista negra. La lista negra se consulta en un
+        filtro en memoria (tokens.py), no en la tabla en cada petición.
+        
+        Refresh simultáneos con el mismo token (varias pestañas) reciben
+        el mismo par nuevo durante AUTH_REFRESH_GRACIA_SEGUNDOS.
+        
+        Request:
+            POST /api/auth/refresh/
+            {
+                "refresh": "eyJ0eXAiOiJKV1QiLCJhbGc..."
+            }
+        
+        Response (200 OK):
+            {
+                "access": "eyJ0eXAiOiJKV1QiLCJhbGc...",
+                "refresh": "eyJ0eXAiOiJKV1QiLCJhbGc..."
+            }
+        
+        Errors:
+            - 400: Datos inválidos
+            - 401: Token inválido, vencido, en lista negra o usuario desactivado
+        """
+        # 1. Validar datos de entrada
+        serializer = RefreshSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        
+        # 2. Validar y rotar el token
+        try:
+            datos = renovar(serializer.validated_data['refresh'])
+        except TokenError as e:
+            return Response(
+                {"detail": f"Token inválido: {str(e)}"},
+                status=status.HTTP_401_UNAUTHORIZED
+            )
+        
+        # 3. Un usuario desactivado no renueva su sesión
+        if not Usuario.objects.filter(id_usuario=datos['user_id'], activo=True).exists():
+            return Response(
+                {"detail": "Usuario desactivado. Contacte al administrador."},
+                status=status.HTTP_401_UNAUTHORIZED
+            )
+        
+        return Response(
+            {"access": datos['access'], "refresh": datos['refresh']},
+            status=status.HTTP_200_OK
+        )
+    
     @action(detail=False, methods=['get'], permission_classes=[IsAuthenticated])
     def me(self, request):
         """
@@ -310,6 +374,9 @@ class AuthViewSet(viewsets.ViewSet):
 #    - Solo funciona para refresh tokens
 #    - Requiere tabla en BD (creada por migración)
 #    - El access token sigue válido hasta expirar
+#    - refresh/logout consultan un filtro de Bloom en memoria (tokens.py);
+#      solo un "quizás" se confirma en la BD
+#    - podar_tokens (cron diario) borra por lotes los tokens vencidos
 #
 # 4. BUENAS PRÁCTICAS IMPLEMENTADAS:
 #    - Validación con serializers
@@ -319,4 +386,16 @@ class AuthViewSet(viewsets.ViewSet):
 #    - Type hints donde es posible
 #    - Respuestas HTTP semánticas (200, 400, 401, 403)
 #
+# 5. CAPACIDAD DE LOGIN:
+#    - PBKDF2 corre en un pool de procesos acotado (hashing.py); si la
+#      cola se llena → 503 inmediato, los demás endpoints no se afectan
+#    - Token bucket por IP y por correo en login (throttles.py) → 429
+#    - Ajustes: AUTH_HASH_PROCESOS, AUTH_HASH_COLA_MAXIMA, AUTH_LIMITES
+#
+# 6. ACTUALIZACIÓN DE HASHES (hashers.py):
+#    - Iteraciones calibradas por hardware: calibrar_hash --guardar mide
+#      cuántas caben en PASSWORD_HASH_OBJETIVO_MS
+#    - Login correcto con hash de menos iteraciones → se re-hashea en
+#      segundo plano (sin resetear contraseñas ni demorar la respuesta)
+#
 # =============================================================================
\ No newline at end of file
@@ -5,6 +5,19 @@ It exposes the ASGI callable as a module-level variable named ``application``.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
+
+Salud Rural: el stream SSE de notificaciones (/api/notificaciones/stream/)
+necesita ASGI para mantener conexiones abiertas sin ocupar un hilo cada
+una. Ejecutar con:
+
+    uvicorn backend.asgi:application
+
+Los mensajes 'lifespan' del servidor se atienden aquí (Django no los
+maneja) para detener el sondeo de notificaciones al apagar.
+
+Las conexiones WebSocket (/ws/videollamada/<id_cita>/) van a la
+señalización WebRTC de videollamada.senalizacion; uvicorn necesita el
+paquete websockets (uvicorn[standard]) para aceptarlas.
 """
 
 import os
@@ -13,4 +26,24 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend.settings')
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+
+async def application(scope, receive, send):
+    if scope["type"] == "lifespan":
+        from notificaciones.tiempo_real import centro
+
+        while True:
+            mensaje = await receive()
+            if mensaje["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif mensaje["type"] == "lifespan.shutdown":
+                await centro.detener()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+    elif scope["type"] == "websocket":
+        from videollamada.senalizacion import aplicacion as senalizacion
+
+        await senalizacion(scope, receive, send)
+    else:
+        await django_application(scope, receive, send)
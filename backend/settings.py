@@ -149,6 +149,49 @@ REST_FRAMEWORK = {
     'DATETIME_FORMAT': '%Y-%m-%d %H:%M:%S',
 }
 
+# Hasheo de contraseñas en un pool de procesos (autenticacion.hashing):
+# procesos dedicados y cuántos pueden esperar antes de responder 503.
+# AUTH_HASH_PROCESOS = 0 calcula en el hilo de la petición
+AUTH_HASH_PROCESOS = 2
+AUTH_HASH_COLA_MAXIMA = 8
+
+# Hasher PBKDF2 con iteraciones calibradas (autenticacion.hashers): mismo
+# formato que el de Django; los hashes viejos se actualizan al iniciar sesión.
+# PASSWORD_HASH_ITERACIONES fija el valor; si es None se usa el que guarda
+# 'python manage.py calibrar_hash --guardar' para PASSWORD_HASH_OBJETIVO_MS
+PASSWORD_HASHERS = [
+    'autenticacion.hashers.PBKDF2CalibradoHasher',
+    'django.contrib.auth.hashers.PBKDF2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+    'django.contrib.auth.hashers.ScryptPasswordHasher',
+]
+PASSWORD_HASH_ITERACIONES = None
+PASSWORD_HASH_OBJETIVO_MS = 250
+
+# Token bucket de login (autenticacion.throttles): (capacidad, intentos/seg)
+AUTH_LIMITES = {
+    'login_ip': (20, 1 / 6),       # 20 seguidos, luego 10 por minuto
+    'login_cuenta': (5, 1 / 60),   # 5 seguidos, luego 1 por minuto
+}
+
+# Lista negra de refresh tokens en memoria (autenticacion.tokens): filtro de
+# Bloom por proceso, sincronizado con token_blacklist por llave primaria
+AUTH_LISTA_NEGRA = {
+    'capacidad': 200_000,
+    'falsos_positivos': 0.001,
+    'sincronizar_segundos': 1.0,
+    'reconstruir_segundos': 3600,
+}
+
+# Refresh concurrentes del mismo token reciben el mismo par nuevo durante
+# esta ventana (autenticacion.tokens.renovar). Con varios procesos requiere
+# una caché compartida (Redis/Memcached) en CACHES
+AUTH_REFRESH_GRACIA_SEGUNDOS = 10
+
+# Analítica de administradores (administrador.analitica): segundos en caché
+# de un periodo que incluye hoy; los periodos cerrados se guardan un día
+ANALITICA_CACHE_SEGUNDOS = 600
+
 # Simple JWT Configuration
 SIMPLE_JWT = {
     # Duración del access token (60 minutos)
@@ -222,6 +265,50 @@ USE_TZ = True
 
 STATIC_URL = 'static/'
 
+# Archivos subidos (fotos de médicos, documentos, miniaturas generadas)
+MEDIA_URL = 'media/'
+MEDIA_ROOT = BASE_DIR / 'media'
+
+# Subidas: siempre a archivo temporal en disco (nunca el archivo completo en
+# memoria), con el SHA-256 calculado al recibir. El temporal queda en el
+# mismo disco que MEDIA_ROOT/documentos: se publica con os.replace, sin copia
+FILE_UPLOAD_HANDLERS = [
+    'documentos.almacenamiento.SubidaConHash',
+]
+FILE_UPLOAD_TEMP_DIR = MEDIA_ROOT / 'documentos' / 'tmp'
+DOCUMENTOS_TAMANO_MAXIMO = 20 * 1024 * 1024
+
+# Descarga de documentos detrás de nginx: si se define (p. ej. '/protegido/',
+# location internal con alias a MEDIA_ROOT), Django solo valida permisos y
+# nginx envía el archivo con sendfile (incluye Range)
+DOCUMENTOS_X_ACCEL_REDIRECT = None
+
+# Notificaciones salientes (bandeja de salida + despachar_notificaciones).
+# Transportes por canal: ruta a la clase o {"clase": ..., opciones}; los de
+# consola/archivo son para desarrollo, en producción van las pasarelas reales
+NOTIFICACIONES_CANALES = ['sms', 'email']
+NOTIFICACIONES_TRANSPORTES = {
+    'sms': 'notificaciones.transportes.TransporteConsola',
+    'whatsapp': 'notificaciones.transportes.TransporteConsola',
+    'email': {'clase': 'notificaciones.transportes.TransporteArchivo'},
+}
+# Mensajes por segundo por canal (total entre todos los procesos)
+NOTIFICACIONES_LIMITES = {'sms': 5, 'whatsapp': 10, 'email': 20}
+NOTIFICACIONES_CARPETA_SALIDA = BASE_DIR / 'salida'
+
+# Tokens firmados de ingreso a videollamadas: válidos hasta N horas después
+# del inicio de la cita
+VIDEOLLAMADA_TOKEN_VIGENCIA_HORAS = 2
+
+# Señalización WebRTC (videollamada.senalizacion). Para llamadas detrás de
+# NAT estrictos agregar un servidor TURN: {'urls': 'turn:...', 'username':
+# ..., 'credential': ...}. Con varios procesos ASGI, reemplazar la capa
+# local por una compartida con la misma interfaz
+VIDEOLLAMADA_ICE_SERVERS = [
+    {'urls': 'stun:stun.l.google.com:19302'},
+]
+VIDEOLLAMADA_CAPA_SENALIZACION = 'videollamada.senalizacion.CapaLocal'
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
@@ -220,6 +220,12 @@ class CitaViewSet(viewsets.ViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
+        from medicos.services import directorio_refrescar
+        directorio_refrescar(data["id_usuario_medico"])
+        
+        from notificaciones.entrega import encolar_evento_cita
+        encolar_evento_cita(id_cita, "cita_creada")
+        
         return Response(
             {
                 "detail": "Cita creada correctamente.",
@@ -319,6 +325,12 @@ class CitaViewSet(viewsets.ViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
+        from medicos.services import directorio_refrescar_por_cita
+        directorio_refrescar_por_cita(int(pk))
+        
+        from notificaciones.entrega import encolar_evento_cita
+        encolar_evento_cita(int(pk), "cita_cancelada")
+        
         return Response(
             {
                 "detail": "Cita cancelada correctamente.",
@@ -448,6 +460,9 @@ class CitaViewSet(viewsets.ViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
+        from notificaciones.entrega import encolar_evento_cita
+        encolar_evento_cita(int(pk), "cita_aceptada")
+        
         return Response(
             {"detail": mensaje},
             status=status.HTTP_200_OK
@@ -574,6 +589,12 @@ class CitaViewSet(viewsets.ViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
+        from medicos.services import directorio_refrescar
+        directorio_refrescar(int(id_usuario_medico))
+        
+        from notificaciones.entrega import encolar_evento_cita
+        encolar_evento_cita(int(pk), "cita_completada")
+        
         return Response(
             {"detail": mensaje},
             status=status.HTTP_200_OK
@@ -0,0 +1,321 @@
+"""
+Almacenamiento de archivos de documentos - Salud Rural
+
+Los archivos se guardan direccionados por contenido:
+
+    MEDIA_ROOT/documentos/<2 primeros hex>/<sha256>.<ext>
+
+- SubidaConHash (FILE_UPLOAD_HANDLERS) escribe la subida a un temporal en
+  carpeta_temporal() y calcula el SHA-256 mientras llegan los bloques:
+  nunca se carga completa en memoria ni se copia otra vez.
+- El temporal se publica con os.replace (atómico, mismo disco): nunca queda
+  un archivo a medio escribir con el nombre definitivo.
+- Si ya existe un archivo con el mismo hash, el temporal se descarta
+  (re-subidas idénticas no ocupan disco de nuevo).
+
+Descargas: respuesta_archivo() envía el archivo por bloques sin cargarlo en
+memoria. Bajo ASGI (uvicorn) Django lee un iterador síncrono COMPLETO con
+sync_to_async(list) antes de enviar, por eso ahí se entrega un iterador
+asíncrono que lee cada bloque en un hilo.
+
+Cargas reanudables: el archivo se preasigna disperso (truncate al tamaño
+final) y cada bloque se escribe directamente en su offset; al finalizar el
+mismo archivo se hashea y se publica con os.replace, sin copias.
+"""
+
+import hashlib
+import os
+import tempfile
+from pathlib import Path
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.files.uploadhandler import TemporaryFileUploadHandler
+
+
+CARPETA = "documentos"
+
+EXTENSIONES_PERMITIDAS = {".pdf", ".png", ".jpg", ".jpeg", ".webp", ".tif", ".tiff"}
+
+# Tamaño máximo por archivo (se puede ajustar en settings)
+TAMANO_MAXIMO = getattr(settings, "DOCUMENTOS_TAMANO_MAXIMO", 20 * 1024 * 1024)
+
+# Tamaño máximo de cada bloque de una carga reanudable
+BLOQUE_MAXIMO = getattr(settings, "DOCUMENTOS_BLOQUE_MAXIMO", 4 * 1024 * 1024)
+
+# Lectura/escritura interna en disco
+TAMANO_LECTURA = 64 * 1024
+
+
+def carpeta_documentos():
+    return Path(settings.MEDIA_ROOT) / CARPETA
+
+
+def extension(nombre):
+    """'Licencia.PDF' -> '.pdf' ('' si no tiene)."""
+    return os.path.splitext(nombre or "")[1].lower()
+
+
+def ruta_relativa(sha256, ext):
+    """Ruta relativa a MEDIA_ROOT (es lo que se guarda en documento.Archivo)."""
+    return f"{CARPETA}/{sha256[:2]}/{sha256}{ext}"
+
+
+def ruta_absoluta(relativa):
+    return Path(settings.MEDIA_ROOT) / relativa
+
+
+def carpeta_temporal():
+    carpeta = carpeta_documentos() / "tmp"
+    carpeta.mkdir(parents=True, exist_ok=True)
+    return carpeta
+
+
+class SubidaConHash(TemporaryFileUploadHandler):
+    """
+    TemporaryFileUploadHandler que calcula el SHA-256 al recibir.
+
+    Con FILE_UPLOAD_TEMP_DIR = carpeta_temporal() el temporal ya queda en el
+    mismo disco que el destino y guardar_archivo() solo lo renombra.
+    """
+
+    def new_file(self, *args, **kwargs):
+        carpeta_temporal()
+        super().new_file(*args, **kwargs)
+        self.digest = hashlib.sha256()
+
+    def receive_data_chunk(self, raw_data, start):
+        self.digest.update(raw_data)
+        return super().receive_data_chunk(raw_data, start)
+
+    def file_complete(self, file_size):
+        archivo = super().file_complete(file_size)
+        archivo.sha256 = self.digest.hexdigest()
+        return archivo
+
+
+def _mismo_disco(ruta):
+    return os.stat(ruta).st_dev == os.stat(carpeta_temporal()).st_dev
+
+
+def guardar_archivo(archivo):
+    """
+    Publica un UploadedFile bajo su SHA-256.
+
+    Si llegó por SubidaConHash (hash ya calculado, temporal en el mismo
+    disco) el temporal se mueve con os.replace, sin copiarlo. Si no (otro
+    handler u otro disco), se copia por bloques calculando el hash.
+
+    Args:
+        archivo: UploadedFile de Django (request.FILES)
+
+    Returns:
+        dict: {"sha256", "tamano", "ruta", "duplicado"}
+              duplicado=True si el contenido ya estaba almacenado.
+    """
+    ext = extension(archivo.name)
+
+    sha256 = getattr(archivo, "sha256", None)
+    if sha256 and hasattr(archivo, "temporary_file_path"):
+        tmp = archivo.temporary_file_path()
+        if _mismo_disco(tmp):
+            # Django ignora que el temporal ya no exista al cerrarlo
+            return publicar(tmp, sha256, ext, archivo.size)
+
+    digest = hashlib.sha256()
+    tamano = 0
+    fd, tmp = tempfile.mkstemp(dir=carpeta_temporal(), suffix=ext)
+    try:
+        with os.fdopen(fd, "wb") as salida:
+            for bloque in archivo.chunks():
+                digest.update(bloque)
+                salida.write(bloque)
+                tamano += len(bloque)
+        return publicar(tmp, digest.hexdigest(), ext, tamano)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+        raise
+
+
+def publicar(tmp, sha256, ext, tamano):
+    """
+    Mueve un temporal ya hasheado a su ruta definitiva (o lo descarta si
+    el contenido ya existe).
+    """
+    relativa = ruta_relativa(sha256, ext)
+    final = ruta_absoluta(relativa)
+    duplicado = final.exists()
+
+    if duplicado:
+        os.unlink(tmp)
+    else:
+        final.parent.mkdir(parents=True, exist_ok=True)
+        os.replace(tmp, final)
+
+    return {
+        "sha256": sha256,
+        "tamano": tamano,
+        "ruta": relativa,
+        "duplicado": duplicado,
+    }
+
+
+def hash_archivo(ruta):
+    """SHA-256 de un archivo en disco, leído por bloques."""
+    digest = hashlib.sha256()
+    with open(ruta, "rb") as entrada:
+        for bloque in iter(lambda: entrada.read(TAMANO_LECTURA), b""):
+            digest.update(bloque)
+    return digest.hexdigest()
+
+
+def rango_solicitado(cabecera, tamano):
+    """
+    Interpreta un header Range de un solo rango.
+
+    'bytes=0-1023', 'bytes=1024-' y 'bytes=-500' (últimos 500 bytes).
+
+    Returns:
+        tuple | None | False: (inicio, fin) inclusivo; None si no hay Range
+        o no es de bytes/es múltiple (se sirve completo); False si el rango
+        no es satisfacible (416).
+    """
+    if not cabecera or not cabecera.startswith("bytes=") or "," in cabecera:
+        return None
+    inicio, _, fin = cabecera[len("bytes="):].strip().partition("-")
+    try:
+        if not inicio:
+            sufijo = int(fin)
+            if sufijo <= 0:
+                return False
+            return max(tamano - sufijo, 0), tamano - 1
+        inicio = int(inicio)
+        fin = int(fin) if fin else tamano - 1
+    except ValueError:
+        return None
+    if inicio >= tamano or fin < inicio:
+        return False
+    return inicio, min(fin, tamano - 1)
+
+
+def leer_rango(ruta, inicio, cantidad):
+    """Genera el rango del archivo por bloques (para respuestas 206)."""
+    with open(ruta, "rb") as entrada:
+        entrada.seek(inicio)
+        while cantidad > 0:
+            bloque = entrada.read(min(TAMANO_LECTURA, cantidad))
+            if not bloque:
+                break
+            cantidad -= len(bloque)
+            yield bloque
+
+
+async def leer_rango_async(ruta, inicio, cantidad):
+    """
+    Igual que leer_rango(), como iterador asíncrono para ASGI.
+
+    Cada bloque se lee en un hilo y se entrega de inmediato; nunca hay más
+    de un bloque en memoria. Si el cliente se desconecta (aclose), se
+    cierra el generador y con él el archivo.
+    """
+    bloques = leer_rango(ruta, inicio, cantidad)
+    siguiente = sync_to_async(next, thread_sensitive=False)
+    try:
+        while True:
+            bloque = await siguiente(bloques, None)
+            if bloque is None:
+                return
+            yield bloque
+    finally:
+        try:
+            await sync_to_async(bloques.close, thread_sensitive=False)()
+        except ValueError:
+            # Cancelado mientras un hilo aún lee un bloque: el archivo se
+            # cierra al recolectar el generador
+            pass
+
+
+def respuesta_archivo(request, ruta, content_type, rango=None, nombre=None):
+    """
+    Respuesta que envía el archivo (o el tramo 'rango') por bloques.
+
+    Bajo WSGI el archivo completo va con FileResponse (wsgi.file_wrapper /
+    sendfile); bajo ASGI siempre con leer_rango_async().
+
+    Args:
+        rango: (inicio, fin) inclusivo → 206; None → archivo completo
+        nombre: Nombre para Content-Disposition (inline)
+    """
+    from django.core.handlers.asgi import ASGIRequest
+    from django.http import FileResponse, StreamingHttpResponse
+    from django.utils.http import content_disposition_header
+
+    asgi = isinstance(getattr(request, "_request", request), ASGIRequest)
+    if rango is None and not asgi:
+        return FileResponse(open(ruta, "rb"), content_type=content_type, filename=nombre or "")
+
+    tamano = ruta.stat().st_size
+    inicio, fin = rango or (0, tamano - 1)
+    cantidad = fin - inicio + 1
+    lector = leer_rango_async if asgi else leer_rango
+    respuesta = StreamingHttpResponse(
+        lector(ruta, inicio, cantidad),
+        status=206 if rango else 200,
+        content_type=content_type,
+    )
+    respuesta["Content-Length"] = str(cantidad)
+    if rango:
+        respuesta["Content-Range"] = f"bytes {inicio}-{fin}/{tamano}"
+    elif nombre:
+        respuesta["Content-Disposition"] = content_disposition_header(False, nombre)
+    return respuesta
+
+
+# =============================================================================
+# CARGAS REANUDABLES
+# =============================================================================
+
+def ruta_carga(id_carga):
+    """Archivo temporal de una carga (misma carpeta/disco que el destino)."""
+    return carpeta_temporal() / f"carga-{id_carga}.part"
+
+
+def crear_archivo_disperso(ruta, tamano):
+    """Crea el archivo con su tamaño final sin escribir datos (sparse)."""
+    with open(ruta, "wb") as salida:
+        salida.truncate(tamano)
+
+
+def escribir_bloque(ruta, offset, flujo, cantidad):
+    """
+    Copia hasta 'cantidad' bytes de 'flujo' al archivo, desde 'offset'.
+
+    Si el cliente se desconecta a mitad del bloque, lo ya escrito se
+    conserva: se devuelve cuántos bytes llegaron para que la carga
+    continúe desde ahí.
+
+    Returns:
+        tuple: (bytes_escritos, completo)
+    """
+    escritos = 0
+    with open(ruta, "r+b") as salida:
+        salida.seek(offset)
+        while escritos < cantidad:
+            try:
+                bloque = flujo.read(min(TAMANO_LECTURA, cantidad - escritos))
+            except OSError:
+                break
+            if not bloque:
+                break
+            salida.write(bloque)
+            escritos += len(bloque)
+        salida.flush()
+        os.fsync(salida.fileno())
+    return escritos, escritos == cantidad
+
+
+def eliminar_carga(id_carga):
+    ruta = ruta_carga(id_carga)
+    if ruta.exists():
+        ruta.unlink()
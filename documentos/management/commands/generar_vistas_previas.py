@@ -0,0 +1,35 @@
+"""
+Genera las vistas previas que falten para documentos ya almacenados.
+
+Uso:
+    python manage.py generar_vistas_previas
+
+Las subidas nuevas generan su vista previa solas (en segundo plano); este
+comando es para documentos subidos antes o si el pool falló. Reparte el
+trabajo en el mismo pool de procesos y espera a que termine.
+"""
+
+from django.core.management.base import BaseCommand
+
+from documentos import vistas_previas
+from documentos.models import ContenidoDocumento
+
+
+class Command(BaseCommand):
+    help = "Genera vistas previas faltantes de documentos almacenados."
+
+    def handle(self, *args, **options):
+        futuros = []
+        vistos = set()
+        for ruta, sha256 in ContenidoDocumento.objects.values_list("ruta", "sha256").iterator():
+            if sha256 in vistos:
+                continue
+            vistos.add(sha256)
+            futuro = vistas_previas.encolar(ruta, sha256)
+            if futuro is not None:
+                futuros.append(futuro)
+
+        generadas = sum(1 for futuro in futuros if not futuro.exception() and futuro.result())
+        self.stdout.write(self.style.SUCCESS(
+            f"{len(futuros)} archivos revisados, {generadas} con vistas previas nuevas."
+        ))
@@ -0,0 +1,44 @@
+"""
+Elimina cargas reanudables abandonadas y sus archivos temporales.
+
+Uso:
+    python manage.py limpiar_cargas_documentos
+    python manage.py limpiar_cargas_documentos --horas 24
+
+Una carga en curso sin actividad por más de --horas se considera
+abandonada. Las cargas finalizadas se conservan (ya no tienen temporal).
+"""
+
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from documentos.models import CargaDocumento
+from documentos.services import carga_cancelar
+
+
+class Command(BaseCommand):
+    help = "Elimina cargas de documentos en curso sin actividad reciente."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--horas",
+            type=int,
+            default=72,
+            help="Horas sin actividad para considerar una carga abandonada (72).",
+        )
+
+    def handle(self, *args, **options):
+        limite = timezone.now() - timedelta(hours=options["horas"])
+        cargas = CargaDocumento.objects.filter(
+            estado=CargaDocumento.EN_CURSO,
+            actualizado__lt=limite,
+        )
+        total = 0
+        for carga in cargas.iterator():
+            carga_cancelar(carga)
+            total += 1
+        self.stdout.write(self.style.SUCCESS(
+            f"{total} cargas abandonadas eliminadas."
+        ))
@@ -0,0 +1,32 @@
+"""
+Recalcula los contadores de validación de documentos por médico.
+
+Uso:
+    python manage.py recalcular_resumen_validacion
+    python manage.py recalcular_resumen_validacion --medico 12
+
+Los contadores se mantienen solos al subir y validar documentos; este
+comando sirve para la carga inicial o para corregir desincronizaciones.
+"""
+
+from django.core.management.base import BaseCommand
+
+from documentos.services import resumen_recalcular
+
+
+class Command(BaseCommand):
+    help = "Recalcula documento_resumen_medico con una consulta agrupada sobre documento."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--medico",
+            type=int,
+            default=None,
+            help="ID_Medico a recalcular (por defecto, todos).",
+        )
+
+    def handle(self, *args, **options):
+        total = resumen_recalcular(options["medico"])
+        self.stdout.write(self.style.SUCCESS(
+            f"Resumen de validación recalculado para {total} médicos."
+        ))
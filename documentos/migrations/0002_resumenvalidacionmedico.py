@@ -0,0 +1,28 @@
+# Generated by Django 5.2.7 on 2026-10-19 10:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('documentos', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ResumenValidacionMedico',
+            fields=[
+                ('id_medico', models.IntegerField(db_column='ID_Medico', primary_key=True, serialize=False)),
+                ('total_documentos', models.IntegerField(db_column='TotalDocumentos', default=0)),
+                ('total_tipos_subidos', models.IntegerField(db_column='TotalTiposSubidos', default=0)),
+                ('total_pendientes', models.IntegerField(db_column='TotalPendientes', default=0)),
+                ('total_aprobados', models.IntegerField(db_column='TotalAprobados', default=0)),
+                ('total_rechazados', models.IntegerField(db_column='TotalRechazados', default=0)),
+                ('actualizado', models.DateTimeField(auto_now=True, db_column='Actualizado')),
+            ],
+            options={
+                'db_table': 'documento_resumen_medico',
+            },
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.7 on 2026-10-19 11:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('documentos', '0002_resumenvalidacionmedico'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ContenidoDocumento',
+            fields=[
+                ('id_documento', models.IntegerField(db_column='ID_Documento', primary_key=True, serialize=False)),
+                ('sha256', models.CharField(db_column='SHA256', db_index=True, max_length=64)),
+                ('tamano', models.BigIntegerField(db_column='Tamano')),
+                ('content_type', models.CharField(blank=True, db_column='ContentType', max_length=100)),
+                ('nombre_original', models.CharField(blank=True, db_column='NombreOriginal', max_length=255)),
+                ('ruta', models.CharField(db_column='Ruta', max_length=200)),
+                ('creado', models.DateTimeField(auto_now_add=True, db_column='Creado')),
+            ],
+            options={
+                'db_table': 'documento_contenido',
+            },
+        ),
+    ]
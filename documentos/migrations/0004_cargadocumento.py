@@ -0,0 +1,36 @@
+# Generated by Django 5.2.7 on 2026-10-19 11:55
+
+import uuid
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('documentos', '0003_contenidodocumento'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CargaDocumento',
+            fields=[
+                ('id_carga', models.UUIDField(db_column='ID_Carga', default=uuid.uuid4, primary_key=True, serialize=False)),
+                ('id_usuario_medico', models.IntegerField(db_column='ID_UsuarioMedico', db_index=True)),
+                ('id_tipo_documento', models.IntegerField(db_column='ID_TipoDocumento')),
+                ('nombre_original', models.CharField(db_column='NombreOriginal', max_length=255)),
+                ('content_type', models.CharField(blank=True, db_column='ContentType', max_length=100)),
+                ('tamano', models.BigIntegerField(db_column='Tamano')),
+                ('recibido', models.BigIntegerField(db_column='Recibido', default=0)),
+                ('estado', models.CharField(db_column='Estado', default='EnCurso', max_length=20)),
+                ('sha256', models.CharField(blank=True, db_column='SHA256', max_length=64)),
+                ('ruta', models.CharField(blank=True, db_column='Ruta', max_length=200)),
+                ('id_documento', models.IntegerField(db_column='ID_Documento', null=True)),
+                ('creado', models.DateTimeField(auto_now_add=True, db_column='Creado')),
+                ('actualizado', models.DateTimeField(auto_now=True, db_column='Actualizado')),
+            ],
+            options={
+                'db_table': 'documento_carga',
+            },
+        ),
+    ]
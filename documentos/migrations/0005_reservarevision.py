@@ -0,0 +1,25 @@
+# Generated by Django 5.2.7 on 2026-10-19 12:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('documentos', '0004_cargadocumento'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReservaRevision',
+            fields=[
+                ('id_documento', models.IntegerField(db_column='ID_Documento', primary_key=True, serialize=False)),
+                ('id_usuario_admin', models.IntegerField(db_column='ID_UsuarioAdmin', db_index=True)),
+                ('expira', models.DateTimeField(db_column='Expira', db_index=True)),
+                ('creado', models.DateTimeField(auto_now=True, db_column='Creado')),
+            ],
+            options={
+                'db_table': 'documento_reserva',
+            },
+        ),
+    ]
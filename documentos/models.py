@@ -1,3 +1,5 @@
+import uuid
+
 from django.db import models
 
 
@@ -35,3 +37,91 @@ class ValidacionDocumento(models.Model):
     class Meta:
         managed = False
         db_table = 'validacion_documento'
+
+
+class ResumenValidacionMedico(models.Model):
+    """
+    Contadores de documentos por médico para el tablero de validaciones.
+
+    Tabla gestionada por Django. Se mantiene de forma incremental desde los
+    wrappers de sp_documento_upload y sp_documento_validate
+    (documentos.services), así el tablero no vuelve a contar documentos.
+    """
+    id_medico = models.IntegerField(db_column='ID_Medico', primary_key=True)
+    total_documentos = models.IntegerField(db_column='TotalDocumentos', default=0)
+    total_tipos_subidos = models.IntegerField(db_column='TotalTiposSubidos', default=0)
+    total_pendientes = models.IntegerField(db_column='TotalPendientes', default=0)
+    total_aprobados = models.IntegerField(db_column='TotalAprobados', default=0)
+    total_rechazados = models.IntegerField(db_column='TotalRechazados', default=0)
+    actualizado = models.DateTimeField(db_column='Actualizado', auto_now=True)
+
+    class Meta:
+        db_table = 'documento_resumen_medico'
+
+
+class ContenidoDocumento(models.Model):
+    """
+    Archivo almacenado de cada documento subido con bytes reales.
+
+    Tabla gestionada por Django. documento.Archivo guarda la ruta
+    (documentos/<ab>/<sha256>.<ext>); aquí queda el hash y los metadatos
+    del archivo original. Varios documentos pueden compartir el mismo
+    sha256 (re-subidas idénticas se guardan una sola vez en disco).
+    """
+    id_documento = models.IntegerField(db_column='ID_Documento', primary_key=True)
+    sha256 = models.CharField(db_column='SHA256', max_length=64, db_index=True)
+    tamano = models.BigIntegerField(db_column='Tamano')
+    content_type = models.CharField(db_column='ContentType', max_length=100, blank=True)
+    nombre_original = models.CharField(db_column='NombreOriginal', max_length=255, blank=True)
+    ruta = models.CharField(db_column='Ruta', max_length=200)
+    creado = models.DateTimeField(db_column='Creado', auto_now_add=True)
+
+    class Meta:
+        db_table = 'documento_contenido'
+
+
+class CargaDocumento(models.Model):
+    """
+    Carga reanudable de un documento (subida por bloques con offset).
+
+    Tabla gestionada por Django. 'recibido' es el siguiente offset que
+    espera el servidor; el archivo temporal está en
+    almacenamiento.ruta_carga(id_carga). Al finalizar se llama
+    sp_documento_upload una sola vez y se guarda id_documento.
+    """
+    EN_CURSO = 'EnCurso'
+    FINALIZADA = 'Finalizada'
+
+    id_carga = models.UUIDField(db_column='ID_Carga', primary_key=True, default=uuid.uuid4)
+    id_usuario_medico = models.IntegerField(db_column='ID_UsuarioMedico', db_index=True)
+    id_tipo_documento = models.IntegerField(db_column='ID_TipoDocumento')
+    nombre_original = models.CharField(db_column='NombreOriginal', max_length=255)
+    content_type = models.CharField(db_column='ContentType', max_length=100, blank=True)
+    tamano = models.BigIntegerField(db_column='Tamano')
+    recibido = models.BigIntegerField(db_column='Recibido', default=0)
+    estado = models.CharField(db_column='Estado', max_length=20, default=EN_CURSO)
+    sha256 = models.CharField(db_column='SHA256', max_length=64, blank=True)
+    ruta = models.CharField(db_column='Ruta', max_length=200, blank=True)
+    id_documento = models.IntegerField(db_column='ID_Documento', null=True)
+    creado = models.DateTimeField(db_column='Creado', auto_now_add=True)
+    actualizado = models.DateTimeField(db_column='Actualizado', auto_now=True)
+
+    class Meta:
+        db_table = 'documento_carga'
+
+
+class ReservaRevision(models.Model):
+    """
+    Reserva temporal (lease) de un documento pendiente por un administrador.
+
+    Tabla gestionada por Django. Mientras 'expira' esté en el futuro, el
+    documento no se entrega a otros administradores al reclamar trabajo y
+    no pueden validarlo. Una reserva vencida se reasigna sin limpieza previa.
+    """
+    id_documento = models.IntegerField(db_column='ID_Documento', primary_key=True)
+    id_usuario_admin = models.IntegerField(db_column='ID_UsuarioAdmin', db_index=True)
+    expira = models.DateTimeField(db_column='Expira', db_index=True)
+    creado = models.DateTimeField(db_column='Creado', auto_now=True)
+
+    class Meta:
+        db_table = 'documento_reserva'
@@ -7,6 +7,53 @@ class DocumentoUploadSerializer(serializers.Serializer):
     archivo = serializers.CharField(max_length=200, required=True, allow_blank=False)
 
 
+class DocumentoArchivoSerializer(serializers.Serializer):
+    """Subida multipart: 'archivo' trae los bytes del documento."""
+    id_usuario_medico = serializers.IntegerField(required=True)
+    id_tipo_documento = serializers.IntegerField(required=True)
+    archivo = serializers.FileField(required=True, allow_empty_file=False)
+
+    def validate_archivo(self, value):
+        from .almacenamiento import EXTENSIONES_PERMITIDAS, TAMANO_MAXIMO, extension
+
+        if extension(value.name) not in EXTENSIONES_PERMITIDAS:
+            raise serializers.ValidationError(
+                f"Extensión no permitida. Usa: {', '.join(sorted(EXTENSIONES_PERMITIDAS))}."
+            )
+        if value.size > TAMANO_MAXIMO:
+            raise serializers.ValidationError(
+                f"El archivo supera el máximo de {TAMANO_MAXIMO // (1024 * 1024)} MB."
+            )
+        return value
+
+
+class CargaInicioSerializer(serializers.Serializer):
+    """Inicio de una carga reanudable: metadatos del archivo completo."""
+    id_usuario_medico = serializers.IntegerField(required=True)
+    id_tipo_documento = serializers.IntegerField(required=True)
+    nombre = serializers.CharField(max_length=255)
+    tamano = serializers.IntegerField(min_value=1)
+    content_type = serializers.CharField(max_length=100, required=False, allow_blank=True)
+
+    def validate_nombre(self, value):
+        from .almacenamiento import EXTENSIONES_PERMITIDAS, extension
+
+        if extension(value) not in EXTENSIONES_PERMITIDAS:
+            raise serializers.ValidationError(
+                f"Extensión no permitida. Usa: {', '.join(sorted(EXTENSIONES_PERMITIDAS))}."
+            )
+        return value
+
+    def validate_tamano(self, value):
+        from .almacenamiento import TAMANO_MAXIMO
+
+        if value > TAMANO_MAXIMO:
+            raise serializers.ValidationError(
+                f"El archivo supera el máximo de {TAMANO_MAXIMO // (1024 * 1024)} MB."
+            )
+        return value
+
+
 class DocumentoSerializer(serializers.Serializer):
     id_documento = serializers.IntegerField()
     archivo = serializers.CharField()
@@ -15,9 +62,47 @@ class DocumentoSerializer(serializers.Serializer):
     id_tipo_documento = serializers.IntegerField()
     tipo_documento = serializers.CharField()
     descripcion = serializers.CharField()
+    vista_previa = serializers.JSONField(required=False, allow_null=True)
 
 
 class DocumentoValidacionSerializer(serializers.Serializer):
     estado = serializers.ChoiceField(choices=['Pendiente', 'Aprobado', 'Rechazado'])
     observaciones = serializers.CharField(allow_blank=True, allow_null=True)
     id_usuario_admin = serializers.IntegerField()
+
+
+class ResumenValidacionQuerySerializer(serializers.Serializer):
+    estado = serializers.ChoiceField(
+        choices=['Pendiente', 'Aprobado', 'Rechazado'], required=False
+    )
+    pagina = serializers.IntegerField(min_value=1, default=1)
+    por_pagina = serializers.IntegerField(min_value=1, max_value=200, default=50)
+
+
+class PendientesQuerySerializer(serializers.Serializer):
+    pagina = serializers.IntegerField(min_value=1, default=1)
+    por_pagina = serializers.IntegerField(min_value=1, max_value=200, default=50)
+
+
+class ReclamarRevisionSerializer(serializers.Serializer):
+    cantidad = serializers.IntegerField(min_value=1, max_value=50, default=10)
+    minutos = serializers.IntegerField(min_value=1, max_value=120, default=15)
+
+
+class LiberarRevisionSerializer(serializers.Serializer):
+    ids = serializers.ListField(
+        child=serializers.IntegerField(), required=False, allow_empty=True
+    )
+
+
+class DecisionDocumentoSerializer(serializers.Serializer):
+    id_documento = serializers.IntegerField()
+    estado = serializers.ChoiceField(choices=['Aprobado', 'Rechazado'])
+    observaciones = serializers.CharField(allow_blank=True, required=False, default="")
+
+
+class ValidarLoteSerializer(serializers.Serializer):
+    id_usuario_admin = serializers.IntegerField()
+    decisiones = serializers.ListField(
+        child=DecisionDocumentoSerializer(), allow_empty=False, max_length=100
+    )
@@ -1,4 +1,27 @@
-from django.db import connection, DatabaseError
+from datetime import timedelta
+
+from django.db import connection, transaction, DatabaseError
+from django.db.models import Count, Exists, F, OuterRef, Q
+from django.utils import timezone
+
+from medicos.models import Medico
+
+from . import almacenamiento, vistas_previas
+from .models import (
+    CargaDocumento,
+    ContenidoDocumento,
+    Documento,
+    ReservaRevision,
+    ResumenValidacionMedico,
+)
+
+
+# Columna del resumen que cuenta cada estado de documento
+CONTADOR_POR_ESTADO = {
+    "Pendiente": "total_pendientes",
+    "Aprobado": "total_aprobados",
+    "Rechazado": "total_rechazados",
+}
 
 
 def dictfetchall(cursor):
@@ -6,48 +29,115 @@ def dictfetchall(cursor):
     return [dict(zip(columns, row)) for row in cursor.fetchall()]
 
 
-def sp_documento_upload(id_usuario_medico: int, id_tipo_documento: int, archivo: str) -> int:
+def sp_documento_upload(id_usuario_medico: int, id_tipo_documento: int, archivo: str,
+                        contenido: dict = None) -> int:
     """
     Ejecuta sp_documento_upload y retorna el ID del documento creado.
+
+    También suma el documento (en estado Pendiente) al resumen del médico.
+
+    Args:
+        archivo: Nombre o ruta almacenada (documentos/<ab>/<sha256>.<ext>)
+        contenido: Metadatos del archivo guardado (documentos.almacenamiento):
+                   {"sha256", "tamano", "ruta", "content_type", "nombre_original"}.
+                   Si se pasa, se registra en documento_contenido.
     """
-    with connection.cursor() as cursor:
-        try:
-            cursor.callproc("sp_documento_upload", [
-                id_usuario_medico,
-                id_tipo_documento,
-                archivo
-            ])
-            row = cursor.fetchone()
-            return int(row[0]) if row else None
-        except DatabaseError as e:
-            # Se maneja en la vista
-            raise e
+    # Pre-lectura, SP y ajuste en una transacción con la fila del médico
+    # bloqueada: dos subidas simultáneas de un tipo nuevo no cuentan ambas
+    # en total_tipos_subidos
+    with transaction.atomic():
+        id_medico = (
+            Medico.objects.select_for_update()
+            .filter(id_usuario=id_usuario_medico)
+            .values_list("id_medico", flat=True)
+            .first()
+        )
+        tipo_nuevo = id_medico is not None and not Documento.objects.filter(
+            id_medico=id_medico, id_tipo_documento=id_tipo_documento
+        ).exists()
+
+        with connection.cursor() as cursor:
+            try:
+                cursor.callproc("sp_documento_upload", [
+                    id_usuario_medico,
+                    id_tipo_documento,
+                    archivo
+                ])
+                row = cursor.fetchone()
+                nuevo_id = int(row[0]) if row else None
+            except DatabaseError as e:
+                # Se maneja en la vista
+                raise e
+
+        if contenido and nuevo_id is not None:
+            ContenidoDocumento.objects.create(
+                id_documento=nuevo_id,
+                sha256=contenido["sha256"],
+                tamano=contenido["tamano"],
+                content_type=contenido.get("content_type") or "",
+                nombre_original=(contenido.get("nombre_original") or "")[:255],
+                ruta=contenido["ruta"],
+            )
+            # Vistas previas en el pool de procesos, cuando el documento ya existe
+            transaction.on_commit(
+                lambda: vistas_previas.encolar(contenido["ruta"], contenido["sha256"])
+            )
+
+        if id_medico is not None:
+            resumen_ajustar(
+                id_medico,
+                total_documentos=1,
+                total_pendientes=1,
+                total_tipos_subidos=1 if tipo_nuevo else 0,
+            )
+    return nuevo_id
 
 
 def sp_documento_validate(id_documento: int, estado: str, observaciones: str, id_usuario_admin: int):
     """
     Ejecuta sp_documento_validate y retorna el resumen del estado del médico y documentos.
+
+    También mueve el documento entre contadores del resumen del médico.
     """
-    with connection.cursor() as cursor:
-        try:
-            cursor.callproc("sp_documento_validate", [
-                id_documento,
-                estado,
-                observaciones,
-                id_usuario_admin
-            ])
-            row = cursor.fetchone()
-            if not row:
-                return None
-
-            return {
-                "estado_medico": row[0],
-                "tipos_aprobados": row[1],
-                "tipos_requeridos": row[2],
-                "mensaje": row[3],
-            }
-        except DatabaseError as e:
-            raise e
+    # Pre-lectura, SP y ajuste en una transacción con el documento
+    # bloqueado: dos admins validando a la vez no aplican dos transiciones
+    # desde el mismo estado anterior
+    with transaction.atomic():
+        anterior = (
+            Documento.objects.select_for_update()
+            .filter(id_documento=id_documento)
+            .values("id_medico", "estado")
+            .first()
+        )
+
+        with connection.cursor() as cursor:
+            try:
+                cursor.callproc("sp_documento_validate", [
+                    id_documento,
+                    estado,
+                    observaciones,
+                    id_usuario_admin
+                ])
+                row = cursor.fetchone()
+            except DatabaseError as e:
+                raise e
+
+        if anterior and anterior["id_medico"] is not None and anterior["estado"] != estado:
+            deltas = {}
+            if anterior["estado"] in CONTADOR_POR_ESTADO:
+                deltas[CONTADOR_POR_ESTADO[anterior["estado"]]] = -1
+            deltas[CONTADOR_POR_ESTADO[estado]] = 1
+            resumen_ajustar(anterior["id_medico"], **deltas)
+
+    if not row:
+        return None
+
+    return {
+        "estado_medico": row[0],
+        "tipos_aprobados": row[1],
+        "tipos_requeridos": row[2],
+        "mensaje": row[3],
+    }
 
 
 def sp_documento_list_by_usuario(id_usuario_medico: int):
@@ -60,3 +150,428 @@ def sp_documento_list_by_usuario(id_usuario_medico: int):
             return dictfetchall(cursor)
         except DatabaseError as e:
             raise e
+
+
+# =============================================================================
+# RESUMEN DE VALIDACIÓN POR MÉDICO (tablero de administración)
+# =============================================================================
+
+def resumen_ajustar(id_medico, **deltas):
+    """
+    Suma deltas a los contadores del médico con un UPDATE atómico.
+
+    Si el médico aún no tiene fila, se calcula completa desde 'documento'
+    (una sola vez); el documento recién subido/validado ya queda incluido.
+    """
+    cambios = {campo: F(campo) + delta for campo, delta in deltas.items() if delta}
+    if not cambios:
+        return
+    actualizadas = ResumenValidacionMedico.objects.filter(
+        id_medico=id_medico
+    ).update(**cambios)
+    if not actualizadas:
+        resumen_recalcular(id_medico)
+
+
+def resumen_recalcular(id_medico=None):
+    """
+    Recalcula el resumen con una consulta agrupada sobre 'documento'.
+
+    Args:
+        id_medico: Solo ese médico; None recalcula todos.
+
+    Returns:
+        int: Cantidad de médicos recalculados
+    """
+    documentos = Documento.objects.all()
+    if id_medico is not None:
+        documentos = documentos.filter(id_medico=id_medico)
+
+    grupos = (
+        documentos.exclude(id_medico=None)
+        .values("id_medico")
+        .annotate(
+            total_documentos=Count("id_documento"),
+            total_tipos_subidos=Count("id_tipo_documento", distinct=True),
+            total_pendientes=Count("id_documento", filter=Q(estado="Pendiente")),
+            total_aprobados=Count("id_documento", filter=Q(estado="Aprobado")),
+            total_rechazados=Count("id_documento", filter=Q(estado="Rechazado")),
+        )
+    )
+    filas = [ResumenValidacionMedico(**grupo) for grupo in grupos]
+    if id_medico is not None and not filas:
+        filas = [ResumenValidacionMedico(id_medico=id_medico)]
+
+    ResumenValidacionMedico.objects.bulk_create(
+        filas,
+        update_conflicts=True,
+        unique_fields=["id_medico"],
+        update_fields=[
+            "total_documentos",
+            "total_tipos_subidos",
+            "total_pendientes",
+            "total_aprobados",
+            "total_rechazados",
+            "actualizado",
+        ],
+    )
+    return len(filas)
+
+
+def resumen_listar(estado_validacion=None, limite=50, desplazamiento=0):
+    """
+    Estado de validación de varios médicos en una sola consulta.
+
+    Mismos campos que sp_medico_estado (sin total_tipos_documento, que es
+    global y lo agrega la vista), leyendo los contadores ya mantenidos.
+    """
+    sql = """
+        SELECT m.ID_Medico, m.ID_Usuario, u.Nombre, u.Apellidos, u.Activo,
+               m.EstadoValidacion,
+               COALESCE(r.TotalTiposSubidos, 0),
+               COALESCE(r.TotalAprobados, 0),
+               COALESCE(r.TotalPendientes, 0),
+               COALESCE(r.TotalRechazados, 0),
+               COALESCE(r.TotalDocumentos, 0)
+        FROM medico m
+        JOIN usuario u ON u.ID_Usuario = m.ID_Usuario
+        LEFT JOIN documento_resumen_medico r ON r.ID_Medico = m.ID_Medico
+    """
+    params = []
+    if estado_validacion:
+        sql += " WHERE m.EstadoValidacion = %s"
+        params.append(estado_validacion)
+    sql += """
+        ORDER BY COALESCE(r.TotalPendientes, 0) DESC, u.Apellidos, u.Nombre
+        LIMIT %s OFFSET %s
+    """
+    params += [limite, desplazamiento]
+
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return [
+            {
+                "id_medico": r[0],
+                "id_usuario": r[1],
+                "nombre": r[2],
+                "apellidos": r[3],
+                "usuario_activo": bool(r[4]),
+                "estado_validacion": r[5],
+                "total_tipos_subidos": r[6],
+                "total_aprobados": r[7],
+                "total_pendientes": r[8],
+                "total_rechazados": r[9],
+                "total_documentos": r[10],
+            }
+            for r in cursor.fetchall()
+        ]
+
+
+# =============================================================================
+# CARGAS REANUDABLES (iniciar → bloques con offset → finalizar)
+# =============================================================================
+
+class CargaConflicto(Exception):
+    """El offset o el estado de la carga no permiten la operación (HTTP 409)."""
+
+    def __init__(self, mensaje, carga):
+        super().__init__(mensaje)
+        self.carga = carga
+
+
+def carga_iniciar(id_usuario_medico, id_tipo_documento, nombre, tamano, content_type=""):
+    """Registra la carga y preasigna su archivo temporal disperso."""
+    carga = CargaDocumento.objects.create(
+        id_usuario_medico=id_usuario_medico,
+        id_tipo_documento=id_tipo_documento,
+        nombre_original=nombre[:255],
+        content_type=content_type or "",
+        tamano=tamano,
+    )
+    almacenamiento.crear_archivo_disperso(
+        almacenamiento.ruta_carga(carga.id_carga), tamano
+    )
+    return carga
+
+
+def carga_escribir(carga, offset, flujo, cantidad):
+    """
+    Escribe un bloque en su offset y avanza 'recibido'.
+
+    Solo se acepta offset == recibido (bloques en orden). El avance se hace
+    con un UPDATE condicionado al offset esperado: si dos peticiones
+    reintentan el mismo bloque, solo una cuenta.
+
+    Returns:
+        CargaDocumento: Carga actualizada
+
+    Raises:
+        CargaConflicto: Offset distinto al esperado o carga ya finalizada
+    """
+    if carga.estado != CargaDocumento.EN_CURSO:
+        raise CargaConflicto("La carga ya fue finalizada.", carga)
+    if offset != carga.recibido:
+        raise CargaConflicto("El offset no coincide con lo recibido.", carga)
+
+    escritos, _ = almacenamiento.escribir_bloque(
+        almacenamiento.ruta_carga(carga.id_carga), offset, flujo, cantidad
+    )
+    avanzadas = CargaDocumento.objects.filter(
+        id_carga=carga.id_carga,
+        estado=CargaDocumento.EN_CURSO,
+        recibido=offset,
+    ).update(recibido=offset + escritos, actualizado=timezone.now())
+
+    carga.refresh_from_db()
+    if not avanzadas:
+        raise CargaConflicto("Otro envío del mismo bloque ya fue registrado.", carga)
+    return carga
+
+
+def carga_finalizar(id_carga):
+    """
+    Hashea y publica el archivo, y llama sp_documento_upload una sola vez.
+
+    Dos fases, cada una con la fila bloqueada (SELECT ... FOR UPDATE):
+    1. Hash + os.replace al almacenamiento por contenido; se guarda sha256
+       y ruta en la carga.
+    2. sp_documento_upload y estado Finalizada.
+    Si el SP falla, la fase 2 se revierte pero el archivo ya publicado se
+    reutiliza al reintentar. Llamadas repetidas a una carga finalizada
+    devuelven el mismo documento.
+
+    Raises:
+        CargaConflicto: Faltan bytes por recibir
+        DatabaseError: Error del SP (se maneja en la vista)
+    """
+    with transaction.atomic():
+        carga = CargaDocumento.objects.select_for_update().get(id_carga=id_carga)
+        if carga.estado == CargaDocumento.FINALIZADA:
+            return carga
+        if carga.recibido < carga.tamano:
+            raise CargaConflicto("La carga aún no está completa.", carga)
+
+        if not carga.sha256:
+            tmp = almacenamiento.ruta_carga(carga.id_carga)
+            sha256 = almacenamiento.hash_archivo(tmp)
+            info = almacenamiento.publicar(
+                tmp, sha256, almacenamiento.extension(carga.nombre_original), carga.tamano
+            )
+            carga.sha256 = sha256
+            carga.ruta = info["ruta"]
+            carga.save(update_fields=["sha256", "ruta", "actualizado"])
+
+    with transaction.atomic():
+        carga = CargaDocumento.objects.select_for_update().get(id_carga=id_carga)
+        if carga.estado == CargaDocumento.FINALIZADA:
+            return carga
+
+        carga.id_documento = sp_documento_upload(
+            id_usuario_medico=carga.id_usuario_medico,
+            id_tipo_documento=carga.id_tipo_documento,
+            archivo=carga.ruta,
+            contenido={
+                "sha256": carga.sha256,
+                "tamano": carga.tamano,
+                "ruta": carga.ruta,
+                "content_type": carga.content_type,
+                "nombre_original": carga.nombre_original,
+            },
+        )
+        carga.estado = CargaDocumento.FINALIZADA
+        carga.save(update_fields=["id_documento", "estado", "actualizado"])
+    return carga
+
+
+def carga_cancelar(carga):
+    """Elimina una carga en curso y su archivo temporal."""
+    if carga.estado == CargaDocumento.EN_CURSO:
+        almacenamiento.eliminar_carga(carga.id_carga)
+        carga.delete()
+
+
+def carga_a_dict(carga):
+    return {
+        "id_carga": str(carga.id_carga),
+        "nombre": carga.nombre_original,
+        "tamano": carga.tamano,
+        "recibido": carga.recibido,
+        "estado": carga.estado,
+        "id_documento": carga.id_documento,
+        "sha256": carga.sha256 or None,
+    }
+
+
+# =============================================================================
+# COLA DE REVISIÓN (reservas con vencimiento para varios administradores)
+# =============================================================================
+
+def _reservas_ajenas(id_usuario_admin, ahora):
+    """Reservas vigentes de otros administradores."""
+    return ReservaRevision.objects.filter(expira__gt=ahora).exclude(
+        id_usuario_admin=id_usuario_admin
+    )
+
+
+def revision_pendientes(limite=50, desplazamiento=0):
+    """
+    Documentos Pendiente, del más antiguo al más nuevo, con su reserva.
+
+    El orden es por ID_Documento (autoincremental = orden de subida), que
+    usa la llave primaria en lugar de ordenar por fecha.
+
+    Returns:
+        tuple: (total, filas)
+    """
+    ahora = timezone.now()
+    total = Documento.objects.filter(estado="Pendiente").count()
+    sql = """
+        SELECT d.ID_Documento, d.Archivo, d.FechaSubida, d.ID_TipoDocumento,
+               t.Nombre, m.ID_Usuario, u.Nombre, u.Apellidos,
+               r.ID_UsuarioAdmin, r.Expira
+        FROM documento d
+        LEFT JOIN tipo_documento t ON t.ID_TipoDocumento = d.ID_TipoDocumento
+        LEFT JOIN medico m ON m.ID_Medico = d.ID_Medico
+        LEFT JOIN usuario u ON u.ID_Usuario = m.ID_Usuario
+        LEFT JOIN documento_reserva r
+               ON r.ID_Documento = d.ID_Documento AND r.Expira > %s
+        WHERE d.Estado = 'Pendiente'
+        ORDER BY d.ID_Documento
+        LIMIT %s OFFSET %s
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [ahora, limite, desplazamiento])
+        filas = [
+            {
+                "id_documento": r[0],
+                "archivo": r[1],
+                "fecha_subida": r[2],
+                "id_tipo_documento": r[3],
+                "tipo_documento": r[4],
+                "id_usuario_medico": r[5],
+                "nombre_medico": r[6],
+                "apellidos_medico": r[7],
+                "reservado_por": r[8],
+                "reserva_expira": r[9],
+            }
+            for r in cursor.fetchall()
+        ]
+    return total, filas
+
+
+def revision_reclamar(id_usuario_admin, cantidad=10, minutos=15):
+    """
+    Reserva hasta 'cantidad' documentos pendientes para un administrador.
+
+    Toma los más antiguos que no tengan reserva vigente de otro admin,
+    con SELECT ... FOR UPDATE SKIP LOCKED: dos admins reclamando a la vez
+    reciben lotes distintos sin esperarse entre sí. Las reservas propias
+    vigentes se renuevan.
+
+    Returns:
+        tuple: (ids de documentos reservados, fecha de vencimiento)
+    """
+    ahora = timezone.now()
+    expira = ahora + timedelta(minutes=minutos)
+    ajenas = _reservas_ajenas(id_usuario_admin, ahora).filter(
+        id_documento=OuterRef("id_documento")
+    )
+
+    with transaction.atomic():
+        ids = list(
+            Documento.objects.select_for_update(skip_locked=True)
+            .filter(estado="Pendiente")
+            .filter(~Exists(ajenas))
+            .order_by("id_documento")
+            .values_list("id_documento", flat=True)[:cantidad]
+        )
+        ReservaRevision.objects.bulk_create(
+            [
+                ReservaRevision(
+                    id_documento=id_documento,
+                    id_usuario_admin=id_usuario_admin,
+                    expira=expira,
+                )
+                for id_documento in ids
+            ],
+            update_conflicts=True,
+            unique_fields=["id_documento"],
+            update_fields=["id_usuario_admin", "expira", "creado"],
+        )
+    return ids, expira
+
+
+def revision_liberar(id_usuario_admin, ids=None):
+    """Libera reservas propias (todas si ids es None). Retorna cuántas."""
+    reservas = ReservaRevision.objects.filter(id_usuario_admin=id_usuario_admin)
+    if ids is not None:
+        reservas = reservas.filter(id_documento__in=ids)
+    borradas, _ = reservas.delete()
+    return borradas
+
+
+def revision_reserva_ajena(id_documento, id_usuario_admin):
+    """Reserva vigente de otro administrador sobre el documento, o None."""
+    return _reservas_ajenas(id_usuario_admin, timezone.now()).filter(
+        id_documento=id_documento
+    ).first()
+
+
+def revision_validar_lote(id_usuario_admin, decisiones):
+    """
+    Aplica varias validaciones con sp_documento_validate.
+
+    Cada documento se valida por separado (un error no detiene el lote);
+    los reservados por otro admin se omiten. Las reservas propias de los
+    documentos validados se liberan al final.
+
+    Args:
+        decisiones: [{"id_documento", "estado", "observaciones"}, ...]
+
+    Returns:
+        tuple: (resultados por documento, ids de médicos afectados)
+    """
+    ajenas = set(
+        _reservas_ajenas(id_usuario_admin, timezone.now())
+        .filter(id_documento__in=[d["id_documento"] for d in decisiones])
+        .values_list("id_documento", flat=True)
+    )
+    medicos = dict(
+        Documento.objects.filter(
+            id_documento__in=[d["id_documento"] for d in decisiones]
+        ).values_list("id_documento", "id_medico")
+    )
+
+    resultados = []
+    validados = []
+    for decision in decisiones:
+        id_documento = decision["id_documento"]
+        resultado = {"id_documento": id_documento, "estado": decision["estado"]}
+        resultados.append(resultado)
+
+        if id_documento in ajenas:
+            resultado.update(ok=False, detail="Reservado por otro administrador.")
+            continue
+        if id_documento not in medicos:
+            resultado.update(ok=False, detail="El documento no existe.")
+            continue
+
+        try:
+            resumen = sp_documento_validate(
+                id_documento=id_documento,
+                estado=decision["estado"],
+                observaciones=decision.get("observaciones") or f"Documento {decision['estado'].lower()}.",
+                id_usuario_admin=id_usuario_admin,
+            )
+        except DatabaseError as e:
+            resultado.update(ok=False, detail=str(e))
+            continue
+
+        resultado.update(ok=True, medico=resumen)
+        validados.append(id_documento)
+
+    if validados:
+        revision_liberar(id_usuario_admin, validados)
+
+    afectados = {medicos[i] for i in validados if medicos.get(i) is not None}
+    return resultados, afectados
@@ -6,6 +6,60 @@ router = DefaultRouter()
 router.register(r'documentos', DocumentoViewSet, basename='documentos')
 
 urlpatterns = router.urls + [
+    path(
+        'documentos/resumen-medicos/',
+        DocumentoViewSet.as_view({'get': 'resumen_medicos'}),
+        name='documento-resumen-medicos'
+    ),
+    path(
+        'documentos/pendientes/',
+        DocumentoViewSet.as_view({'get': 'pendientes'}),
+        name='documento-pendientes'
+    ),
+    path(
+        'documentos/reclamar/',
+        DocumentoViewSet.as_view({'post': 'reclamar'}),
+        name='documento-reclamar'
+    ),
+    path(
+        'documentos/liberar/',
+        DocumentoViewSet.as_view({'post': 'liberar'}),
+        name='documento-liberar'
+    ),
+    path(
+        'documentos/validar-lote/',
+        DocumentoViewSet.as_view({'post': 'validar_lote'}),
+        name='documento-validar-lote'
+    ),
+    path(
+        'documentos/cargas/',
+        DocumentoViewSet.as_view({'post': 'iniciar_carga'}),
+        name='documento-cargas'
+    ),
+    path(
+        'documentos/cargas/<uuid:id_carga>/',
+        DocumentoViewSet.as_view({
+            'get': 'estado_carga',
+            'put': 'subir_bloque',
+            'delete': 'cancelar_carga',
+        }),
+        name='documento-carga'
+    ),
+    path(
+        'documentos/cargas/<uuid:id_carga>/finalizar/',
+        DocumentoViewSet.as_view({'post': 'finalizar_carga'}),
+        name='documento-carga-finalizar'
+    ),
+    path(
+        'documentos/<int:pk>/descargar/',
+        DocumentoViewSet.as_view({'get': 'descargar'}),
+        name='documento-descargar'
+    ),
+    path(
+        'documentos/<int:pk>/vista-previa/',
+        DocumentoViewSet.as_view({'get': 'vista_previa'}),
+        name='documento-vista-previa'
+    ),
     path(
         'documentos/<int:pk>/validar/',
         DocumentoViewSet.as_view({'post': 'validate'}),
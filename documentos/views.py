@@ -10,7 +10,9 @@ Lógica de permisos:
 - Validar documento (validate): Solo Administradores
 """
 
+from django.conf import settings
 from django.db import DatabaseError
+from django.http import HttpResponse
 from rest_framework import status, viewsets
 from rest_framework.decorators import action
 from rest_framework.response import Response
@@ -20,29 +22,82 @@ from backend.permissions import IsMedico, IsAdministrador, IsAuthenticated
 
 from .serializers import (
     DocumentoUploadSerializer,
+    DocumentoArchivoSerializer,
+    CargaInicioSerializer,
     DocumentoSerializer,
     DocumentoValidacionSerializer,
+    ResumenValidacionQuerySerializer,
+    PendientesQuerySerializer,
+    ReclamarRevisionSerializer,
+    LiberarRevisionSerializer,
+    ValidarLoteSerializer,
 )
 from .services import (
     sp_documento_upload,
     sp_documento_validate,
     sp_documento_list_by_usuario,
+    resumen_listar,
+    CargaConflicto,
+    carga_iniciar,
+    carga_escribir,
+    carga_finalizar,
+    carga_cancelar,
+    carga_a_dict,
+    revision_pendientes,
+    revision_reclamar,
+    revision_liberar,
+    revision_reserva_ajena,
+    revision_validar_lote,
 )
 
 
+# Acciones de subida (simple y reanudable): solo médicos
+ACCIONES_CARGA = [
+    'create',
+    'iniciar_carga',
+    'estado_carga',
+    'subir_bloque',
+    'cancelar_carga',
+    'finalizar_carga',
+]
+
+
+# Validación y cola de revisión: solo administradores
+ACCIONES_ADMIN = [
+    'validate',
+    'resumen_medicos',
+    'pendientes',
+    'reclamar',
+    'liberar',
+    'validar_lote',
+]
+
+
 class DocumentoViewSet(viewsets.ViewSet):
     """
     ViewSet para gestión de Documentos de Médicos.
     
     Endpoints:
     - GET  /api/documentos/?id_usuario_medico=X    → Listar documentos
-    - POST /api/documentos/                         → Subir documento
+    - POST /api/documentos/                         → Subir documento (JSON o multipart)
     - POST /api/documentos/:id/validar/             → Validar documento
+    - GET  /api/documentos/:id/descargar/           → Descargar archivo (Range/ETag)
+    - GET  /api/documentos/:id/vista-previa/        → Vista previa (primera página)
+    - GET  /api/documentos/pendientes/              → Cola de revisión (más antiguos primero)
+    - POST /api/documentos/reclamar/                → Reservar un lote de pendientes
+    - POST /api/documentos/liberar/                 → Liberar reservas propias
+    - POST /api/documentos/validar-lote/            → Validar varios documentos
+    - GET  /api/documentos/resumen-medicos/         → Estado de validación por médico
+    - POST   /api/documentos/cargas/                → Iniciar carga reanudable
+    - GET    /api/documentos/cargas/:id/            → Progreso de la carga
+    - PUT    /api/documentos/cargas/:id/            → Enviar bloque (Upload-Offset)
+    - DELETE /api/documentos/cargas/:id/            → Cancelar carga
+    - POST   /api/documentos/cargas/:id/finalizar/  → Finalizar (crea el documento)
     
     Permisos implementados:
-    - list: Autenticado + ownership (médico solo sus docs)
-    - create: Solo Médicos + ownership
-    - validate: Solo Administradores
+    - list/descargar/vista_previa: Autenticado + ownership (médico solo sus docs)
+    - create/cargas: Solo Médicos + ownership
+    - validate/resumen_medicos/cola de revisión: Solo Administradores
     """
     
     def get_permissions(self):
@@ -50,19 +105,19 @@ class DocumentoViewSet(viewsets.ViewSet):
         Define los permisos según la acción.
         
         Lógica:
-        - create: Solo médicos
+        - create, cargas: Solo médicos
         - validate: Solo administradores
         - list: Autenticado (validación ownership en método)
         
         Returns:
             list: Lista de instancias de permisos
         """
-        if self.action == 'create':
+        if self.action in ACCIONES_CARGA:
             # Solo médicos suben documentos
             return [IsMedico()]
         
-        elif self.action == 'validate':
-            # Solo administradores validan
+        elif self.action in ACCIONES_ADMIN:
+            # Solo administradores validan y ven el tablero
             return [IsAdministrador()]
         
         else:
@@ -141,6 +196,15 @@ class DocumentoViewSet(viewsets.ViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
+        # Vistas previas ya generadas (una consulta para todo el listado)
+        from .models import ContenidoDocumento
+        from .vistas_previas import urls_vista_previa
+        hashes = dict(
+            ContenidoDocumento.objects.filter(
+                id_documento__in=[d["ID_Documento"] for d in docs]
+            ).values_list("id_documento", "sha256")
+        )
+        
         # Mapear resultados a formato estándar
         data = []
         for d in docs:
@@ -152,6 +216,9 @@ class DocumentoViewSet(viewsets.ViewSet):
                 "id_tipo_documento": d["ID_TipoDocumento"],
                 "tipo_documento": d["TipoDocumento"],
                 "descripcion": d["Descripcion"],
+                "vista_previa": urls_vista_previa(
+                    d["ID_Documento"], hashes.get(d["ID_Documento"]), request
+                ),
             })
         
         serializer = DocumentoSerializer(data=data, many=True)
@@ -159,6 +226,379 @@ class DocumentoViewSet(viewsets.ViewSet):
         
         return Response(serializer.data, status=status.HTTP_200_OK)
     
+    @action(detail=False, methods=['get'], url_path='resumen-medicos')
+    def resumen_medicos(self, request):
+        """
+        GET /api/documentos/resumen-medicos/?estado=Pendiente&pagina=1&por_pagina=50
+        
+        Estado de validación de una página de médicos en una sola consulta,
+        con los mismos contadores que sp_medico_estado.
+        
+        Permiso: Solo Administradores
+        
+        Query Params:
+            estado: Filtra por EstadoValidacion del médico (opcional)
+            pagina / por_pagina: Paginación (máx. 200 por página)
+        
+        Response:
+            200: {
+                "total": 120, "pagina": 1, "por_pagina": 50,
+                "total_tipos_documento": 4,
+                "resultados": [{"id_usuario": 2, "total_pendientes": 1, ...}]
+            }
+        """
+        serializer = ResumenValidacionQuerySerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        estado = serializer.validated_data.get("estado")
+        pagina = serializer.validated_data["pagina"]
+        por_pagina = serializer.validated_data["por_pagina"]
+        
+        from documentos.models import TipoDocumento
+        from medicos.models import Medico
+        
+        medicos = Medico.objects.all()
+        if estado:
+            medicos = medicos.filter(estado_validacion=estado)
+        total_tipos = TipoDocumento.objects.count()
+        
+        resultados = resumen_listar(
+            estado_validacion=estado,
+            limite=por_pagina,
+            desplazamiento=(pagina - 1) * por_pagina,
+        )
+        for fila in resultados:
+            fila["total_tipos_documento"] = total_tipos
+        
+        return Response(
+            {
+                "total": medicos.count(),
+                "pagina": pagina,
+                "por_pagina": por_pagina,
+                "total_tipos_documento": total_tipos,
+                "resultados": resultados,
+            },
+            status=status.HTTP_200_OK
+        )
+    
+    def _documento_autorizado(self, request, pk):
+        """
+        Devuelve (documento, None) o (None, Response de error).
+        
+        VALIDACIÓN DE OWNERSHIP: Médico solo accede a sus documentos,
+        Admin a cualquiera.
+        """
+        from .models import Documento
+        
+        documento = Documento.objects.filter(id_documento=int(pk)).first()
+        if documento is None:
+            return None, Response(
+                {"detail": "El documento no existe."},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        
+        if request.user.rol == 'Medico':
+            from medicos.models import Medico
+            id_medico = (
+                Medico.objects.filter(id_usuario=request.user.id_usuario)
+                .values_list("id_medico", flat=True)
+                .first()
+            )
+            if id_medico is None or id_medico != documento.id_medico:
+                return None, Response(
+                    {"detail": "No tienes permiso para acceder a este documento."},
+                    status=status.HTTP_403_FORBIDDEN
+                )
+        elif request.user.rol != 'Administrador':
+            return None, Response(
+                {"detail": "No tienes permiso para acceder a documentos."},
+                status=status.HTTP_403_FORBIDDEN
+            )
+        
+        return documento, None
+    
+    @action(detail=True, methods=['get'], url_path='descargar')
+    def descargar(self, request, pk=None):
+        """
+        GET /api/documentos/:id/descargar/
+        
+        Descarga el archivo de un documento subido con bytes reales.
+        
+        Permiso:
+        - Médico: solo sus propios documentos
+        - Admin: cualquier documento
+        
+        Headers soportados:
+            Range: bytes=0-65535      → 206 con ese rango (visores PDF)
+            If-None-Match: "<sha256>" → 304 si no cambió
+        
+        El archivo se envía por bloques (almacenamiento.respuesta_archivo):
+        bajo WSGI con FileResponse (sendfile cuando está disponible), bajo
+        ASGI con un iterador asíncrono. Con DOCUMENTOS_X_ACCEL_REDIRECT lo
+        envía nginx directamente.
+        
+        Response:
+            200: Archivo completo
+            206: Rango parcial
+            304: Sin cambios (ETag)
+            403: No es su documento
+            404: Documento o archivo no encontrado
+            416: Rango fuera del archivo
+        """
+        from .almacenamiento import rango_solicitado, respuesta_archivo, ruta_absoluta
+        from .models import ContenidoDocumento
+        
+        documento, error = self._documento_autorizado(request, pk)
+        if error:
+            return error
+        
+        contenido = ContenidoDocumento.objects.filter(id_documento=documento.id_documento).first()
+        ruta = ruta_absoluta(contenido.ruta) if contenido else None
+        if ruta is None or not ruta.is_file():
+            return Response(
+                {
+                    "detail": "Este documento no tiene archivo almacenado.",
+                    "hint": "Fue registrado solo con el nombre del archivo."
+                },
+                status=status.HTTP_404_NOT_FOUND
+            )
+        
+        etag = f'"{contenido.sha256}"'
+        tamano = ruta.stat().st_size
+        content_type = contenido.content_type or "application/octet-stream"
+        cabeceras = {
+            "ETag": etag,
+            "Accept-Ranges": "bytes",
+            # Siempre revalidar: el documento es privado
+            "Cache-Control": "private, no-cache",
+        }
+        
+        if request.headers.get("If-None-Match") == etag:
+            respuesta = HttpResponse(status=status.HTTP_304_NOT_MODIFIED)
+            for nombre, valor in cabeceras.items():
+                respuesta[nombre] = valor
+            return respuesta
+        
+        acelerado = getattr(settings, "DOCUMENTOS_X_ACCEL_REDIRECT", None)
+        if acelerado:
+            respuesta = HttpResponse(content_type=content_type)
+            respuesta["X-Accel-Redirect"] = acelerado.rstrip("/") + "/" + contenido.ruta
+            for nombre, valor in cabeceras.items():
+                respuesta[nombre] = valor
+            return respuesta
+        
+        rango = None
+        if request.headers.get("If-Range", etag) == etag:
+            rango = rango_solicitado(request.headers.get("Range"), tamano)
+        
+        if rango is False:
+            respuesta = HttpResponse(status=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE)
+            respuesta["Content-Range"] = f"bytes */{tamano}"
+            return respuesta
+        
+        respuesta = respuesta_archivo(
+            request, ruta, content_type, rango,
+            nombre=contenido.nombre_original or ruta.name,
+        )
+        for nombre, valor in cabeceras.items():
+            respuesta[nombre] = valor
+        return respuesta
+    
+    @action(detail=True, methods=['get'], url_path='vista-previa')
+    def vista_previa(self, request, pk=None):
+        """
+        GET /api/documentos/:id/vista-previa/?tipo=vista|miniatura
+        
+        Imagen WebP de la primera página del documento (generada en segundo
+        plano al subirlo). Las URLs vienen en el campo "vista_previa" del
+        listado.
+        
+        Permiso: Igual que descargar (médico sus docs, admin todos)
+        
+        Response:
+            200: Imagen WebP
+            404: Sin vista previa (PDF, legado o aún generándose)
+        """
+        from .almacenamiento import respuesta_archivo
+        from .models import ContenidoDocumento
+        from .vistas_previas import TIPOS, ruta_vista
+        
+        documento, error = self._documento_autorizado(request, pk)
+        if error:
+            return error
+        
+        tipo = request.query_params.get("tipo", "vista")
+        if tipo not in TIPOS:
+            return Response(
+                {"detail": f"Tipo inválido. Usa: {', '.join(TIPOS)}."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        sha256 = (
+            ContenidoDocumento.objects.filter(id_documento=documento.id_documento)
+            .values_list("sha256", flat=True)
+            .first()
+        )
+        ruta = ruta_vista(sha256, tipo) if sha256 else None
+        if ruta is None or not ruta.is_file():
+            return Response(
+                {"detail": "Este documento no tiene vista previa disponible."},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        
+        respuesta = respuesta_archivo(request, ruta, "image/webp")
+        respuesta["ETag"] = f'"{sha256}-{tipo}"'
+        # La URL lleva ?v=<hash>: el contenido de esa URL no cambia
+        respuesta["Cache-Control"] = "private, max-age=31536000, immutable"
+        return respuesta
+    
+    # =========================================================================
+    # COLA DE REVISIÓN (varios administradores en paralelo)
+    # =========================================================================
+    
+    @action(detail=False, methods=['get'], url_path='pendientes')
+    def pendientes(self, request):
+        """
+        GET /api/documentos/pendientes/?pagina=1&por_pagina=50
+        
+        Documentos en estado Pendiente, del más antiguo al más nuevo, con
+        la reserva vigente de cada uno (si la hay).
+        
+        Permiso: Solo Administradores
+        
+        Response:
+            200: {
+                "total": 37, "pagina": 1, "por_pagina": 50,
+                "resultados": [{"id_documento": 8, "reservado_por": 3, ...}]
+            }
+        """
+        serializer = PendientesQuerySerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        pagina = serializer.validated_data["pagina"]
+        por_pagina = serializer.validated_data["por_pagina"]
+        
+        total, filas = revision_pendientes(
+            limite=por_pagina,
+            desplazamiento=(pagina - 1) * por_pagina,
+        )
+        
+        return Response(
+            {
+                "total": total,
+                "pagina": pagina,
+                "por_pagina": por_pagina,
+                "resultados": filas,
+            },
+            status=status.HTTP_200_OK
+        )
+    
+    @action(detail=False, methods=['post'], url_path='reclamar')
+    def reclamar(self, request):
+        """
+        POST /api/documentos/reclamar/
+        
+        Reserva un lote de los documentos pendientes más antiguos que nadie
+        más tiene reservados. La reserva vence sola.
+        
+        Permiso: Solo Administradores
+        
+        Request Body:
+            {"cantidad": 10, "minutos": 15}
+        
+        Response:
+            200: {"documentos": [8, 9, 12], "expira": "2026-10-19 13:05:00"}
+        """
+        serializer = ReclamarRevisionSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        
+        ids, expira = revision_reclamar(
+            request.user.id_usuario,
+            cantidad=serializer.validated_data["cantidad"],
+            minutos=serializer.validated_data["minutos"],
+        )
+        
+        return Response(
+            {"documentos": ids, "expira": expira},
+            status=status.HTTP_200_OK
+        )
+    
+    @action(detail=False, methods=['post'], url_path='liberar')
+    def liberar(self, request):
+        """
+        POST /api/documentos/liberar/
+        
+        Libera reservas propias para que otros admins las tomen.
+        
+        Request Body:
+            {"ids": [8, 9]}   (sin "ids": libera todas las propias)
+        
+        Response:
+            200: {"liberados": 2}
+        """
+        serializer = LiberarRevisionSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        
+        liberados = revision_liberar(
+            request.user.id_usuario,
+            serializer.validated_data.get("ids"),
+        )
+        return Response({"liberados": liberados}, status=status.HTTP_200_OK)
+    
+    @action(detail=False, methods=['post'], url_path='validar-lote')
+    def validar_lote(self, request):
+        """
+        POST /api/documentos/validar-lote/
+        
+        Aprueba o rechaza varios documentos (sp_documento_validate por cada
+        uno). Los reservados por otro admin se omiten; las reservas propias
+        de los validados se liberan.
+        
+        Permiso: Solo Administradores (con su propio ID)
+        
+        Request Body:
+            {
+                "id_usuario_admin": 3,
+                "decisiones": [
+                    {"id_documento": 8, "estado": "Aprobado", "observaciones": ""},
+                    {"id_documento": 9, "estado": "Rechazado", "observaciones": "Ilegible"}
+                ]
+            }
+        
+        Response:
+            200: {"validados": 1, "errores": 1, "resultados": [...]}
+        """
+        serializer = ValidarLoteSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        id_usuario_admin = serializer.validated_data["id_usuario_admin"]
+        
+        if id_usuario_admin != request.user.id_usuario:
+            return Response(
+                {
+                    "detail": "Solo puedes validar usando tu propio ID de administrador.",
+                    "hint": f"Tu ID de usuario administrador es {request.user.id_usuario}"
+                },
+                status=status.HTTP_403_FORBIDDEN
+            )
+        
+        resultados, medicos_afectados = revision_validar_lote(
+            id_usuario_admin,
+            serializer.validated_data["decisiones"],
+        )
+        
+        # El estado de los médicos pudo cambiar: refrescar el directorio público
+        from medicos.services import directorio_refrescar_por_medico
+        for id_medico in medicos_afectados:
+            directorio_refrescar_por_medico(id_medico)
+        
+        validados = sum(1 for r in resultados if r["ok"])
+        return Response(
+            {
+                "validados": validados,
+                "errores": len(resultados) - validados,
+                "resultados": resultados,
+            },
+            status=status.HTTP_200_OK
+        )
+    
     # =========================================================================
     # ENDPOINTS DE ESCRITURA
     # =========================================================================
@@ -176,15 +616,25 @@ class DocumentoViewSet(viewsets.ViewSet):
         - Médico debe estar activo
         - El tipo de documento debe existir
         
-        Request Body:
+        Request Body (JSON, solo nombre del archivo):
             {
                 "id_usuario_medico": 2,
                 "id_tipo_documento": 1,
                 "archivo": "documento.pdf"
             }
         
+        Request Body (multipart/form-data, con el archivo real):
+            id_usuario_medico=2
+            id_tipo_documento=1
+            archivo=<bytes del PDF/imagen>
+        
+        En multipart el archivo se guarda por bloques bajo su SHA-256
+        (documentos/<ab>/<sha256>.<ext>) y esa ruta es la que recibe
+        sp_documento_upload.
+        
         Response:
             201: Documento subido (estado: Pendiente)
+                 (multipart agrega "sha256", "tamano" y "duplicado")
             403: No es el médico correcto o está desactivado
             404: Usuario no es médico o tipo no existe
         """
@@ -194,7 +644,11 @@ class DocumentoViewSet(viewsets.ViewSet):
         logger.info(f"Datos recibidos en create: {request.data}")
         logger.info(f"Usuario autenticado: {request.user}")
         
-        serializer = DocumentoUploadSerializer(data=request.data)
+        multipart = "archivo" in request.FILES
+        if multipart:
+            serializer = DocumentoArchivoSerializer(data=request.data)
+        else:
+            serializer = DocumentoUploadSerializer(data=request.data)
         if not serializer.is_valid():
             return Response(
                 {
@@ -228,48 +682,303 @@ class DocumentoViewSet(viewsets.ViewSet):
                 status=status.HTTP_404_NOT_FOUND
             )
         
+        contenido = None
+        if multipart:
+            # Guardar bytes en disco (por bloques, direccionado por hash)
+            from .almacenamiento import guardar_archivo
+            try:
+                contenido = guardar_archivo(archivo)
+            except OSError as e:
+                logger.error(f"No se pudo guardar el archivo: {e}")
+                return Response(
+                    {"detail": "No se pudo guardar el archivo. Intenta nuevamente."},
+                    status=status.HTTP_500_INTERNAL_SERVER_ERROR
+                )
+            contenido["content_type"] = archivo.content_type
+            contenido["nombre_original"] = archivo.name
+            archivo = contenido["ruta"]
+        
         try:
             # Subir documento mediante stored procedure
             nuevo_id = sp_documento_upload(
                 id_usuario_medico=id_usuario_medico,
                 id_tipo_documento=id_tipo_documento,
                 archivo=archivo,
+                contenido=contenido,
             )
             
         except DatabaseError as e:
-            msg = str(e).lower()
-            
-            if "no está registrado como médico" in msg:
-                return Response(
-                    {"detail": "El usuario no está registrado como médico."},
-                    status=status.HTTP_404_NOT_FOUND
-                )
-            
-            if "está desactivado" in msg and "médico" in msg:
-                return Response(
-                    {
-                        "detail": "Tu cuenta de médico está desactivada.",
-                        "hint": "No puedes subir documentos hasta que sea reactivada."
-                    },
-                    status=status.HTTP_403_FORBIDDEN
-                )
-            
-            if "tipo de documento no existe" in msg:
-                return Response(
-                    {"detail": "El tipo de documento no existe."},
-                    status=status.HTTP_400_BAD_REQUEST
-                )
-            
+            return self._error_upload(e)
+        
+        respuesta = {
+            "id_documento": nuevo_id,
+            "detail": "Documento subido correctamente.",
+            "estado": "Pendiente",
+            "hint": "Un administrador revisará tu documento pronto."
+        }
+        if contenido:
+            respuesta.update(
+                archivo=contenido["ruta"],
+                sha256=contenido["sha256"],
+                tamano=contenido["tamano"],
+                duplicado=contenido["duplicado"],
+            )
+        
+        return Response(respuesta, status=status.HTTP_201_CREATED)
+    
+    def _error_upload(self, e):
+        """Traduce los errores de sp_documento_upload a respuestas HTTP."""
+        msg = str(e).lower()
+        
+        if "no está registrado como médico" in msg:
             return Response(
-                {"detail": str(e)},
+                {"detail": "El usuario no está registrado como médico."},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        
+        if "está desactivado" in msg and "médico" in msg:
+            return Response(
+                {
+                    "detail": "Tu cuenta de médico está desactivada.",
+                    "hint": "No puedes subir documentos hasta que sea reactivada."
+                },
+                status=status.HTTP_403_FORBIDDEN
+            )
+        
+        if "tipo de documento no existe" in msg:
+            return Response(
+                {"detail": "El tipo de documento no existe."},
                 status=status.HTTP_400_BAD_REQUEST
             )
         
+        return Response(
+            {"detail": str(e)},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    
+    # =========================================================================
+    # CARGAS REANUDABLES (conexiones inestables)
+    # =========================================================================
+    
+    def _obtener_carga(self, request, id_carga):
+        """
+        Devuelve (carga, None) o (None, Response de error).
+        
+        Un médico solo puede operar sus propias cargas.
+        """
+        from .models import CargaDocumento
+        
+        try:
+            carga = CargaDocumento.objects.get(id_carga=id_carga)
+        except CargaDocumento.DoesNotExist:
+            return None, Response(
+                {"detail": "La carga no existe."},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        
+        if carga.id_usuario_medico != request.user.id_usuario:
+            return None, Response(
+                {"detail": "Solo puedes operar tus propias cargas."},
+                status=status.HTTP_403_FORBIDDEN
+            )
+        
+        return carga, None
+    
+    def _conflicto(self, e):
         return Response(
             {
-                "id_documento": nuevo_id,
+                "detail": str(e),
+                "hint": "Continúa enviando desde 'recibido'.",
+                **carga_a_dict(e.carga)
+            },
+            status=status.HTTP_409_CONFLICT,
+            headers={"Upload-Offset": str(e.carga.recibido)}
+        )
+    
+    def iniciar_carga(self, request):
+        """
+        POST /api/documentos/cargas/
+        
+        Inicia una carga reanudable. El servidor preasigna el archivo y
+        devuelve el id de la carga.
+        
+        Permiso: Solo Médicos (para sí mismos)
+        
+        Request Body:
+            {
+                "id_usuario_medico": 2,
+                "id_tipo_documento": 1,
+                "nombre": "diploma.pdf",
+                "tamano": 10485760,
+                "content_type": "application/pdf"
+            }
+        
+        Response:
+            201: {"id_carga": "...", "tamano": 10485760, "recibido": 0, ...}
+            400: Datos inválidos
+            403: No es el médico correcto
+        """
+        serializer = CargaInicioSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+        
+        if data["id_usuario_medico"] != request.user.id_usuario:
+            return Response(
+                {
+                    "detail": "Solo puedes subir documentos para ti mismo.",
+                    "hint": f"Tu ID de usuario médico es {request.user.id_usuario}"
+                },
+                status=status.HTTP_403_FORBIDDEN
+            )
+        
+        carga = carga_iniciar(
+            id_usuario_medico=data["id_usuario_medico"],
+            id_tipo_documento=data["id_tipo_documento"],
+            nombre=data["nombre"],
+            tamano=data["tamano"],
+            content_type=data.get("content_type", ""),
+        )
+        
+        return Response(carga_a_dict(carga), status=status.HTTP_201_CREATED)
+    
+    def estado_carga(self, request, id_carga=None):
+        """
+        GET /api/documentos/cargas/:id_carga/
+        
+        Progreso de la carga. Tras una desconexión el cliente consulta aquí
+        'recibido' y continúa desde ese offset.
+        
+        Response:
+            200: {"id_carga", "tamano", "recibido", "estado", "id_documento", ...}
+            404: La carga no existe
+        """
+        carga, error = self._obtener_carga(request, id_carga)
+        if error:
+            return error
+        
+        return Response(
+            carga_a_dict(carga),
+            status=status.HTTP_200_OK,
+            headers={"Upload-Offset": str(carga.recibido)}
+        )
+    
+    def subir_bloque(self, request, id_carga=None):
+        """
+        PUT /api/documentos/cargas/:id_carga/
+        
+        Envía un bloque del archivo como cuerpo binario.
+        
+        Headers:
+            Content-Type: application/octet-stream
+            Upload-Offset: 1048576   (o ?offset=1048576)
+        
+        El offset debe ser igual a 'recibido'. Si la conexión se corta a
+        mitad del bloque, lo que alcanzó a llegar se conserva.
+        
+        Response:
+            200: Bloque recibido (incluye el nuevo 'recibido')
+            400: Falta offset/cuerpo o el bloque excede el tamaño declarado
+            409: Offset distinto al esperado (la respuesta trae 'recibido')
+            413: Bloque más grande que el máximo permitido
+        """
+        from .almacenamiento import BLOQUE_MAXIMO
+        
+        carga, error = self._obtener_carga(request, id_carga)
+        if error:
+            return error
+        
+        offset = request.headers.get("Upload-Offset", request.query_params.get("offset"))
+        try:
+            offset = int(offset)
+            cantidad = int(request.META.get("CONTENT_LENGTH") or 0)
+        except (TypeError, ValueError):
+            return Response(
+                {"detail": "Se requiere el header 'Upload-Offset' y Content-Length."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        if cantidad <= 0:
+            return Response(
+                {"detail": "El bloque está vacío."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        if cantidad > BLOQUE_MAXIMO:
+            return Response(
+                {"detail": f"El bloque supera el máximo de {BLOQUE_MAXIMO} bytes."},
+                status=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+            )
+        
+        if offset < 0 or offset + cantidad > carga.tamano:
+            return Response(
+                {"detail": "El bloque excede el tamaño declarado del archivo."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        try:
+            carga = carga_escribir(carga, offset, request.stream, cantidad)
+        except CargaConflicto as e:
+            return self._conflicto(e)
+        
+        return Response(
+            carga_a_dict(carga),
+            status=status.HTTP_200_OK,
+            headers={"Upload-Offset": str(carga.recibido)}
+        )
+    
+    def cancelar_carga(self, request, id_carga=None):
+        """
+        DELETE /api/documentos/cargas/:id_carga/
+        
+        Cancela una carga en curso y borra su archivo temporal.
+        
+        Response:
+            204: Carga cancelada
+            409: La carga ya fue finalizada
+        """
+        carga, error = self._obtener_carga(request, id_carga)
+        if error:
+            return error
+        
+        if carga.estado != carga.EN_CURSO:
+            return Response(
+                {"detail": "La carga ya fue finalizada."},
+                status=status.HTTP_409_CONFLICT
+            )
+        
+        carga_cancelar(carga)
+        return Response(status=status.HTTP_204_NO_CONTENT)
+    
+    def finalizar_carga(self, request, id_carga=None):
+        """
+        POST /api/documentos/cargas/:id_carga/finalizar/
+        
+        Cierra la carga: verifica que llegaron todos los bytes, publica el
+        archivo bajo su SHA-256 y crea el documento con sp_documento_upload.
+        
+        Es idempotente: si la respuesta se pierde y el cliente reintenta,
+        recibe el mismo id_documento (el SP se ejecuta una sola vez).
+        
+        Response:
+            201: Documento creado (estado: Pendiente)
+            409: Faltan bytes por recibir
+        """
+        carga, error = self._obtener_carga(request, id_carga)
+        if error:
+            return error
+        
+        try:
+            carga = carga_finalizar(carga.id_carga)
+        except CargaConflicto as e:
+            return self._conflicto(e)
+        except DatabaseError as e:
+            return self._error_upload(e)
+        
+        return Response(
+            {
+                **carga_a_dict(carga),
+                "archivo": carga.ruta,
                 "detail": "Documento subido correctamente.",
-                "estado": "Pendiente",
                 "hint": "Un administrador revisará tu documento pronto."
             },
             status=status.HTTP_201_CREATED
@@ -298,6 +1007,7 @@ class DocumentoViewSet(viewsets.ViewSet):
             200: Documento validado
             403: No es administrador
             404: Documento no encontrado
+            409: Reservado por otro administrador (cola de revisión)
         """
         serializer = DocumentoValidacionSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
@@ -326,6 +1036,18 @@ class DocumentoViewSet(viewsets.ViewSet):
                 status=status.HTTP_404_NOT_FOUND
             )
         
+        # Cola de revisión: no validar lo que otro admin tiene reservado
+        reserva = revision_reserva_ajena(int(pk), id_usuario_admin)
+        if reserva:
+            return Response(
+                {
+                    "detail": "Otro administrador está revisando este documento.",
+                    "reservado_por": reserva.id_usuario_admin,
+                    "reserva_expira": reserva.expira,
+                },
+                status=status.HTTP_409_CONFLICT
+            )
+        
         try:
             # Validar documento mediante stored procedure
             resultado = sp_documento_validate(
@@ -361,6 +1083,17 @@ class DocumentoViewSet(viewsets.ViewSet):
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
         
+        # El estado del médico pudo cambiar: refrescar el directorio público
+        from documentos.models import Documento
+        from medicos.services import directorio_refrescar_por_medico
+        id_medico = (
+            Documento.objects.filter(id_documento=int(pk))
+            .values_list("id_medico", flat=True)
+            .first()
+        )
+        if id_medico is not None:
+            directorio_refrescar_por_medico(id_medico)
+        
         return Response(
             {
                 **resultado,
@@ -398,4 +1131,58 @@ class DocumentoViewSet(viewsets.ViewSet):
 #    - sp_documento_validate: Cambia estado y registra quien validó
 #    - sp_documento_list_by_usuario: Lista docs de un médico
 #
+# 6. RESUMEN DE VALIDACIÓN:
+#    - Los wrappers de upload/validate ajustan documento_resumen_medico
+#    - resumen-medicos lee esos contadores (no vuelve a contar documentos)
+#    - Pre-lectura, SP y ajuste van en una transacción con la fila bloqueada
+#      (documento al validar, medico al subir): sin deltas dobles
+#    - Si algo se desincroniza: python manage.py recalcular_resumen_validacion
+#
+# 7. ARCHIVOS (subida multipart):
+#    - FILE_UPLOAD_HANDLERS usa almacenamiento.SubidaConHash: Django
+#      escribe la subida a disco (FILE_UPLOAD_TEMP_DIR) calculando SHA-256,
+#      nunca la mantiene completa en memoria
+#    - almacenamiento.guardar_archivo mueve ese temporal con os.replace a
+#      MEDIA_ROOT/documentos/<ab>/<sha256>.<ext> (una sola escritura)
+#    - Contenido idéntico se guarda una sola vez; documento_contenido guarda
+#      hash, tamaño y nombre original por documento
+#    - Si el SP falla después de guardar, el archivo queda sin referencia
+#      (inofensivo: una re-subida del mismo contenido lo reutiliza)
+#    - JSON con "archivo" como texto sigue funcionando (compatibilidad)
+#
+# 8. CARGAS REANUDABLES (cargas/):
+#    - iniciar → PUT bloques con Upload-Offset → finalizar
+#    - El archivo temporal se preasigna disperso y cada bloque se escribe en
+#      su offset; al finalizar se hashea y se publica con os.replace
+#    - Tras una desconexión: GET cargas/:id/ y continuar desde 'recibido'
+#    - finalizar bloquea la fila y llama sp_documento_upload una sola vez
+#    - Cargas abandonadas: python manage.py limpiar_cargas_documentos
+#
+# 9. DESCARGA (:id/descargar/):
+#    - Mismo ownership que list (médico sus docs, admin todos)
+#    - Completo: FileResponse bajo WSGI (wsgi.file_wrapper/sendfile). Range
+#      de un solo tramo → 206 por bloques
+#    - Bajo ASGI (uvicorn) siempre un iterador asíncrono por bloques: uno
+#      síncrono (FileResponse incluido) se leería completo en memoria
+#      antes de enviar el primer byte
+#    - ETag = sha256 del contenido; If-None-Match → 304
+#    - Producción con nginx: DOCUMENTOS_X_ACCEL_REDIRECT delega el envío
+#
+# 10. VISTAS PREVIAS:
+#    - Al subir (tras el commit) se encola la generación en un
+#      ProcessPoolExecutor (vistas_previas.py); la subida no espera
+#    - WebP "vista" (1024 px) y "miniatura" (200 px) por sha256
+#    - El listado trae "vista_previa" con las URLs (None si no hay)
+#    - PDF no tiene vista previa (Pillow no rasteriza PDF)
+#    - Documentos anteriores: python manage.py generar_vistas_previas
+#
+# 11. COLA DE REVISIÓN (varios admins):
+#    - reclamar usa SELECT ... FOR UPDATE SKIP LOCKED sobre documento: cada
+#      admin recibe un lote distinto sin esperar a los demás
+#    - Las reservas (documento_reserva) vencen solas; una vencida se
+#      reasigna al siguiente que reclame
+#    - validate responde 409 si el documento está reservado por otro admin
+#    - validar-lote llama sp_documento_validate por documento y libera las
+#      reservas propias de los validados
+#
 # =============================================================================
\ No newline at end of file
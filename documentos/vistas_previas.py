@@ -0,0 +1,159 @@
+"""
+Vistas previas de documentos - Salud Rural
+
+Al subir un documento con archivo real se generan, en segundo plano:
+- "vista": primera página a 1024 px de lado mayor (para revisar sin abrir
+  el archivo completo)
+- "miniatura": 200 px, muy comprimida, para listados
+
+El trabajo corre en un ProcessPoolExecutor: la petición de subida solo
+encola la tarea (después del commit) y responde; Pillow trabaja en otro
+proceso sin competir con el GIL de los workers web.
+
+- Nombres por contenido: documentos/vistas/<sha256>-<tipo>.webp. Documentos
+  con el mismo archivo comparten vista previa y nunca se regenera.
+- Imágenes (PNG, JPEG, WebP) y TIFF (primera página/frame).
+- PDF: Pillow no puede rasterizarlo; esos documentos no tienen vista previa
+  (vista_previa = None en el listado).
+"""
+
+import logging
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from django.conf import settings
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+
+logger = logging.getLogger(__name__)
+
+CARPETA = "documentos/vistas"
+
+# tipo → (lado mayor en px, calidad WebP)
+TIPOS = {
+    "vista": (1024, 80),
+    "miniatura": (200, 60),
+}
+
+EXTENSIONES_SOPORTADAS = {".png", ".jpg", ".jpeg", ".webp", ".tif", ".tiff"}
+
+PROCESOS = getattr(settings, "DOCUMENTOS_VISTA_PREVIA_PROCESOS", 2)
+
+
+def carpeta_vistas():
+    return Path(settings.MEDIA_ROOT) / CARPETA
+
+
+def nombre_vista(sha256, tipo):
+    return f"{sha256}-{tipo}.webp"
+
+
+def ruta_vista(sha256, tipo):
+    return carpeta_vistas() / nombre_vista(sha256, tipo)
+
+
+def soportado(ruta):
+    return os.path.splitext(str(ruta))[1].lower() in EXTENSIONES_SOPORTADAS
+
+
+# =============================================================================
+# TRABAJO EN EL PROCESO HIJO (sin Django: solo rutas y Pillow)
+# =============================================================================
+
+def generar_vistas(origen, sha256, carpeta):
+    """
+    Genera las vistas previas que falten para un archivo.
+
+    Se ejecuta dentro del pool de procesos; recibe rutas absolutas como
+    texto para no depender de settings en el hijo.
+
+    Returns:
+        list: Tipos generados en esta llamada
+    """
+    carpeta = Path(carpeta)
+    carpeta.mkdir(parents=True, exist_ok=True)
+    pendientes = [
+        tipo for tipo in TIPOS
+        if not (carpeta / nombre_vista(sha256, tipo)).exists()
+    ]
+    if not pendientes:
+        return []
+
+    with Image.open(origen) as imagen:
+        # TIFF multipágina: la primera página es el frame 0
+        imagen.seek(0)
+        imagen = ImageOps.exif_transpose(imagen).convert("RGB")
+        for tipo in pendientes:
+            lado, calidad = TIPOS[tipo]
+            reducida = imagen.copy()
+            reducida.thumbnail((lado, lado), Image.Resampling.LANCZOS)
+            final = carpeta / nombre_vista(sha256, tipo)
+            temporal = final.with_name(final.name + ".tmp")
+            reducida.save(temporal, "WEBP", quality=calidad, method=4)
+            os.replace(temporal, final)
+    return pendientes
+
+
+# =============================================================================
+# POOL COMPARTIDO POR PROCESO WEB
+# =============================================================================
+
+_lock = threading.Lock()
+_pool = None
+
+
+def _obtener_pool():
+    global _pool
+    with _lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=PROCESOS)
+        return _pool
+
+
+def _registrar_resultado(sha256):
+    def callback(futuro):
+        error = futuro.exception()
+        if isinstance(error, (UnidentifiedImageError, OSError)):
+            logger.warning("No se pudo generar la vista previa de %s: %s", sha256, error)
+        elif error is not None:
+            logger.error("Error generando la vista previa de %s", sha256, exc_info=error)
+    return callback
+
+
+def encolar(ruta_relativa, sha256):
+    """
+    Encola la generación de vistas previas sin bloquear la petición.
+
+    Args:
+        ruta_relativa: Ruta del archivo dentro de MEDIA_ROOT
+        sha256: Hash del contenido (nombre de las vistas)
+
+    Returns:
+        Future | None: None si el formato no tiene vista previa
+    """
+    if not soportado(ruta_relativa):
+        return None
+    origen = Path(settings.MEDIA_ROOT) / ruta_relativa
+    futuro = _obtener_pool().submit(
+        generar_vistas, str(origen), sha256, str(carpeta_vistas())
+    )
+    futuro.add_done_callback(_registrar_resultado(sha256))
+    return futuro
+
+
+def urls_vista_previa(id_documento, sha256, request=None):
+    """
+    URLs de las vistas previas ya generadas de un documento, o None.
+
+    Llevan ?v=<hash> para que el navegador pueda cachearlas sin revalidar.
+    """
+    if not sha256 or not ruta_vista(sha256, "miniatura").exists():
+        return None
+
+    def url(tipo):
+        ruta = f"/api/documentos/{id_documento}/vista-previa/?tipo={tipo}&v={sha256[:16]}"
+        return request.build_absolute_uri(ruta) if request is not None else ruta
+
+    return {tipo: url(tipo) for tipo in TIPOS}
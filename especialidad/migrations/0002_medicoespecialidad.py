@@ -0,0 +1,25 @@
+# Generated by Django 5.2.7 on 2026-10-19 11:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('especialidad', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MedicoEspecialidad',
+            fields=[
+                ('pk', models.CompositePrimaryKey('id_medico', 'id_especialidad', blank=True, editable=False, primary_key=True, serialize=False)),
+                ('id_medico', models.IntegerField(db_column='ID_Medico')),
+                ('id_especialidad', models.IntegerField(db_column='ID_Especialidad')),
+            ],
+            options={
+                'db_table': 'Medico_Especialidad',
+                'managed': False,
+            },
+        ),
+    ]
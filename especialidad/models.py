@@ -8,3 +8,19 @@ class Especialidad(models.Model):
     class Meta:
         managed = False
         db_table = 'Especialidad'
+
+
+class MedicoEspecialidad(models.Model):
+    """
+    Asignación médico ↔ especialidad (tabla de SP sp_medico_especialidad_*).
+
+    Se mapea para la asignación masiva, que calcula las diferencias en
+    memoria y escribe en bloque dentro de una transacción.
+    """
+    pk = models.CompositePrimaryKey('id_medico', 'id_especialidad')
+    id_medico = models.IntegerField(db_column='ID_Medico')
+    id_especialidad = models.IntegerField(db_column='ID_Especialidad')
+
+    class Meta:
+        managed = False
+        db_table = 'Medico_Especialidad'
@@ -7,3 +7,15 @@ class EspecialidadCreateSerializer(serializers.Serializer):
 class AsignarEspecialidadSerializer(serializers.Serializer):
     id_usuario_medico = serializers.IntegerField()
     id_especialidad = serializers.IntegerField()
+
+class AsignacionLoteItemSerializer(serializers.Serializer):
+    id_usuario_medico = serializers.IntegerField()
+    especialidades = serializers.ListField(
+        child=serializers.IntegerField(), allow_empty=True
+    )
+
+class AsignarEspecialidadesLoteSerializer(serializers.Serializer):
+    asignaciones = serializers.ListField(
+        child=AsignacionLoteItemSerializer(), allow_empty=False, max_length=1000
+    )
+    reemplazar = serializers.BooleanField(default=True)
@@ -1,4 +1,9 @@
-from django.db import connection, DatabaseError
+from django.db import connection, transaction, DatabaseError
+
+from medicos.models import Medico
+
+from .models import Especialidad, MedicoEspecialidad
+
 
 def sp_especialidad_create(nombre, descripcion):
     with connection.cursor() as cursor:
@@ -41,3 +46,104 @@ def sp_medico_especialidad_list(id_usuario_medico):
                 "descripcion": r[2]
             } for r in rows
         ]
+
+
+def asignar_especialidades_lote(asignaciones, reemplazar=True):
+    """
+    Aplica una matriz médico → especialidades en una sola transacción.
+
+    Lee las asignaciones actuales de todos los médicos del lote con una
+    consulta, calcula en memoria qué insertar y qué borrar, y escribe todo
+    con un bulk_create y un DELETE.
+
+    La lectura y la escritura van en la misma transacción, con las filas
+    de los médicos y sus asignaciones bloqueadas (select_for_update): una
+    asignación simultánea (p. ej. sp_medico_especialidad_asignar) espera a
+    que termine el lote en lugar de hacerlo fallar. ignore_conflicts queda
+    como red de seguridad.
+
+    IMPORTANTE: escribe directo en Medico_Especialidad, sin pasar por
+    sp_medico_especialidad_asignar/quitar: las validaciones propias de esos
+    SPs (más allá de que existan médico y especialidad) NO se aplican.
+
+    Args:
+        asignaciones: [{"id_usuario_medico": 2, "especialidades": [1, 3]}, ...]
+        reemplazar: Si es True, las especialidades que el médico tiene y no
+                    están en la lista se eliminan; si es False solo se agregan.
+
+    Returns:
+        list: Un resultado por elemento del lote, en el mismo orden:
+              {"id_usuario_medico", "estado": "ok"|"error", "agregadas",
+               "eliminadas", "detail"}
+    """
+    with transaction.atomic():
+        ids_usuario = {a["id_usuario_medico"] for a in asignaciones}
+        medicos = dict(
+            Medico.objects.select_for_update()
+            .filter(id_usuario__in=ids_usuario)
+            .order_by("id_medico")
+            .values_list("id_usuario", "id_medico")
+        )
+        ids_especialidad = {e for a in asignaciones for e in a["especialidades"]}
+        existentes = set(
+            Especialidad.objects.filter(id_especialidad__in=ids_especialidad)
+            .values_list("id_especialidad", flat=True)
+        )
+
+        actuales = {}
+        for id_medico, id_especialidad in MedicoEspecialidad.objects.select_for_update().filter(
+            id_medico__in=medicos.values()
+        ).values_list("id_medico", "id_especialidad"):
+            actuales.setdefault(id_medico, set()).add(id_especialidad)
+
+        resultados = []
+        insertar = []
+        borrar = []
+        vistos = set()
+
+        for item in asignaciones:
+            id_usuario = item["id_usuario_medico"]
+            deseadas = set(item["especialidades"])
+            resultado = {
+                "id_usuario_medico": id_usuario,
+                "estado": "ok",
+                "agregadas": [],
+                "eliminadas": [],
+            }
+            resultados.append(resultado)
+
+            if id_usuario in vistos:
+                resultado.update(estado="error", detail="Médico repetido en el lote.")
+                continue
+            vistos.add(id_usuario)
+
+            if id_usuario not in medicos:
+                resultado.update(estado="error", detail="El médico no existe.")
+                continue
+
+            faltantes = sorted(deseadas - existentes)
+            if faltantes:
+                resultado.update(
+                    estado="error",
+                    detail=f"Especialidades inexistentes: {faltantes}.",
+                )
+                continue
+
+            id_medico = medicos[id_usuario]
+            tiene = actuales.get(id_medico, set())
+            agregadas = sorted(deseadas - tiene)
+            eliminadas = sorted(tiene - deseadas) if reemplazar else []
+
+            insertar.extend(
+                MedicoEspecialidad(id_medico=id_medico, id_especialidad=e)
+                for e in agregadas
+            )
+            borrar.extend((id_medico, e) for e in eliminadas)
+            resultado.update(agregadas=agregadas, eliminadas=eliminadas)
+
+        if borrar:
+            MedicoEspecialidad.objects.filter(pk__in=borrar).delete()
+        if insertar:
+            MedicoEspecialidad.objects.bulk_create(insertar, ignore_conflicts=True)
+
+    return resultados
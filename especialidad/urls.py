@@ -10,6 +10,10 @@ urlpatterns = router.urls + [
         'especialidades/asignar/',
         EspecialidadViewSet.as_view({'post': 'asignar'})
     ),
+    path(
+        'especialidades/asignar-lote/',
+        EspecialidadViewSet.as_view({'post': 'asignar_lote'})
+    ),
     path(
         'especialidades/medico/<int:pk>/',
         EspecialidadViewSet.as_view({'get': 'listar_por_medico'})
@@ -8,6 +8,7 @@ Lógica de permisos:
 - Listar especialidades: Público (pacientes buscan por especialidad)
 - Crear especialidad: Solo Admin
 - Asignar especialidad: Solo Admin
+- Asignación masiva: Solo Admin
 - Listar especialidades de médico: Público
 """
 
@@ -21,13 +22,15 @@ from backend.permissions import IsAdministrador
 
 from .serializers import (
     EspecialidadCreateSerializer,
-    AsignarEspecialidadSerializer
+    AsignarEspecialidadSerializer,
+    AsignarEspecialidadesLoteSerializer
 )
 from .services import (
     sp_especialidad_create,
     sp_especialidad_list,
     sp_medico_especialidad_asignar,
-    sp_medico_especialidad_list
+    sp_medico_especialidad_list,
+    asignar_especialidades_lote
 )
 
 
@@ -39,10 +42,11 @@ class EspecialidadViewSet(viewsets.ViewSet):
     - POST /api/especialidades/                        → Crear especialidad (admin)
     - GET  /api/especialidades/                        → Listar todas (público)
     - POST /api/especialidades/asignar/                → Asignar a médico (admin)
+    - POST /api/especialidades/asignar-lote/           → Asignación masiva (admin)
     - GET  /api/especialidades/medico/:id_usuario/     → Listar de médico (público)
     
     Permisos:
-    - create/asignar: Solo Administradores
+    - create/asignar/asignar_lote: Solo Administradores
     - list/listar_por_medico: Público (pacientes buscan especialidades)
     """
     
@@ -50,10 +54,10 @@ class EspecialidadViewSet(viewsets.ViewSet):
         """
         Define permisos según la acción.
         
-        - create, asignar: Solo Admin
+        - create, asignar, asignar_lote: Solo Admin
         - list, listar_por_medico: Público
         """
-        if self.action in ['create', 'asignar']:
+        if self.action in ['create', 'asignar', 'asignar_lote']:
             return [IsAdministrador()]
         return [AllowAny()]
     
@@ -225,6 +229,10 @@ class EspecialidadViewSet(viewsets.ViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
+        # Mantener el directorio público al día
+        from medicos.services import directorio_refrescar
+        directorio_refrescar(data["id_usuario_medico"])
+        
         return Response(
             {
                 "detail": "Especialidad asignada correctamente.",
@@ -233,6 +241,76 @@ class EspecialidadViewSet(viewsets.ViewSet):
             status=status.HTTP_200_OK
         )
 
+    
+    @action(detail=False, methods=['post'], url_path='asignar-lote')
+    def asignar_lote(self, request):
+        """
+        POST /api/especialidades/asignar-lote/
+        
+        Asigna especialidades a muchos médicos en una sola operación.
+        
+        Permiso: Solo Administradores
+        
+        Request Body:
+            {
+                "asignaciones": [
+                    {"id_usuario_medico": 2, "especialidades": [1, 3]},
+                    {"id_usuario_medico": 5, "especialidades": []}
+                ],
+                "reemplazar": true
+            }
+        
+        Con "reemplazar": true (por defecto) la lista es el conjunto final
+        de especialidades del médico; con false solo se agregan.
+        
+        Response:
+            200: Resultado por médico, en el mismo orden del lote
+            {
+                "total": 2,
+                "errores": 0,
+                "resultados": [
+                    {
+                        "id_usuario_medico": 2,
+                        "estado": "ok",
+                        "agregadas": [3],
+                        "eliminadas": []
+                    }
+                ]
+            }
+            400: Datos inválidos
+            403: No es administrador
+        """
+        serializer = AsignarEspecialidadesLoteSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+        
+        try:
+            resultados = asignar_especialidades_lote(
+                data["asignaciones"],
+                reemplazar=data["reemplazar"]
+            )
+            
+        except DatabaseError as e:
+            return Response(
+                {"detail": str(e)},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        # Mantener el directorio público al día (solo médicos con cambios)
+        from medicos.services import directorio_refrescar
+        for r in resultados:
+            if r["agregadas"] or r["eliminadas"]:
+                directorio_refrescar(r["id_usuario_medico"])
+        
+        return Response(
+            {
+                "total": len(resultados),
+                "errores": sum(1 for r in resultados if r["estado"] == "error"),
+                "resultados": resultados
+            },
+            status=status.HTTP_200_OK
+        )
+
 
 # =============================================================================
 # NOTAS PARA EL DESARROLLADOR
@@ -243,6 +321,7 @@ class EspecialidadViewSet(viewsets.ViewSet):
 #    - listar_por_medico: AllowAny (público)
 #    - create: IsAdministrador
 #    - asignar: IsAdministrador
+#    - asignar_lote: IsAdministrador
 #
 # 2. USO TÍPICO:
 #    - Paciente busca médicos por especialidad
@@ -254,4 +333,12 @@ class EspecialidadViewSet(viewsets.ViewSet):
 #    b) Admin asigna a médico (POST /especialidades/asignar/)
 #    c) Paciente busca médicos con esa especialidad
 #
+# 4. ASIGNACIÓN MASIVA (asignar-lote):
+#    - Lee las asignaciones actuales de todo el lote en una consulta y
+#      escribe las diferencias con un bulk_create y un DELETE, en una sola
+#      transacción (no llama al SP una vez por par médico-especialidad)
+#    - Errores por médico (no existe, especialidad inexistente, repetido)
+#      se informan en el resultado y no abortan el resto del lote
+#    - El directorio público se refresca solo para los médicos que cambiaron
+#
 # =============================================================================
\ No newline at end of file
@@ -24,9 +24,28 @@ const DoctorCard = ({ doctor, onViewProfile, onBook }) => {
         )}
       </div>
       <div className="flex items-center space-x-4 mb-5">
-        <div className="w-14 h-14 rounded-2xl bg-primary-100 flex items-center justify-center text-primary-700 font-bold text-lg">
-          {normalized.iniciales}
-        </div>
+        {normalized.miniaturas ? (
+          // 64px para pantallas normales, 128px para pantallas de alta densidad
+          <picture>
+            <source
+              type="image/webp"
+              srcSet={`${normalized.miniaturas['64'].webp} 1x, ${normalized.miniaturas['128'].webp} 2x`}
+            />
+            <img
+              src={normalized.miniaturas['64'].jpeg}
+              srcSet={`${normalized.miniaturas['64'].jpeg} 1x, ${normalized.miniaturas['128'].jpeg} 2x`}
+              alt={nombre}
+              width={56}
+              height={56}
+              loading="lazy"
+              className="w-14 h-14 rounded-2xl object-cover"
+            />
+          </picture>
+        ) : (
+          <div className="w-14 h-14 rounded-2xl bg-primary-100 flex items-center justify-center text-primary-700 font-bold text-lg">
+            {normalized.iniciales}
+          </div>
+        )}
         <div>
           <p className="text-lg font-bold text-dark-700">{nombre}</p>
           <p className="text-sm text-dark-400 flex items-center">
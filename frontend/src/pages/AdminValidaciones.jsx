@@ -4,11 +4,35 @@ import { useAuth } from '../contexts/AuthContext';
 import {
   especialidadService,
   tipoDocumentoService,
-  medicoService,
   documentoService,
 } from '../services/api';
 import { normalizeDoctor } from '../utils/doctor';
-import { CheckCircle, XCircle, Plus } from 'lucide-react';
+import { CheckCircle, XCircle, Plus, FileText } from 'lucide-react';
+
+// Miniatura del documento (la URL requiere el token, se pide como blob)
+const VistaPreviaDocumento = ({ url }) => {
+  const [src, setSrc] = useState(null);
+
+  useEffect(() => {
+    let objectUrl = null;
+    let activo = true;
+    documentoService
+      .vistaPrevia(url)
+      .then((blob) => {
+        if (!activo) return;
+        objectUrl = URL.createObjectURL(blob);
+        setSrc(objectUrl);
+      })
+      .catch(() => setSrc(null));
+    return () => {
+      activo = false;
+      if (objectUrl) URL.revokeObjectURL(objectUrl);
+    };
+  }, [url]);
+
+  if (!src) return null;
+  return <img src={src} alt="Vista previa" className="w-16 h-16 object-cover rounded border border-gray-200" />;
+};
 
 const AdminValidaciones = () => {
   const { user } = useAuth();
@@ -37,11 +61,19 @@ const AdminValidaciones = () => {
       const [esp, tipos, medics] = await Promise.all([
         especialidadService.list().catch(() => []),
         tipoDocumentoService.list().catch(() => []),
-        medicoService.getAll().catch(() => []),
+        documentoService.resumenMedicos({ por_pagina: 200 }).catch(() => ({ resultados: [] })),
       ]);
       setEspecialidades(Array.isArray(esp) ? esp : []);
       setTipoDocumentos(Array.isArray(tipos) ? tipos : []);
-      setMedicos(Array.isArray(medics) ? medics.map(normalizeDoctor) : []);
+      const resumen = Array.isArray(medics?.resultados) ? medics.resultados : [];
+      setMedicos(
+        resumen.map((fila) => ({
+          ...normalizeDoctor(fila),
+          totalPendientes: fila.total_pendientes,
+          totalAprobados: fila.total_aprobados,
+          totalTipos: fila.total_tipos_documento,
+        }))
+      );
     } catch (error) {
       console.error('Error cargando datos de validación', error);
     }
@@ -116,7 +148,7 @@ const AdminValidaciones = () => {
       }
       
       setObservacion('');
-      await loadDocumentos(selectedMedico);
+      await Promise.all([loadDocumentos(selectedMedico), loadData()]);
     } catch (error) {
       console.error('Error validando documento', error);
       setMessage(error.response?.data?.detail || 'Error al validar el documento.');
@@ -125,6 +157,18 @@ const AdminValidaciones = () => {
     }
   };
 
+  const handleVerDocumento = async (doc) => {
+    try {
+      const blob = await documentoService.descargar(doc.id_documento);
+      const url = URL.createObjectURL(blob);
+      window.open(url, '_blank', 'noopener');
+      setTimeout(() => URL.revokeObjectURL(url), 60000);
+    } catch (error) {
+      console.error('Error descargando documento', error);
+      setMessage('No se pudo abrir el archivo del documento.');
+    }
+  };
+
   if (!isAdmin) {
     return <Navigate to="/app/dashboard" replace />;
   }
@@ -238,6 +282,7 @@ const AdminValidaciones = () => {
               <tr className="text-left text-dark-400 border-b">
                 <th className="py-2">Nombre</th>
                 <th>Estado</th>
+                <th>Documentos</th>
                 <th>Acciones</th>
               </tr>
             </thead>
@@ -265,6 +310,10 @@ const AdminValidaciones = () => {
                         {estado}
                       </span>
                     </td>
+                    <td className="text-xs text-dark-500">
+                      {medico.totalAprobados}/{medico.totalTipos} aprobados
+                      {medico.totalPendientes > 0 && ` · ${medico.totalPendientes} pendientes`}
+                    </td>
                     <td>
                       <button
                         className="btn btn-secondary text-xs"
@@ -344,6 +393,9 @@ const AdminValidaciones = () => {
                 return (
                   <div key={doc.id_documento} className="border border-gray-200 rounded-lg p-4 hover:shadow-md transition-shadow">
                     <div className="flex flex-col md:flex-row md:items-center md:justify-between gap-4">
+                      {doc.vista_previa?.miniatura && (
+                        <VistaPreviaDocumento url={doc.vista_previa.miniatura} />
+                      )}
                       <div className="flex-1">
                         <div className="flex items-center gap-2 mb-2">
                           <p className="font-semibold text-dark-700">{doc.tipo_documento || 'Documento'}</p>
@@ -364,6 +416,15 @@ const AdminValidaciones = () => {
                         )}
                       </div>
                       <div className="flex items-center gap-2">
+                        {doc.archivo?.startsWith('documentos/') && (
+                          <button
+                            className="btn btn-secondary text-xs flex items-center gap-1"
+                            onClick={() => handleVerDocumento(doc)}
+                          >
+                            <FileText className="w-4 h-4" />
+                            Ver
+                          </button>
+                        )}
                         {doc.estado === 'Pendiente' ? (
                           <>
                             <button
@@ -273,9 +273,24 @@ const Citas = () => {
   };
 
   const handleVerVideollamada = async (id) => {
+    // Token de ingreso guardado: se valida solo con la firma, sin consultar la cita
+    const tokenGuardado = localStorage.getItem(`videollamada:${id}`);
+    if (tokenGuardado) {
+      try {
+        const { enlace } = await videollamadaService.unirse(tokenGuardado);
+        window.open(enlace, '_blank', 'noopener');
+        return;
+      } catch {
+        localStorage.removeItem(`videollamada:${id}`);
+      }
+    }
+
     try {
       const data = await videollamadaService.getByCita(id);
       const enlace = data?.enlace || data?.Enlace;
+      if (data?.token) {
+        localStorage.setItem(`videollamada:${id}`, data.token);
+      }
       if (enlace) {
         window.open(enlace, '_blank', 'noopener');
       } else {
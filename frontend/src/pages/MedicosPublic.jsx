@@ -1,9 +1,9 @@
-import React, { useEffect, useMemo, useState } from 'react';
+import React, { useEffect, useState } from 'react';
 import { Search, Filter } from 'lucide-react';
 import DoctorCard from '../components/DoctorCard';
 import DoctorProfileModal from '../components/DoctorProfileModal';
 import BookAppointmentModal from '../components/BookAppointmentModal';
-import { medicoService, especialidadService } from '../services/api';
+import { medicoService } from '../services/api';
 import { normalizeDoctor } from '../utils/doctor';
 
 const MedicosPublic = () => {
@@ -16,36 +16,29 @@ const MedicosPublic = () => {
   const [loading, setLoading] = useState(true);
 
   useEffect(() => {
-    const loadData = async () => {
+    // Filtros y conteos por especialidad se resuelven en el servidor
+    const timer = setTimeout(async () => {
       try {
         setLoading(true);
-        const [medicosData, especialidadesData] = await Promise.all([
-          medicoService.getByEstado('Aprobado').catch(() => []),
-          especialidadService.list().catch(() => []),
-        ]);
-        const normalized = Array.isArray(medicosData) ? medicosData.map(normalizeDoctor) : [];
-        setMedicos(normalized);
-        setEspecialidades(Array.isArray(especialidadesData) ? especialidadesData : []);
+        const params = { por_pagina: 60 };
+        if (search.trim()) params.q = search.trim();
+        if (selectedEspecialidad !== 'todos') params.especialidad = selectedEspecialidad;
+        const data = await medicoService.buscar(params);
+        const resultados = Array.isArray(data?.resultados) ? data.resultados : [];
+        setMedicos(resultados.map(normalizeDoctor));
+        const conteos = data?.facetas?.especialidad || {};
+        setEspecialidades(Object.entries(conteos).map(([nombre, total]) => ({ nombre, total })));
       } catch (error) {
         console.error('Error al cargar médicos públicos', error);
+        setMedicos([]);
       } finally {
         setLoading(false);
       }
-    };
-    loadData();
-  }, []);
+    }, 250);
+    return () => clearTimeout(timer);
+  }, [search, selectedEspecialidad]);
 
-  const filteredMedicos = useMemo(() => {
-    return medicos.filter((medico) => {
-      const fullName = (medico.nombre || '').toLowerCase();
-      const specialty = medico.especialidad?.toLowerCase() || '';
-      const matchesSearch = fullName.includes(search.toLowerCase());
-      const matchesSpecialty =
-        selectedEspecialidad === 'todos' ||
-        specialty.includes(selectedEspecialidad.toLowerCase());
-      return matchesSearch && matchesSpecialty;
-    });
-  }, [medicos, search, selectedEspecialidad]);
+  const filteredMedicos = medicos;
 
   return (
     <div className="max-w-6xl mx-auto px-4 sm:px-6 lg:px-8 py-16">
@@ -78,8 +71,8 @@ const MedicosPublic = () => {
               >
                 <option value="todos">Todas las especialidades</option>
                 {especialidades.map((esp) => (
-                  <option key={esp.id_especialidad || esp.ID_Especialidad} value={esp.nombre || esp.Nombre}>
-                    {esp.nombre || esp.Nombre}
+                  <option key={esp.nombre} value={esp.nombre}>
+                    {esp.nombre} ({esp.total})
                   </option>
                 ))}
               </select>
@@ -1,12 +1,17 @@
 import React, { useEffect, useState } from 'react';
 import { useAuth } from '../contexts/AuthContext';
 import { pacienteService } from '../services/api';
-import { Users, Plus, Edit, Trash2, User, AlertCircle } from 'lucide-react';
+import { Users, Plus, Edit, Trash2, User, AlertCircle, Search } from 'lucide-react';
+
+const POR_PAGINA = 24;
 
 const Pacientes = () => {
   const { user } = useAuth();
   const [pacientes, setPacientes] = useState([]);
   const [loading, setLoading] = useState(true);
+  const [busqueda, setBusqueda] = useState('');
+  const [pagina, setPagina] = useState(1);
+  const [total, setTotal] = useState(0);
   const [showModal, setShowModal] = useState(false);
   const [editingId, setEditingId] = useState(null);
   const [formData, setFormData] = useState({
@@ -18,10 +23,11 @@ const Pacientes = () => {
   });
 
   useEffect(() => {
-    if (user) {
-      loadPacientes();
-    }
-  }, [user]);
+    if (!user) return;
+    // Espera a que el admin deje de escribir antes de consultar
+    const temporizador = setTimeout(loadPacientes, 300);
+    return () => clearTimeout(temporizador);
+  }, [user, busqueda, pagina]);
 
   const loadPacientes = async () => {
     try {
@@ -33,18 +39,25 @@ const Pacientes = () => {
         return;
       }
       
-      const data = await pacienteService.getAll();
+      // Búsqueda en el servidor: solo se descarga la página visible
+      const data = await pacienteService.buscar({
+        q: busqueda,
+        pagina,
+        por_pagina: POR_PAGINA,
+      });
       
-      // Asegurar que data es un array
-      if (Array.isArray(data)) {
-        setPacientes(data);
+      if (Array.isArray(data?.resultados)) {
+        setPacientes(data.resultados);
+        setTotal(data.total);
       } else {
         console.warn('Respuesta inesperada de pacientes:', data);
         setPacientes([]);
+        setTotal(0);
       }
     } catch (error) {
       console.error('Error al cargar pacientes:', error);
       setPacientes([]);
+      setTotal(0);
     } finally {
       setLoading(false);
     }
@@ -98,7 +111,8 @@ const Pacientes = () => {
     }
   };
 
-  if (loading) {
+  // Spinner solo en la carga inicial: al buscar, el campo de búsqueda sigue visible
+  if (loading && !busqueda && total === 0) {
     return (
       <div className="flex items-center justify-center h-64">
         <div className="animate-spin rounded-full h-12 w-12 border-b-2 border-primary-600"></div>
@@ -156,6 +170,21 @@ const Pacientes = () => {
         </button>
       </div>
 
+      {/* Búsqueda por nombre o documento */}
+      <div className="relative">
+        <Search className="w-5 h-5 text-gray-400 absolute left-3 top-1/2 -translate-y-1/2" />
+        <input
+          type="text"
+          value={busqueda}
+          onChange={(e) => {
+            setBusqueda(e.target.value);
+            setPagina(1);
+          }}
+          className="input pl-10"
+          placeholder="Buscar por nombre, apellidos o documento"
+        />
+      </div>
+
       {/* Lista de Pacientes */}
       <div className="grid grid-cols-1 md:grid-cols-2 lg:grid-cols-3 gap-6">
         {pacientes.length > 0 ? (
@@ -168,10 +197,10 @@ const Pacientes = () => {
                   </div>
                   <div>
                     <h3 className="font-bold text-gray-900">
-                      Paciente #{paciente.id_paciente}
+                      {paciente.nombre} {paciente.apellidos}
                     </h3>
                     <p className="text-sm text-gray-600">
-                      Usuario ID: {paciente.id_usuario}
+                      Documento: {paciente.documento} · Paciente #{paciente.id_paciente}
                     </p>
                   </div>
                 </div>
@@ -224,11 +253,38 @@ const Pacientes = () => {
         ) : (
           <div className="col-span-full text-center py-12">
             <Users className="w-16 h-16 text-gray-400 mx-auto mb-4" />
-            <p className="text-gray-500 text-lg">No hay pacientes registrados</p>
+            <p className="text-gray-500 text-lg">
+              {busqueda ? 'Ningún paciente coincide con la búsqueda' : 'No hay pacientes registrados'}
+            </p>
           </div>
         )}
       </div>
 
+      {/* Paginación */}
+      {total > POR_PAGINA && (
+        <div className="flex items-center justify-between">
+          <p className="text-sm text-gray-600">
+            {total} pacientes · página {pagina} de {Math.ceil(total / POR_PAGINA)}
+          </p>
+          <div className="flex space-x-2">
+            <button
+              onClick={() => setPagina(pagina - 1)}
+              disabled={pagina === 1}
+              className="btn btn-secondary"
+            >
+              Anterior
+            </button>
+            <button
+              onClick={() => setPagina(pagina + 1)}
+              disabled={pagina * POR_PAGINA >= total}
+              className="btn btn-secondary"
+            >
+              Siguiente
+            </button>
+          </div>
+        </div>
+      )}
+
       {/* Modal para Crear/Editar Paciente */}
       {showModal && (
         <div className="fixed inset-0 bg-black bg-opacity-50 flex items-center justify-center z-50">
@@ -147,7 +147,7 @@ const Perfil = () => {
   const handleFileChange = (file) => {
     if (!file) return;
     setSelectedFile(file);
-    // Solo guardamos el nombre del archivo, no el contenido
+    // El nombre se muestra en el formulario; el contenido va en selectedFile
     setDocForm((prev) => ({ ...prev, archivo: file.name }));
   };
 
@@ -188,13 +188,19 @@ const Perfil = () => {
     const datosEnvio = {
       id_usuario_medico: user.id_usuario,
       id_tipo_documento: idTipoDoc,
-      archivo: docForm.archivo.trim(), // Solo el nombre del archivo
+      archivo: selectedFile, // Archivo real (multipart)
     };
 
-    console.log('Enviando datos:', datosEnvio);
-
     try {
-      await documentoService.upload(datosEnvio);
+      // Archivos grandes por bloques (sobreviven a cortes de conexión)
+      if (selectedFile.size > 1024 * 1024) {
+        await documentoService.uploadReanudable(datosEnvio, {
+          onProgress: (recibido, total) =>
+            setDocMessage(`Subiendo documento... ${Math.round((recibido / total) * 100)}%`),
+        });
+      } else {
+        await documentoService.uploadArchivo(datosEnvio);
+      }
       setDocMessage('Documento enviado para validación.');
       setDocForm({ id_tipo_documento: '', archivo: '' });
       setSelectedFile(null);
@@ -26,6 +26,35 @@ api.interceptors.request.use(
   }
 );
 
+// Un solo refresh en vuelo: los 401 simultáneos (Promise.all, varias
+// peticiones) esperan la misma promesa en lugar de enviar el mismo refresh
+// token varias veces (con rotación, todos menos el primero serían rechazados)
+let refreshEnCurso = null;
+
+const refrescarTokens = () => {
+  if (!refreshEnCurso) {
+    const refreshToken = localStorage.getItem('refresh_token');
+    if (!refreshToken) {
+      return Promise.reject(new Error('No hay refresh token'));
+    }
+    refreshEnCurso = axios
+      .post(`${API_BASE_URL}/auth/refresh/`, { refresh: refreshToken })
+      .then((response) => {
+        // Con rotación el refresh también cambia (el anterior queda en lista negra)
+        const { access, refresh } = response.data;
+        localStorage.setItem('access_token', access);
+        if (refresh) {
+          localStorage.setItem('refresh_token', refresh);
+        }
+        return access;
+      })
+      .finally(() => {
+        refreshEnCurso = null;
+      });
+  }
+  return refreshEnCurso;
+};
+
 // Interceptor para manejar errores y refrescar tokens
 api.interceptors.response.use(
   (response) => response,
@@ -36,15 +65,17 @@ api.interceptors.response.use(
     if (error.response?.status === 401 && !originalRequest._retry) {
       originalRequest._retry = true;
 
+      // Otra pestaña ya renovó el token: reintentar con el nuevo sin refrescar
+      const tokenUsado = originalRequest.headers?.Authorization?.replace('Bearer ', '');
+      const tokenActual = localStorage.getItem('access_token');
+      if (tokenActual && tokenUsado && tokenActual !== tokenUsado) {
+        originalRequest.headers.Authorization = `Bearer ${tokenActual}`;
+        return api(originalRequest);
+      }
+
       try {
-        const refreshToken = localStorage.getItem('refresh_token');
-        if (refreshToken) {
-          const response = await axios.post(`${API_BASE_URL}/auth/refresh/`, {
-            refresh: refreshToken,
-          });
-
-          const { access } = response.data;
-          localStorage.setItem('access_token', access);
+        if (localStorage.getItem('refresh_token')) {
+          const access = await refrescarTokens();
           originalRequest.headers.Authorization = `Bearer ${access}`;
 
           return api(originalRequest);
@@ -115,6 +146,12 @@ export const pacienteService = {
     return response.data;
   },
 
+  // Búsqueda paginada (solo admin): { q, documento, pagina, por_pagina }
+  buscar: async (params) => {
+    const response = await api.get('/pacientes/buscar/', { params });
+    return response.data;
+  },
+
   update: async (id, data) => {
     const response = await api.put(`/pacientes/${id}/`, data);
     return response.data;
@@ -142,6 +179,18 @@ export const medicoService = {
     const response = await api.get('/medicos/listar-estado/Aprobado/');
     return response.data;
   },
+
+  // Directorio público precalculado (médicos aprobados con especialidades y citas)
+  getDirectorio: async () => {
+    const response = await api.get('/medicos/directorio/');
+    return response.data;
+  },
+
+  // Búsqueda facetada en el servidor: { total, resultados, facetas }
+  buscar: async (params) => {
+    const response = await api.get('/medicos/buscar/', { params });
+    return response.data;
+  },
 };
 
 // Servicios de citas
@@ -215,6 +264,16 @@ export const usuarioService = {
     const response = await api.put(`/usuarios/${id}/`, data);
     return response.data;
   },
+
+  // Importación masiva de pacientes (CSV); devuelve el reporte por fila
+  importarPacientes: async (archivo) => {
+    const formData = new FormData();
+    formData.append('archivo', archivo);
+    const response = await api.post('/usuarios/importar/', formData, {
+      headers: { 'Content-Type': 'multipart/form-data' },
+    });
+    return response.data;
+  },
 };
 
 export const diccionarioService = {
@@ -256,6 +315,11 @@ export const especialidadService = {
     const response = await api.post('/especialidades/asignar/', data);
     return response.data;
   },
+
+  assignBulk: async (asignaciones, reemplazar = true) => {
+    const response = await api.post('/especialidades/asignar-lote/', { asignaciones, reemplazar });
+    return response.data;
+  },
 };
 
 export const tipoDocumentoService = {
@@ -325,10 +389,112 @@ export const documentoService = {
     return response.data;
   },
 
+  // Subida con el archivo real (multipart); el backend lo guarda por hash
+  uploadArchivo: async ({ id_usuario_medico, id_tipo_documento, archivo }) => {
+    const formData = new FormData();
+    formData.append('id_usuario_medico', id_usuario_medico);
+    formData.append('id_tipo_documento', id_tipo_documento);
+    formData.append('archivo', archivo);
+    const response = await api.post('/documentos/', formData, {
+      headers: { 'Content-Type': 'multipart/form-data' },
+    });
+    return response.data;
+  },
+
+  // Subida reanudable por bloques: ante un corte consulta el progreso y
+  // continúa desde el último byte recibido en lugar de empezar de nuevo
+  uploadReanudable: async (
+    { id_usuario_medico, id_tipo_documento, archivo },
+    { tamanoBloque = 512 * 1024, reintentos = 8, onProgress } = {}
+  ) => {
+    const { data: carga } = await api.post('/documentos/cargas/', {
+      id_usuario_medico,
+      id_tipo_documento,
+      nombre: archivo.name,
+      tamano: archivo.size,
+      content_type: archivo.type,
+    });
+    const url = `/documentos/cargas/${carga.id_carga}/`;
+    let recibido = carga.recibido;
+    let fallos = 0;
+
+    while (recibido < archivo.size) {
+      const bloque = archivo.slice(recibido, recibido + tamanoBloque);
+      try {
+        const { data } = await api.put(url, bloque, {
+          headers: {
+            'Content-Type': 'application/octet-stream',
+            'Upload-Offset': String(recibido),
+          },
+        });
+        recibido = data.recibido;
+        fallos = 0;
+      } catch (error) {
+        if (error.response?.status === 409) {
+          recibido = error.response.data.recibido;
+        } else {
+          fallos += 1;
+          if (fallos > reintentos) throw error;
+          await new Promise((r) => setTimeout(r, Math.min(1000 * 2 ** fallos, 30000)));
+          const { data } = await api.get(url);
+          recibido = data.recibido;
+        }
+      }
+      if (onProgress) onProgress(recibido, archivo.size);
+    }
+
+    const response = await api.post(`${url}finalizar/`);
+    return response.data;
+  },
+
   validate: async (idDocumento, data) => {
     const response = await api.post(`/documentos/${idDocumento}/validar/`, data);
     return response.data;
   },
+
+  // Archivo del documento (requiere el token, por eso no es un enlace directo)
+  descargar: async (idDocumento) => {
+    const response = await api.get(`/documentos/${idDocumento}/descargar/`, {
+      responseType: 'blob',
+    });
+    return response.data;
+  },
+
+  // Imagen de vista previa (URL tomada de doc.vista_previa)
+  vistaPrevia: async (url) => {
+    const response = await api.get(url, { responseType: 'blob' });
+    return response.data;
+  },
+
+  // Cola de revisión compartida entre administradores
+  pendientes: async (params = {}) => {
+    const response = await api.get('/documentos/pendientes/', { params });
+    return response.data;
+  },
+
+  reclamar: async (cantidad = 10, minutos = 15) => {
+    const response = await api.post('/documentos/reclamar/', { cantidad, minutos });
+    return response.data;
+  },
+
+  liberar: async (ids) => {
+    const response = await api.post('/documentos/liberar/', ids ? { ids } : {});
+    return response.data;
+  },
+
+  validarLote: async (idUsuarioAdmin, decisiones) => {
+    const response = await api.post('/documentos/validar-lote/', {
+      id_usuario_admin: idUsuarioAdmin,
+      decisiones,
+    });
+    return response.data;
+  },
+
+  // Contadores de validación de todos los médicos en una sola petición
+  resumenMedicos: async (params = {}) => {
+    const response = await api.get('/documentos/resumen-medicos/', { params });
+    return response.data;
+  },
 };
 
 export const notificacionService = {
@@ -341,6 +507,38 @@ export const notificacionService = {
     const response = await api.get(`/notificaciones/medico/${usuarioMedicoId}/`);
     return response.data;
   },
+
+  // Solo las nuevas desde afterId (sin traer el historial completo)
+  listDesde: async (rol, usuarioId, afterId, limite = 50) => {
+    const response = await api.get(`/notificaciones/${rol}/${usuarioId}/`, {
+      params: { after_id: afterId, limite },
+    });
+    return response.data;
+  },
+
+  contador: async (rol, usuarioId) => {
+    const response = await api.get(`/notificaciones/${rol}/${usuarioId}/contador/`);
+    return response.data;
+  },
+
+  marcarLeidas: async (rol, usuarioId, hastaId) => {
+    const response = await api.post(
+      `/notificaciones/${rol}/${usuarioId}/leer/`,
+      hastaId ? { hasta_id: hastaId } : {}
+    );
+    return response.data;
+  },
+
+  // Notificaciones en tiempo real (SSE). EventSource reconecta solo y envía
+  // Last-Event-ID; devuelve la instancia para cerrarla con .close()
+  stream: (onNotificacion, { lastEventId } = {}) => {
+    const params = new URLSearchParams({ token: localStorage.getItem('access_token') || '' });
+    if (lastEventId) params.set('last_event_id', lastEventId);
+    const source = new EventSource(`${API_BASE_URL}/notificaciones/stream/?${params}`);
+    source.addEventListener('notificacion', (event) => onNotificacion(JSON.parse(event.data)));
+    source.addEventListener('token_expirado', () => source.close());
+    return source;
+  },
 };
 
 export const videollamadaService = {
@@ -353,6 +551,81 @@ export const videollamadaService = {
     const response = await api.get(`/videollamada/${citaId}/`);
     return response.data;
   },
+
+  // Valida un token de ingreso sin consultar la BD (no requiere sesión)
+  unirse: async (token) => {
+    const response = await api.get('/videollamada/unirse/', { params: { token } });
+    return response.data;
+  },
+
+  // Mide RTT, bajada y subida antes de la llamada y registra el resultado;
+  // devuelve el perfil recomendado (audio, baja o hd)
+  medirEnlace: async (citaId, bytes = 256 * 1024) => {
+    const url = `/videollamada/${citaId}/sonda/`;
+
+    let rttMs = Infinity;
+    for (let i = 0; i < 3; i += 1) {
+      const inicio = performance.now();
+      await api.get(url, { params: { bytes: 0, _: Date.now() } });
+      rttMs = Math.min(rttMs, performance.now() - inicio);
+    }
+
+    let inicio = performance.now();
+    await api.get(url, { params: { bytes, _: Date.now() }, responseType: 'arraybuffer' });
+    const bajadaKbps = (bytes * 8) / Math.max(performance.now() - inicio - rttMs, 1);
+
+    inicio = performance.now();
+    await api.put(url, new Uint8Array(bytes), {
+      headers: { 'Content-Type': 'application/octet-stream' },
+    });
+    const subidaKbps = (bytes * 8) / Math.max(performance.now() - inicio - rttMs, 1);
+
+    const response = await api.post(url, {
+      bajada_kbps: Math.round(bajadaKbps),
+      subida_kbps: Math.round(subidaKbps),
+      rtt_ms: Math.round(rttMs),
+    });
+    return response.data;
+  },
+
+  // WebSocket de señalización WebRTC (offer/answer/ice) con el otro participante
+  senalizacion: (citaId, onMensaje) => {
+    const token = localStorage.getItem('access_token');
+    const base = new URL(API_BASE_URL, window.location.origin);
+    base.protocol = base.protocol === 'https:' ? 'wss:' : 'ws:';
+    base.pathname = `/ws/videollamada/${citaId}/`;
+    base.search = new URLSearchParams({ token }).toString();
+    const socket = new WebSocket(base.toString());
+    socket.addEventListener('message', (event) => onMensaje(JSON.parse(event.data)));
+    return {
+      socket,
+      enviar: (tipo, datos) => socket.send(JSON.stringify({ tipo, datos })),
+    };
+  },
+};
+
+// Exportaciones para administradores (CSV/JSONL en streaming)
+export const exportacionService = {
+  // conjunto: usuarios | pacientes | medicos | citas | validaciones
+  descargar: async (conjunto, { formato = 'csv', desde, hasta } = {}) => {
+    const response = await api.get(`/administrador/exportar/${conjunto}/`, {
+      params: { formato, desde, hasta },
+      responseType: 'blob',
+    });
+    const enlace = document.createElement('a');
+    enlace.href = URL.createObjectURL(response.data);
+    enlace.download = `${conjunto}.${formato}`;
+    enlace.click();
+    URL.revokeObjectURL(enlace.href);
+  },
+};
+
+// Métricas operativas (solo admin): { desde, hasta, refrescar }
+export const analiticaService = {
+  resumen: async (params) => {
+    const response = await api.get('/administrador/analitica/', { params });
+    return response.data;
+  },
 };
 
 export default api;
@@ -14,7 +14,9 @@ export const normalizeDoctor = (doctor = {}) => {
   const nombre = getValue(doctor, ['nombre', 'Nombre'], '');
   const apellidos = getValue(doctor, ['apellidos', 'Apellidos'], '');
   const fullName = `${nombre} ${apellidos}`.trim() || getValue(doctor, ['nombre_completo', 'NombreCompleto'], '');
+  const especialidades = Array.isArray(doctor.especialidades) ? doctor.especialidades : [];
   const especialidad =
+    especialidades[0] ||
     getValue(doctor, ['especialidad', 'Especialidad', 'especialidad_principal', 'EspecialidadPrincipal'], '') ||
     'Medicina General';
   const vereda = getValue(doctor, ['vereda', 'Vereda', 'municipio', 'Municipio'], 'Colombia');
@@ -25,7 +27,7 @@ export const normalizeDoctor = (doctor = {}) => {
   );
   const rating = ratingRaw ? Number(ratingRaw) : null;
   const totalCitas = Number(
-    getValue(doctor, ['total_citas', 'TotalCitas', 'citas_atendidas', 'CitasAtendidas'], null)
+    getValue(doctor, ['citas_completadas', 'total_citas', 'TotalCitas', 'citas_atendidas', 'CitasAtendidas'], null)
   );
   const estadoValidacion = getValue(doctor, ['estado_validacion', 'EstadoValidacion'], '');
   const idMedico = doctor.id_medico || doctor.ID_Medico || doctor.id || doctor.ID;
@@ -43,10 +45,12 @@ export const normalizeDoctor = (doctor = {}) => {
     usuarioId,
     nombre: fullName || `Médico ${idMedico || ''}`.trim(),
     especialidad,
+    especialidades: especialidades.length ? especialidades : [especialidad],
     vereda,
     rating,
     totalCitas: Number.isNaN(totalCitas) ? null : totalCitas,
     estadoValidacion,
+    miniaturas: doctor.miniaturas || null,
     iniciales: fullName
       ? fullName
           .split(' ')
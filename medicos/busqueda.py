@@ -0,0 +1,260 @@
+"""
+Búsqueda facetada de médicos - Salud Rural
+
+Índice en memoria construido sobre el directorio público (MedicoDirectorio).
+Cada faceta (especialidad, vereda, años de experiencia) y cada término de
+texto se representa como un bitmap: un entero de Python donde el bit i
+indica que la fila i del directorio cumple la condición.
+
+Con esto:
+- Filtrar = AND/OR de enteros
+- Contar una faceta = popcount del bitmap intersectado con los filtros
+- No se recorre la lista de médicos por cada petición
+
+El índice se reconstruye solo cuando cambia la firma del directorio
+(cantidad de filas y última actualización), que se consulta con una sola
+agregación por búsqueda.
+"""
+
+import threading
+import unicodedata
+
+from django.db.models import Count, Max
+
+from .models import MedicoDirectorio
+
+
+# Rangos de experiencia mostrados como faceta: (etiqueta, mínimo, máximo)
+RANGOS_EXPERIENCIA = [
+    ("0-4", 0, 4),
+    ("5-9", 5, 9),
+    ("10-19", 10, 19),
+    ("20+", 20, None),
+]
+
+CAMPOS_RESULTADO = [
+    "id_medico",
+    "id_usuario",
+    "nombre",
+    "apellidos",
+    "vereda",
+    "anios_experiencia",
+    "descripcion_perfil",
+    "foto",
+    "miniatura",
+    "especialidades",
+    "total_citas",
+    "citas_completadas",
+]
+
+
+def normalizar(texto):
+    """Minúsculas y sin tildes: 'Pediatría' -> 'pediatria'."""
+    if not texto:
+        return ""
+    descompuesto = unicodedata.normalize("NFKD", str(texto))
+    return "".join(c for c in descompuesto if not unicodedata.combining(c)).lower().strip()
+
+
+def _tokens(texto):
+    return [t for t in normalizar(texto).replace(",", " ").split() if t]
+
+
+def _iterar_bits(bitmap):
+    """Índices de los bits encendidos, en orden ascendente."""
+    while bitmap:
+        bajo = bitmap & -bitmap
+        yield bajo.bit_length() - 1
+        bitmap ^= bajo
+
+
+class IndiceMedicos:
+    """Bitmaps por faceta sobre una lista fija de filas del directorio."""
+
+    def __init__(self, filas):
+        self.filas = filas
+        self.todos = (1 << len(filas)) - 1
+        self.especialidad = {}
+        self.vereda = {}
+        self.terminos = {}
+        # hasta_anios[a] = médicos con experiencia <= a
+        self.hasta_anios = {}
+        self.con_experiencia = 0
+        # Nombre visible de cada valor normalizado de faceta
+        self.etiquetas = {"especialidad": {}, "vereda": {}}
+
+        por_anio = {}
+        for i, fila in enumerate(filas):
+            bit = 1 << i
+
+            for nombre in fila["especialidades"] or []:
+                clave = normalizar(nombre)
+                self.especialidad[clave] = self.especialidad.get(clave, 0) | bit
+                self.etiquetas["especialidad"].setdefault(clave, nombre)
+
+            if fila["vereda"]:
+                clave = normalizar(fila["vereda"])
+                self.vereda[clave] = self.vereda.get(clave, 0) | bit
+                self.etiquetas["vereda"].setdefault(clave, fila["vereda"])
+
+            if fila["anios_experiencia"] is not None:
+                anios = fila["anios_experiencia"]
+                por_anio[anios] = por_anio.get(anios, 0) | bit
+                self.con_experiencia |= bit
+
+            texto = " ".join([
+                fila["nombre"] or "",
+                fila["apellidos"] or "",
+                fila["vereda"] or "",
+                " ".join(fila["especialidades"] or []),
+            ])
+            for token in _tokens(texto):
+                self.terminos[token] = self.terminos.get(token, 0) | bit
+
+        acumulado = 0
+        for anios in sorted(por_anio):
+            acumulado |= por_anio[anios]
+            self.hasta_anios[anios] = acumulado
+        self._anios_ordenados = sorted(self.hasta_anios)
+
+    # -------------------------------------------------------------------------
+    # Bitmaps por filtro
+    # -------------------------------------------------------------------------
+
+    def _hasta(self, anios):
+        """Bitmap de médicos con experiencia <= anios."""
+        resultado = 0
+        for a in self._anios_ordenados:
+            if a > anios:
+                break
+            resultado = self.hasta_anios[a]
+        return resultado
+
+    def bitmap_experiencia(self, minimo=None, maximo=None):
+        if minimo is None and maximo is None:
+            return self.todos
+        bitmap = self.con_experiencia
+        if maximo is not None:
+            bitmap &= self._hasta(maximo)
+        if minimo is not None and minimo > 0:
+            bitmap &= ~self._hasta(minimo - 1)
+        return bitmap
+
+    def bitmap_valores(self, faceta, valores):
+        """OR de los valores pedidos dentro de una faceta."""
+        if not valores:
+            return self.todos
+        indice = getattr(self, faceta)
+        bitmap = 0
+        for valor in valores:
+            bitmap |= indice.get(normalizar(valor), 0)
+        return bitmap
+
+    def bitmap_texto(self, texto):
+        """AND entre palabras; cada palabra coincide por prefijo."""
+        bitmap = self.todos
+        for token in _tokens(texto):
+            coincidencias = 0
+            for termino, bits in self.terminos.items():
+                if termino.startswith(token):
+                    coincidencias |= bits
+            bitmap &= coincidencias
+            if not bitmap:
+                break
+        return bitmap
+
+    # -------------------------------------------------------------------------
+    # Consulta
+    # -------------------------------------------------------------------------
+
+    def buscar(self, especialidad=None, vereda=None, experiencia_min=None,
+               experiencia_max=None, q=None, pagina=1, por_pagina=20):
+        filtros = {
+            "especialidad": self.bitmap_valores("especialidad", especialidad),
+            "vereda": self.bitmap_valores("vereda", vereda),
+            "experiencia": self.bitmap_experiencia(experiencia_min, experiencia_max),
+            "q": self.bitmap_texto(q) if q else self.todos,
+        }
+
+        def sin(faceta):
+            # Conteos de una faceta ignoran su propio filtro (facetas disyuntivas)
+            mascara = self.todos
+            for nombre, bitmap in filtros.items():
+                if nombre != faceta:
+                    mascara &= bitmap
+            return mascara
+
+        resultado = sin(None)
+
+        facetas = {
+            "especialidad": self._contar("especialidad", sin("especialidad")),
+            "vereda": self._contar("vereda", sin("vereda")),
+            "experiencia": {},
+        }
+        mascara_exp = sin("experiencia")
+        for etiqueta, minimo, maximo in RANGOS_EXPERIENCIA:
+            conteo = (self.bitmap_experiencia(minimo, maximo) & mascara_exp).bit_count()
+            if conteo:
+                facetas["experiencia"][etiqueta] = conteo
+
+        total = resultado.bit_count()
+        inicio = (pagina - 1) * por_pagina
+        fin = inicio + por_pagina
+        pagina_filas = []
+        for posicion, i in enumerate(_iterar_bits(resultado)):
+            if posicion >= fin:
+                break
+            if posicion >= inicio:
+                pagina_filas.append(self.filas[i])
+
+        return {
+            "total": total,
+            "pagina": pagina,
+            "por_pagina": por_pagina,
+            "resultados": pagina_filas,
+            "facetas": facetas,
+        }
+
+    def _contar(self, faceta, mascara):
+        conteos = {}
+        for clave, bitmap in getattr(self, faceta).items():
+            conteo = (bitmap & mascara).bit_count()
+            if conteo:
+                conteos[self.etiquetas[faceta][clave]] = conteo
+        return dict(sorted(conteos.items(), key=lambda item: (-item[1], item[0])))
+
+
+# =============================================================================
+# ÍNDICE COMPARTIDO POR PROCESO
+# =============================================================================
+
+_lock = threading.Lock()
+_indice = None
+_firma = None
+
+
+def _firma_directorio():
+    agregado = MedicoDirectorio.objects.aggregate(
+        total=Count("id_usuario"),
+        ultima=Max("actualizado"),
+    )
+    return (agregado["total"], agregado["ultima"])
+
+
+def obtener_indice():
+    """Devuelve el índice vigente, reconstruyéndolo si el directorio cambió."""
+    global _indice, _firma
+    firma = _firma_directorio()
+    if _indice is not None and firma == _firma:
+        return _indice
+
+    with _lock:
+        if _indice is None or firma != _firma:
+            filas = list(
+                MedicoDirectorio.objects
+                .order_by("apellidos", "nombre", "id_usuario")
+                .values(*CAMPOS_RESULTADO)
+            )
+            _indice = IndiceMedicos(filas)
+            _firma = firma
+        return _indice
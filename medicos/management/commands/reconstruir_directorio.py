@@ -0,0 +1,38 @@
+"""
+Reconstruye por completo el directorio público de médicos.
+
+Uso:
+    python manage.py reconstruir_directorio
+
+Normalmente no hace falta: el directorio se refresca por médico en cada
+cambio de perfil, validación, especialidad o cita. Sirve para la carga
+inicial y para recuperarse si algún refresco falló.
+"""
+
+from django.core.management.base import BaseCommand
+
+from medicos.models import Medico, MedicoDirectorio
+from medicos.services import directorio_refrescar
+
+
+class Command(BaseCommand):
+    help = "Reconstruye la tabla medico_directorio desde medico, especialidades y citas."
+
+    def handle(self, *args, **options):
+        aprobados = list(
+            Medico.objects.filter(estado_validacion="Aprobado")
+            .values_list("id_usuario", flat=True)
+        )
+
+        # Filas de médicos que ya no están aprobados
+        eliminados, _ = MedicoDirectorio.objects.exclude(
+            id_usuario__in=aprobados
+        ).delete()
+
+        for id_usuario in aprobados:
+            directorio_refrescar(id_usuario)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Directorio reconstruido: {len(aprobados)} médicos, "
+            f"{eliminados} filas obsoletas eliminadas."
+        ))
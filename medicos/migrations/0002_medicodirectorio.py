@@ -0,0 +1,33 @@
+# Generated by Django 5.2.7 on 2026-10-19 09:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('medicos', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MedicoDirectorio',
+            fields=[
+                ('id_usuario', models.IntegerField(db_column='ID_Usuario', primary_key=True, serialize=False)),
+                ('id_medico', models.IntegerField(db_column='ID_Medico', unique=True)),
+                ('nombre', models.CharField(db_column='Nombre', max_length=100, null=True)),
+                ('apellidos', models.CharField(db_column='Apellidos', max_length=100, null=True)),
+                ('vereda', models.CharField(db_column='Vereda', max_length=100, null=True)),
+                ('anios_experiencia', models.IntegerField(db_column='AniosExperiencia', null=True)),
+                ('descripcion_perfil', models.TextField(db_column='DescripcionPerfil', null=True)),
+                ('foto', models.CharField(db_column='Foto', max_length=200, null=True)),
+                ('especialidades', models.JSONField(db_column='Especialidades', default=list)),
+                ('total_citas', models.IntegerField(db_column='TotalCitas', default=0)),
+                ('citas_completadas', models.IntegerField(db_column='CitasCompletadas', default=0)),
+                ('actualizado', models.DateTimeField(auto_now=True, db_column='Actualizado')),
+            ],
+            options={
+                'db_table': 'medico_directorio',
+            },
+        ),
+    ]
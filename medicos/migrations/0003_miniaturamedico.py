@@ -0,0 +1,30 @@
+# Generated by Django 5.2.7 on 2026-10-19 10:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('medicos', '0002_medicodirectorio'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MiniaturaMedico',
+            fields=[
+                ('id_usuario', models.IntegerField(db_column='ID_Usuario', primary_key=True, serialize=False)),
+                ('foto', models.CharField(db_column='Foto', max_length=200, null=True)),
+                ('hash_contenido', models.CharField(db_column='HashContenido', max_length=32, null=True)),
+                ('actualizado', models.DateTimeField(auto_now=True, db_column='Actualizado')),
+            ],
+            options={
+                'db_table': 'medico_miniatura',
+            },
+        ),
+        migrations.AddField(
+            model_name='medicodirectorio',
+            name='miniatura',
+            field=models.CharField(db_column='MiniaturaHash', max_length=32, null=True),
+        ),
+    ]
@@ -0,0 +1,138 @@
+"""
+Miniaturas de fotos de médicos - Salud Rural
+
+Genera versiones reducidas de Medico.foto para no descargar la foto completa
+en los avatares (64 px) sobre enlaces móviles rurales.
+
+- Tamaños fijos: 64, 128 y 256 px (recorte cuadrado centrado)
+- Formatos: WebP y JPEG (respaldo para navegadores antiguos)
+- Nombre por contenido: <sha256[:32]>-<tamaño>.<ext>, por eso cada archivo es
+  inmutable y se sirve con caché de un año. Si la foto cambia, cambia el hash
+  y por tanto la URL.
+
+Medico.foto se interpreta como ruta relativa a MEDIA_ROOT. Las URLs externas
+(http/https) no se procesan.
+"""
+
+import hashlib
+import logging
+import os
+from pathlib import Path
+
+from django.conf import settings
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+
+logger = logging.getLogger(__name__)
+
+TAMANOS = (64, 128, 256)
+
+FORMATOS = {
+    "webp": ("WEBP", {"quality": 80, "method": 4}),
+    "jpeg": ("JPEG", {"quality": 82, "optimize": True, "progressive": True}),
+}
+
+CARPETA = "miniaturas"
+
+# Cache-Control para archivos con nombre por contenido
+CACHE_INMUTABLE = "public, max-age=31536000, immutable"
+
+
+def carpeta_miniaturas():
+    return Path(settings.MEDIA_ROOT) / CARPETA
+
+
+def nombre_miniatura(digest, tamano, extension):
+    return f"{digest}-{tamano}.{extension}"
+
+
+def ruta_origen(foto):
+    """Ruta absoluta de la foto dentro de MEDIA_ROOT, o None si no aplica."""
+    if not foto or foto.startswith(("http://", "https://")):
+        return None
+
+    media_root = Path(settings.MEDIA_ROOT).resolve()
+    relativa = foto.lstrip("/")
+    media_url = str(settings.MEDIA_URL).strip("/") + "/"
+    if relativa.startswith(media_url):
+        relativa = relativa[len(media_url):]
+
+    ruta = (media_root / relativa).resolve()
+    # Evitar rutas fuera de MEDIA_ROOT (../../etc/passwd)
+    if media_root not in ruta.parents or not ruta.is_file():
+        return None
+    return ruta
+
+
+def hash_archivo(ruta, tamano_bloque=64 * 1024):
+    sha = hashlib.sha256()
+    with open(ruta, "rb") as archivo:
+        for bloque in iter(lambda: archivo.read(tamano_bloque), b""):
+            sha.update(bloque)
+    return sha.hexdigest()[:32]
+
+
+def generar_miniaturas(foto):
+    """
+    Genera todas las miniaturas de una foto.
+
+    Returns:
+        str | None: hash de contenido (prefijo de los nombres), o None si la
+        foto no existe o no es una imagen válida.
+    """
+    origen = ruta_origen(foto)
+    if origen is None:
+        return None
+
+    digest = hash_archivo(origen)
+    destino = carpeta_miniaturas()
+    destino.mkdir(parents=True, exist_ok=True)
+
+    pendientes = [
+        (tamano, extension)
+        for tamano in TAMANOS
+        for extension in FORMATOS
+        if not (destino / nombre_miniatura(digest, tamano, extension)).exists()
+    ]
+    if not pendientes:
+        # Mismo contenido ya procesado (foto re-subida o compartida)
+        return digest
+
+    try:
+        with Image.open(origen) as imagen:
+            imagen = ImageOps.exif_transpose(imagen).convert("RGB")
+            for tamano, extension in pendientes:
+                formato, opciones = FORMATOS[extension]
+                reducida = ImageOps.fit(
+                    imagen, (tamano, tamano), Image.Resampling.LANCZOS
+                )
+                final = destino / nombre_miniatura(digest, tamano, extension)
+                temporal = final.with_name(final.name + ".tmp")
+                reducida.save(temporal, formato, **opciones)
+                os.replace(temporal, final)
+    except (UnidentifiedImageError, OSError):
+        logger.exception("No se pudieron generar miniaturas para %s", foto)
+        return None
+
+    return digest
+
+
+def urls_miniaturas(digest, request=None):
+    """
+    Diccionario de URLs por tamaño y formato:
+        {"64": {"webp": "...", "jpeg": "..."}, "128": {...}, "256": {...}}
+    """
+    if not digest:
+        return None
+
+    def url(nombre):
+        ruta = f"/api/medicos/miniaturas/{nombre}/"
+        return request.build_absolute_uri(ruta) if request is not None else ruta
+
+    return {
+        str(tamano): {
+            extension: url(nombre_miniatura(digest, tamano, extension))
+            for extension in FORMATOS
+        }
+        for tamano in TAMANOS
+    }
@@ -19,3 +19,45 @@ class Medico(models.Model):
         db_table = 'medico'
 
 
+class MedicoDirectorio(models.Model):
+    """
+    Modelo de lectura desnormalizado para el directorio público de médicos.
+
+    Una fila por médico aprobado y activo, con sus especialidades, conteo de
+    citas y vereda ya resueltos. A diferencia de 'medico', esta tabla SÍ es
+    gestionada por Django: se recalcula desde medicos.services cada vez que
+    cambia el perfil, la validación o las especialidades del médico.
+    """
+    id_usuario = models.IntegerField(db_column='ID_Usuario', primary_key=True)
+    id_medico = models.IntegerField(db_column='ID_Medico', unique=True)
+    nombre = models.CharField(db_column='Nombre', max_length=100, null=True)
+    apellidos = models.CharField(db_column='Apellidos', max_length=100, null=True)
+    vereda = models.CharField(db_column='Vereda', max_length=100, null=True)
+    anios_experiencia = models.IntegerField(db_column='AniosExperiencia', null=True)
+    descripcion_perfil = models.TextField(db_column='DescripcionPerfil', null=True)
+    foto = models.CharField(db_column='Foto', max_length=200, null=True)
+    miniatura = models.CharField(db_column='MiniaturaHash', max_length=32, null=True)
+    especialidades = models.JSONField(db_column='Especialidades', default=list)
+    total_citas = models.IntegerField(db_column='TotalCitas', default=0)
+    citas_completadas = models.IntegerField(db_column='CitasCompletadas', default=0)
+    actualizado = models.DateTimeField(db_column='Actualizado', auto_now=True)
+
+    class Meta:
+        db_table = 'medico_directorio'
+
+
+class MiniaturaMedico(models.Model):
+    """
+    Hash de contenido de las miniaturas generadas para Medico.foto.
+
+    Los archivos viven en MEDIA_ROOT/miniaturas/ con nombre
+    <hash>-<tamaño>.<ext> (ver medicos.miniaturas). 'foto' guarda la ruta
+    de origen; el cambio se detecta por el hash del archivo, no por la ruta.
+    """
+    id_usuario = models.IntegerField(db_column='ID_Usuario', primary_key=True)
+    foto = models.CharField(db_column='Foto', max_length=200, null=True)
+    hash_contenido = models.CharField(db_column='HashContenido', max_length=32, null=True)
+    actualizado = models.DateTimeField(db_column='Actualizado', auto_now=True)
+
+    class Meta:
+        db_table = 'medico_miniatura'
@@ -39,3 +39,26 @@ class MedicoEstadoSerializer(serializers.Serializer):
     total_aprobados = serializers.IntegerField()
     total_pendientes = serializers.IntegerField()
     total_rechazados = serializers.IntegerField()
+
+
+class BusquedaMedicoSerializer(serializers.Serializer):
+    especialidad = serializers.ListField(
+        child=serializers.CharField(max_length=100), required=False
+    )
+    vereda = serializers.ListField(
+        child=serializers.CharField(max_length=100), required=False
+    )
+    experiencia_min = serializers.IntegerField(min_value=0, required=False)
+    experiencia_max = serializers.IntegerField(min_value=0, required=False)
+    q = serializers.CharField(max_length=100, required=False, allow_blank=True)
+    pagina = serializers.IntegerField(min_value=1, default=1)
+    por_pagina = serializers.IntegerField(min_value=1, max_value=100, default=20)
+
+    def validate(self, attrs):
+        minimo = attrs.get("experiencia_min")
+        maximo = attrs.get("experiencia_max")
+        if minimo is not None and maximo is not None and minimo > maximo:
+            raise serializers.ValidationError(
+                "experiencia_min no puede ser mayor que experiencia_max."
+            )
+        return attrs
@@ -1,4 +1,16 @@
+import logging
+
 from django.db import connection, DatabaseError
+from django.db.models import Count, Q
+
+from citas.models import Cita
+from especialidad.services import sp_medico_especialidad_list
+
+from .miniaturas import generar_miniaturas, urls_miniaturas
+from .models import Medico, MedicoDirectorio, MiniaturaMedico
+
+
+logger = logging.getLogger(__name__)
 
 
 def dictfetchall(cursor):
@@ -96,3 +108,160 @@ def sp_medico_estado(id_usuario):
             "total_pendientes": row[9],
             "total_rechazados": row[10],
         }
+
+
+# ------------------------------
+# Directorio público (modelo de lectura)
+# ------------------------------
+def directorio_refrescar(id_usuario):
+    """
+    Recalcula la fila del directorio público de un médico.
+
+    Si el médico ya no está aprobado o está desactivado, su fila se elimina.
+    Los errores se registran y no se propagan: el directorio es derivado y
+    puede reconstruirse con `manage.py reconstruir_directorio`.
+    """
+    try:
+        medico = sp_medico_get_by_usuario(id_usuario)
+        if (not medico or not medico["activo"]
+                or medico["estado_validacion"] != "Aprobado"):
+            MedicoDirectorio.objects.filter(id_usuario=id_usuario).delete()
+            return None
+
+        especialidades = [
+            e["nombre"] for e in sp_medico_especialidad_list(id_usuario)
+        ]
+        conteo = Cita.objects.filter(
+            id_medico=medico["id_medico"]
+        ).aggregate(
+            total=Count("id_cita", filter=~Q(estado="Cancelada")),
+            completadas=Count("id_cita", filter=Q(estado="Completada")),
+        )
+
+        miniatura = (
+            MiniaturaMedico.objects.filter(id_usuario=id_usuario)
+            .values_list("hash_contenido", flat=True)
+            .first()
+        )
+
+        fila, _ = MedicoDirectorio.objects.update_or_create(
+            id_usuario=id_usuario,
+            defaults={
+                "id_medico": medico["id_medico"],
+                "nombre": medico["nombre"],
+                "apellidos": medico["apellidos"],
+                "vereda": medico["vereda"],
+                "anios_experiencia": medico["anios_experiencia"],
+                "descripcion_perfil": medico["descripcion_perfil"],
+                "foto": medico["foto"],
+                "miniatura": miniatura,
+                "especialidades": especialidades,
+                "total_citas": conteo["total"] or 0,
+                "citas_completadas": conteo["completadas"] or 0,
+            },
+        )
+        return fila
+    except DatabaseError:
+        logger.exception("No se pudo refrescar el directorio del médico %s", id_usuario)
+        return None
+
+
+def directorio_refrescar_por_medico(id_medico):
+    """Igual que directorio_refrescar, pero a partir de ID_Medico."""
+    id_usuario = (
+        Medico.objects.filter(id_medico=id_medico)
+        .values_list("id_usuario", flat=True)
+        .first()
+    )
+    if id_usuario is not None:
+        directorio_refrescar(id_usuario)
+
+
+def directorio_refrescar_por_cita(id_cita):
+    """Refresca el directorio del médico asignado a una cita."""
+    id_medico = (
+        Cita.objects.filter(id_cita=id_cita)
+        .values_list("id_medico", flat=True)
+        .first()
+    )
+    if id_medico is not None:
+        directorio_refrescar_por_medico(id_medico)
+
+
+def directorio_listar():
+    """Lista compacta del directorio, lista para serializar."""
+    return list(
+        MedicoDirectorio.objects.order_by("apellidos", "nombre").values(
+            "id_medico",
+            "id_usuario",
+            "nombre",
+            "apellidos",
+            "vereda",
+            "anios_experiencia",
+            "descripcion_perfil",
+            "foto",
+            "miniatura",
+            "especialidades",
+            "total_citas",
+            "citas_completadas",
+        )
+    )
+
+
+# ------------------------------
+# Miniaturas de foto
+# ------------------------------
+def miniaturas_actualizar(id_usuario, foto):
+    """
+    Genera las miniaturas de la foto del médico si cambió su contenido.
+
+    Se compara el hash del archivo, no la ruta: re-subir una foto a la misma
+    ruta también regenera. generar_miniaturas() solo procesa los tamaños que
+    falten para ese hash, así que una foto sin cambios cuesta un hash y
+    unos stat. Si la generación falla no se guarda el registro (se borra el
+    anterior, que apuntaría a otra imagen) y la próxima llamada reintenta.
+
+    Returns:
+        str | None: hash de contenido de las miniaturas vigentes
+    """
+    registro = MiniaturaMedico.objects.filter(id_usuario=id_usuario).first()
+    digest = generar_miniaturas(foto)
+
+    if digest is None:
+        if registro:
+            registro.delete()
+        return None
+
+    if not registro or registro.foto != foto or registro.hash_contenido != digest:
+        MiniaturaMedico.objects.update_or_create(
+            id_usuario=id_usuario,
+            defaults={"foto": foto, "hash_contenido": digest},
+        )
+    return digest
+
+
+def agregar_miniaturas(filas, request=None):
+    """
+    Agrega el campo "miniaturas" (URLs por tamaño y formato) a filas de médicos.
+
+    Acepta filas del directorio (campo "miniatura") y filas de los SPs
+    (id_usuario / ID_Usuario), resolviendo estas últimas con una sola consulta.
+    """
+    def id_de(fila):
+        return fila.get("id_usuario", fila.get("ID_Usuario"))
+
+    sin_hash = [id_de(f) for f in filas if "miniatura" not in f]
+    hashes = {}
+    if sin_hash:
+        hashes = dict(
+            MiniaturaMedico.objects.filter(id_usuario__in=sin_hash)
+            .values_list("id_usuario", "hash_contenido")
+        )
+
+    resultado = []
+    for fila in filas:
+        fila = dict(fila)
+        digest = fila.pop("miniatura", None) or hashes.get(id_de(fila))
+        fila["miniaturas"] = urls_miniaturas(digest, request)
+        resultado.append(fila)
+    return resultado
@@ -7,6 +7,21 @@ router.register(r'medicos', MedicoViewSet, basename='medicos')
 
 urlpatterns = router.urls + [
 
+    path(
+        'medicos/directorio/',
+        MedicoViewSet.as_view({'get': 'directorio'})
+    ),
+
+    path(
+        'medicos/buscar/',
+        MedicoViewSet.as_view({'get': 'buscar'})
+    ),
+
+    path(
+        'medicos/miniaturas/<str:nombre>/',
+        MedicoViewSet.as_view({'get': 'miniatura'})
+    ),
+
     path(
         'medicos/estado/<int:pk>/',
         MedicoViewSet.as_view({'get': 'estado'})
@@ -5,7 +5,10 @@ Gestiona perfiles profesionales de médicos.
 Con PERMISOS para proteger datos profesionales.
 """
 
+import re
+
 from django.db import DatabaseError
+from django.http import Http404
 from rest_framework import status, viewsets
 from rest_framework.decorators import action
 from rest_framework.response import Response
@@ -13,7 +16,10 @@ from rest_framework.permissions import AllowAny, IsAuthenticated
 
 from backend.permissions import IsMedico, IsAdministrador
 
+from .busqueda import obtener_indice
+from .miniaturas import CACHE_INMUTABLE, carpeta_miniaturas
 from .serializers import (
+    BusquedaMedicoSerializer,
     MedicoUpdateSerializer,
 )
 from .services import (
@@ -22,28 +28,36 @@ from .services import (
     sp_medico_list_by_estado,
     sp_medico_update,
     sp_medico_estado,
+    directorio_listar,
+    directorio_refrescar,
+    miniaturas_actualizar,
+    agregar_miniaturas,
 )
 
 
+# <hash>-<tamaño>.<ext>, tal como los genera medicos.miniaturas
+PATRON_MINIATURA = re.compile(r'^[0-9a-f]{32}-\d+\.(webp|jpeg)$')
+
+
 class MedicoViewSet(viewsets.ViewSet):
     """
     ViewSet para gestión de perfiles de Médicos.
     
     Permisos:
-    - list/list_by_estado: Público (pacientes buscan médicos)
+    - list/list_by_estado/directorio/buscar: Público (pacientes buscan médicos)
     - retrieve: Público (pacientes ven perfiles)
     - update: Médico actualiza solo su perfil, Admin todos
     - estado: Público o autenticado
     """
     
     def get_permissions(self):
-        if self.action in ['list', 'retrieve', 'list_by_estado', 'estado']:
+        if self.action in ['list', 'retrieve', 'list_by_estado', 'estado', 'directorio', 'buscar', 'miniatura']:
             return [AllowAny()]  # Público para que pacientes busquen médicos
         return [IsAuthenticated()]
     
     def list(self, request):
         """GET /api/medicos/ - Público"""
-        data = sp_medico_list()
+        data = agregar_miniaturas(sp_medico_list(), request)
         return Response(data, status=status.HTTP_200_OK)
     
     def retrieve(self, request, pk=None):
@@ -54,6 +68,7 @@ class MedicoViewSet(viewsets.ViewSet):
                 {"detail": "Médico no encontrado."},
                 status=status.HTTP_404_NOT_FOUND
             )
+        medico = agregar_miniaturas([medico], request)[0]
         return Response(medico, status=status.HTTP_200_OK)
     
     def update(self, request, pk=None):
@@ -96,13 +111,85 @@ class MedicoViewSet(viewsets.ViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
+        # Regenerar miniaturas solo si cambió el contenido de la foto
+        miniaturas_actualizar(int(pk), serializer.validated_data["foto"])
+        directorio_refrescar(int(pk))
+        
         medico = sp_medico_get_by_usuario(int(pk))
+        medico = agregar_miniaturas([medico], request)[0]
         return Response(medico, status=status.HTTP_200_OK)
     
+    @action(detail=False, methods=['get'], url_path='directorio')
+    def directorio(self, request):
+        """
+        GET /api/medicos/directorio/ - Público
+        
+        Directorio de médicos aprobados, con especialidades, vereda y
+        conteo de citas en una sola fila por médico (ver MedicoDirectorio).
+        """
+        data = agregar_miniaturas(directorio_listar(), request)
+        return Response(data, status=status.HTTP_200_OK)
+    
+    @action(detail=False, methods=['get'], url_path='buscar')
+    def buscar(self, request):
+        """
+        GET /api/medicos/buscar/ - Público
+        
+        Búsqueda facetada sobre el directorio de médicos aprobados.
+        
+        Query Params:
+            especialidad: Nombre de especialidad (repetible)
+            vereda: Nombre de vereda (repetible)
+            experiencia_min / experiencia_max: Rango de años de experiencia
+            q: Texto libre (nombre, apellidos, vereda, especialidad)
+            pagina / por_pagina: Paginación (máx. 100 por página)
+        
+        Response:
+            200: {
+                "total": 42, "pagina": 1, "por_pagina": 20,
+                "resultados": [...],
+                "facetas": {"especialidad": {...}, "vereda": {...}, "experiencia": {...}}
+            }
+        """
+        params = {
+            key: request.query_params.getlist(key)
+            if key in ('especialidad', 'vereda')
+            else request.query_params.get(key)
+            for key in request.query_params
+        }
+        serializer = BusquedaMedicoSerializer(data=params)
+        serializer.is_valid(raise_exception=True)
+        
+        data = obtener_indice().buscar(**serializer.validated_data)
+        data["resultados"] = agregar_miniaturas(data["resultados"], request)
+        return Response(data, status=status.HTTP_200_OK)
+    
+    @action(detail=False, methods=['get'], url_path=r'miniaturas/(?P<nombre>[^/]+)')
+    def miniatura(self, request, nombre=None):
+        """
+        GET /api/medicos/miniaturas/:nombre/ - Público
+        
+        Sirve una miniatura de foto. El nombre incluye el hash del contenido,
+        así que la respuesta nunca cambia y se cachea como inmutable.
+        """
+        from documentos.almacenamiento import respuesta_archivo
+        
+        if not PATRON_MINIATURA.match(nombre or ''):
+            raise Http404
+        ruta = carpeta_miniaturas() / nombre
+        if not ruta.is_file():
+            raise Http404
+        
+        content_type = 'image/webp' if nombre.endswith('.webp') else 'image/jpeg'
+        # Por bloques; bajo ASGI con iterador asíncrono (no se lee completo)
+        response = respuesta_archivo(request, ruta, content_type)
+        response['Cache-Control'] = CACHE_INMUTABLE
+        return response
+    
     @action(detail=False, methods=['get'], url_path='listar-estado/(?P<estado>[^/.]+)')
     def list_by_estado(self, request, estado=None):
         """GET /api/medicos/listar-estado/:estado/ - Público"""
-        data = sp_medico_list_by_estado(estado)
+        data = agregar_miniaturas(sp_medico_list_by_estado(estado), request)
         return Response(data, status=status.HTTP_200_OK)
     
     @action(detail=True, methods=['get'], url_path='estado')
@@ -0,0 +1,350 @@
+"""
+Entrega de notificaciones a pasarelas externas (SMS, email, WhatsApp)
+
+Flujo:
+1. Las vistas de citas llaman encolar_evento_cita() después de que el SP
+   tuvo éxito: se inserta un MensajeSaliente por destinatario y canal
+   (bandeja de salida en la BD, sobrevive a reinicios).
+2. El comando despachar_notificaciones corre uno o varios procesos que:
+   - reclaman lotes con SELECT ... FOR UPDATE SKIP LOCKED (cada proceso
+     recibe mensajes distintos) y los marcan Enviando con una reserva
+     que vence (si el proceso muere, otro los retoma)
+   - respetan un límite de mensajes por segundo por canal (token bucket,
+     repartido entre los procesos)
+   - entregan por lotes con el transporte configurado (transportes.py)
+   - reintentan con espera exponencial; tras MAX_INTENTOS → Fallido
+"""
+
+import logging
+import random
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import DatabaseError, close_old_connections, connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import MensajeSaliente
+from .transportes import ErrorTransporte, cargar_transporte
+
+
+logger = logging.getLogger(__name__)
+
+# Canales usados para cada destinatario (si tiene el dato de contacto)
+CANALES = getattr(settings, "NOTIFICACIONES_CANALES", ["sms", "email"])
+
+# Mensajes por segundo por canal, en total para todos los procesos
+LIMITES = getattr(settings, "NOTIFICACIONES_LIMITES", {
+    "sms": 5,
+    "whatsapp": 10,
+    "email": 20,
+})
+
+MAX_INTENTOS = 6
+ESPERA_BASE_SEGUNDOS = 30
+ESPERA_MAXIMA_SEGUNDOS = 6 * 60 * 60
+RESERVA_SEGUNDOS = 300
+
+# Dato de contacto de cada canal
+CAMPO_DESTINO = {
+    "sms": "telefono",
+    "whatsapp": "telefono",
+    "email": "correo",
+}
+
+# evento → {destinatario: (asunto, plantilla)}
+PLANTILLAS = {
+    "cita_creada": {
+        "paciente": (
+            "Cita solicitada",
+            "Hola {paciente}, tu cita con {medico} para el {fecha} a las {hora} "
+            "fue registrada y espera confirmación.",
+        ),
+        "medico": (
+            "Nueva solicitud de cita",
+            "{paciente_completo} solicitó una cita para el {fecha} a las {hora}.",
+        ),
+    },
+    "cita_aceptada": {
+        "paciente": (
+            "Cita confirmada",
+            "Hola {paciente}, {medico} confirmó tu cita del {fecha} a las {hora}.",
+        ),
+    },
+    "cita_cancelada": {
+        "paciente": (
+            "Cita cancelada",
+            "Hola {paciente}, tu cita del {fecha} a las {hora} con {medico} fue cancelada.",
+        ),
+        "medico": (
+            "Cita cancelada",
+            "La cita de {paciente_completo} del {fecha} a las {hora} fue cancelada.",
+        ),
+    },
+    "cita_completada": {
+        "paciente": (
+            "Consulta finalizada",
+            "Hola {paciente}, tu consulta con {medico} fue registrada como completada.",
+        ),
+    },
+    "recordatorio_24h": {
+        "paciente": (
+            "Recordatorio de cita",
+            "Hola {paciente}, mañana {fecha} a las {hora} tienes cita con {medico}.",
+        ),
+        "medico": (
+            "Recordatorio de cita",
+            "Mañana {fecha} a las {hora} atiendes a {paciente_completo}.",
+        ),
+    },
+    "recordatorio_1h": {
+        "paciente": (
+            "Tu cita es en una hora",
+            "Hola {paciente}, tu cita con {medico} es hoy a las {hora}.",
+        ),
+        "medico": (
+            "Cita en una hora",
+            "Hoy a las {hora} atiendes a {paciente_completo}.",
+        ),
+    },
+}
+
+
+# =============================================================================
+# ENCOLAR
+# =============================================================================
+
+def datos_citas(ids_cita):
+    """
+    Fecha, hora y contacto de paciente y médico de varias citas (una consulta).
+
+    Returns:
+        dict: id_cita → {"fecha", "hora", "paciente": {...}, "medico": {...}}
+    """
+    ids_cita = list(ids_cita)
+    if not ids_cita:
+        return {}
+    marcadores = ", ".join(["%s"] * len(ids_cita))
+    sql = f"""
+        SELECT c.ID_Cita, a.Fecha, a.Hora,
+               up.ID_Usuario, up.Nombre, up.Apellidos, up.Telefono, up.Correo,
+               um.ID_Usuario, um.Nombre, um.Apellidos, um.Telefono, um.Correo
+        FROM cita c
+        JOIN paciente p ON p.ID_Paciente = c.ID_Paciente
+        JOIN usuario up ON up.ID_Usuario = p.ID_Usuario
+        JOIN medico m ON m.ID_Medico = c.ID_Medico
+        JOIN usuario um ON um.ID_Usuario = m.ID_Usuario
+        LEFT JOIN Agenda a ON a.ID_Agenda = c.ID_Agenda
+        WHERE c.ID_Cita IN ({marcadores})
+    """
+
+    def persona(r):
+        return {
+            "id_usuario": r[0],
+            "nombre": r[1] or "",
+            "apellidos": r[2] or "",
+            "telefono": r[3],
+            "correo": r[4],
+        }
+
+    with connection.cursor() as cursor:
+        cursor.execute(sql, ids_cita)
+        return {
+            r[0]: {"fecha": r[1], "hora": r[2], "paciente": persona(r[3:8]), "medico": persona(r[8:13])}
+            for r in cursor.fetchall()
+        }
+
+
+def mensajes_para_cita(id_cita, datos, evento, cuando=None):
+    """Construye (sin guardar) los MensajeSaliente de un evento de cita."""
+    paciente, medico = datos["paciente"], datos["medico"]
+    contexto = {
+        "paciente": paciente["nombre"],
+        "paciente_completo": f"{paciente['nombre']} {paciente['apellidos']}".strip(),
+        "medico": f"Dr(a). {medico['nombre']} {medico['apellidos']}".strip(),
+        "fecha": datos["fecha"].strftime("%d/%m/%Y") if datos["fecha"] else "",
+        "hora": datos["hora"].strftime("%H:%M") if datos["hora"] else "",
+    }
+    cuando = cuando or timezone.now()
+
+    mensajes = []
+    for rol, (asunto, plantilla) in PLANTILLAS[evento].items():
+        persona = datos[rol]
+        for canal in CANALES:
+            destino = persona.get(CAMPO_DESTINO[canal])
+            if not destino:
+                continue
+            mensajes.append(MensajeSaliente(
+                id_usuario=persona["id_usuario"],
+                canal=canal,
+                destino=destino,
+                evento=evento,
+                id_cita=id_cita,
+                asunto=asunto,
+                cuerpo=plantilla.format(**contexto),
+                proximo_intento=cuando,
+            ))
+    return mensajes
+
+
+def encolar_evento_cita(id_cita, evento):
+    """
+    Inserta en la bandeja de salida los mensajes de un cambio de cita.
+
+    No lanza excepciones: un fallo aquí no debe deshacer la operación de
+    la cita que ya hizo el SP (se registra en el log).
+
+    Returns:
+        int: Mensajes encolados
+    """
+    try:
+        datos = datos_citas([id_cita]).get(id_cita)
+        if datos is None:
+            return 0
+        mensajes = mensajes_para_cita(id_cita, datos, evento)
+        MensajeSaliente.objects.bulk_create(mensajes)
+        return len(mensajes)
+    except DatabaseError:
+        logger.exception("No se pudo encolar %s para la cita %s", evento, id_cita)
+        return 0
+
+
+# =============================================================================
+# DESPACHAR
+# =============================================================================
+
+class Limitador:
+    """Token bucket: 'tasa' mensajes por segundo, ráfaga de hasta 'tasa'."""
+
+    def __init__(self, tasa):
+        self.tasa = max(float(tasa), 0.1)
+        self.capacidad = max(self.tasa, 1.0)
+        self.fichas = self.capacidad
+        self.ultimo = time.monotonic()
+
+    def tomar(self, cantidad=1):
+        """Bloquea hasta que haya 'cantidad' fichas."""
+        cantidad = min(cantidad, self.capacidad)
+        while True:
+            ahora = time.monotonic()
+            self.fichas = min(self.capacidad, self.fichas + (ahora - self.ultimo) * self.tasa)
+            self.ultimo = ahora
+            if self.fichas >= cantidad:
+                self.fichas -= cantidad
+                return
+            time.sleep((cantidad - self.fichas) / self.tasa)
+
+
+def espera_reintento(intentos):
+    """Espera exponencial con jitter: 30 s, 60 s, 120 s, ... (máx. 6 h)."""
+    espera = min(ESPERA_BASE_SEGUNDOS * 2 ** (intentos - 1), ESPERA_MAXIMA_SEGUNDOS)
+    return timedelta(seconds=espera * random.uniform(0.8, 1.2))
+
+
+def reclamar_lote(lote=100, reserva_segundos=RESERVA_SEGUNDOS):
+    """
+    Reserva hasta 'lote' mensajes listos para enviar.
+
+    Incluye mensajes Enviando cuya reserva venció (worker caído).
+    """
+    ahora = timezone.now()
+    with transaction.atomic():
+        ids = list(
+            MensajeSaliente.objects.select_for_update(skip_locked=True)
+            .filter(
+                Q(estado=MensajeSaliente.PENDIENTE, proximo_intento__lte=ahora)
+                | Q(estado=MensajeSaliente.ENVIANDO, bloqueado_hasta__lt=ahora)
+            )
+            .order_by("proximo_intento")
+            .values_list("id_mensaje", flat=True)[:lote]
+        )
+        if not ids:
+            return []
+        MensajeSaliente.objects.filter(id_mensaje__in=ids).update(
+            estado=MensajeSaliente.ENVIANDO,
+            bloqueado_hasta=ahora + timedelta(seconds=reserva_segundos),
+        )
+    return list(MensajeSaliente.objects.filter(id_mensaje__in=ids))
+
+
+def procesar_lote(mensajes, limitadores, transportes):
+    """
+    Entrega un lote agrupado por canal y guarda el resultado de cada
+    mensaje con un solo bulk_update.
+    """
+    por_canal = {}
+    for mensaje in mensajes:
+        por_canal.setdefault(mensaje.canal, []).append(mensaje)
+
+    ahora = timezone.now
+    for canal, grupo in por_canal.items():
+        if canal not in transportes:
+            transportes[canal] = cargar_transporte(canal)
+        if canal not in limitadores:
+            limitadores[canal] = Limitador(LIMITES.get(canal, 5))
+        limitador = limitadores[canal]
+        tamano = max(int(limitador.capacidad), 1)
+
+        for inicio in range(0, len(grupo), tamano):
+            tramo = grupo[inicio:inicio + tamano]
+            limitador.tomar(len(tramo))
+            try:
+                resultados = transportes[canal].enviar(tramo)
+            except Exception as e:
+                logger.exception("Transporte %s falló con un lote", canal)
+                resultados = [ErrorTransporte(str(e))] * len(tramo)
+
+            for mensaje, error in zip(tramo, resultados):
+                mensaje.bloqueado_hasta = None
+                if error is None:
+                    mensaje.estado = MensajeSaliente.ENVIADO
+                    mensaje.enviado = ahora()
+                    continue
+                mensaje.intentos += 1
+                mensaje.ultimo_error = str(error)[:1000]
+                if getattr(error, "temporal", True) and mensaje.intentos < MAX_INTENTOS:
+                    mensaje.estado = MensajeSaliente.PENDIENTE
+                    mensaje.proximo_intento = ahora() + espera_reintento(mensaje.intentos)
+                else:
+                    mensaje.estado = MensajeSaliente.FALLIDO
+
+    MensajeSaliente.objects.bulk_update(
+        mensajes,
+        ["estado", "intentos", "proximo_intento", "bloqueado_hasta", "ultimo_error", "enviado"],
+    )
+
+
+def despachar(lote=100, una_vez=False, intervalo=2.0, divisor_tasa=1):
+    """
+    Bucle de un worker: reclama, entrega y repite.
+
+    Args:
+        una_vez: Terminar cuando no queden mensajes listos
+        divisor_tasa: Cantidad de procesos que comparten los límites
+
+    Returns:
+        int: Mensajes procesados
+    """
+    limitadores = {
+        canal: Limitador(tasa / divisor_tasa) for canal, tasa in LIMITES.items()
+    }
+    transportes = {}
+    total = 0
+    while True:
+        close_old_connections()
+        mensajes = reclamar_lote(lote)
+        if mensajes:
+            procesar_lote(mensajes, limitadores, transportes)
+            total += len(mensajes)
+            continue
+        if una_vez:
+            return total
+        time.sleep(intervalo)
+
+
+def trabajador(lote, una_vez, intervalo, divisor_tasa):
+    """Punto de entrada de cada proceso de despachar_notificaciones."""
+    import django
+    django.setup()
+    return despachar(lote, una_vez, intervalo, divisor_tasa)
@@ -0,0 +1,52 @@
+"""
+Envía los mensajes pendientes de la bandeja de salida (SMS, email, WhatsApp).
+
+Uso:
+    python manage.py despachar_notificaciones --procesos 4
+    python manage.py despachar_notificaciones --una-vez   # cron
+
+Cada proceso reclama lotes distintos (SKIP LOCKED); los límites por canal
+de NOTIFICACIONES_LIMITES se reparten entre los procesos.
+"""
+
+import multiprocessing
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from notificaciones import entrega
+
+
+class Command(BaseCommand):
+    help = "Despacha la bandeja de salida de notificaciones por lotes."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--procesos", type=int, default=1, help="Procesos en paralelo (1 por defecto)")
+        parser.add_argument("--lote", type=int, default=100, help="Mensajes reclamados por vuelta")
+        parser.add_argument("--intervalo", type=float, default=2.0, help="Segundos de espera si no hay mensajes")
+        parser.add_argument("--una-vez", action="store_true", help="Terminar cuando no queden mensajes listos")
+
+    def handle(self, *args, **options):
+        procesos = max(options["procesos"], 1)
+        argumentos = (options["lote"], options["una_vez"], options["intervalo"], procesos)
+
+        if procesos == 1:
+            total = entrega.despachar(*argumentos)
+            self.stdout.write(self.style.SUCCESS(f"{total} mensajes procesados."))
+            return
+
+        # Los hijos abren sus propias conexiones
+        connections.close_all()
+        hijos = [
+            multiprocessing.Process(target=entrega.trabajador, args=argumentos, daemon=False)
+            for _ in range(procesos)
+        ]
+        for hijo in hijos:
+            hijo.start()
+        try:
+            for hijo in hijos:
+                hijo.join()
+        except KeyboardInterrupt:
+            for hijo in hijos:
+                hijo.terminate()
+        self.stdout.write(self.style.SUCCESS(f"{procesos} procesos terminados."))
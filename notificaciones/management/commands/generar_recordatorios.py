@@ -0,0 +1,39 @@
+"""
+Genera los recordatorios de citas programadas (24 h y 1 h antes).
+
+Uso:
+    python manage.py generar_recordatorios            # una corrida (cron, cada 5 min)
+    python manage.py generar_recordatorios --cada 60  # proceso permanente
+
+Es idempotente: repetirlo o reiniciarlo no duplica recordatorios.
+"""
+
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from notificaciones.recordatorios import generar_recordatorios
+
+
+class Command(BaseCommand):
+    help = "Genera recordatorios de citas programadas."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--cada", type=float, default=None,
+            help="Repetir cada N segundos en lugar de una sola corrida",
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            close_old_connections()
+            inicio = time.monotonic()
+            generados = generar_recordatorios()
+            detalle = ", ".join(f"{tipo}: {total}" for tipo, total in generados.items())
+            self.stdout.write(self.style.SUCCESS(
+                f"Recordatorios generados ({detalle}) en {time.monotonic() - inicio:.2f} s."
+            ))
+            if options["cada"] is None:
+                return
+            time.sleep(options["cada"])
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.7 on 2026-10-19 13:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Notificacion',
+            fields=[
+                ('id_notificacion', models.AutoField(db_column='ID_Notificacion', primary_key=True, serialize=False)),
+                ('tipo', models.CharField(db_column='Tipo', max_length=50, null=True)),
+                ('mensaje', models.TextField(db_column='Mensaje', null=True)),
+                ('fecha_envio', models.DateTimeField(db_column='FechaEnvio', null=True)),
+                ('id_cita', models.IntegerField(db_column='ID_Cita', null=True)),
+            ],
+            options={
+                'db_table': 'notificacion',
+                'managed': False,
+            },
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.7 on 2026-10-19 13:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notificaciones', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ContadorNotificaciones',
+            fields=[
+                ('id_usuario', models.IntegerField(db_column='ID_Usuario', primary_key=True, serialize=False)),
+                ('no_leidas', models.IntegerField(db_column='NoLeidas', default=0)),
+                ('leido_hasta', models.IntegerField(db_column='LeidoHasta', default=0)),
+                ('actualizado', models.DateTimeField(auto_now=True, db_column='Actualizado')),
+            ],
+            options={
+                'db_table': 'notificacion_contador',
+            },
+        ),
+        migrations.CreateModel(
+            name='MarcaNotificaciones',
+            fields=[
+                ('clave', models.CharField(db_column='Clave', max_length=50, primary_key=True, serialize=False)),
+                ('ultimo_id', models.IntegerField(db_column='UltimoID', default=0)),
+            ],
+            options={
+                'db_table': 'notificacion_marca',
+            },
+        ),
+    ]
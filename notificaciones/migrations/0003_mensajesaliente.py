@@ -0,0 +1,37 @@
+# Generated by Django 5.2.7 on 2026-10-19 14:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notificaciones', '0002_contadornotificaciones_marcanotificaciones'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MensajeSaliente',
+            fields=[
+                ('id_mensaje', models.BigAutoField(db_column='ID_Mensaje', primary_key=True, serialize=False)),
+                ('id_usuario', models.IntegerField(db_column='ID_Usuario', db_index=True)),
+                ('canal', models.CharField(db_column='Canal', max_length=20)),
+                ('destino', models.CharField(db_column='Destino', max_length=150)),
+                ('evento', models.CharField(db_column='Evento', max_length=40)),
+                ('id_cita', models.IntegerField(db_column='ID_Cita', db_index=True, null=True)),
+                ('asunto', models.CharField(blank=True, db_column='Asunto', max_length=150)),
+                ('cuerpo', models.TextField(db_column='Cuerpo')),
+                ('estado', models.CharField(db_column='Estado', default='Pendiente', max_length=20)),
+                ('intentos', models.IntegerField(db_column='Intentos', default=0)),
+                ('proximo_intento', models.DateTimeField(db_column='ProximoIntento')),
+                ('bloqueado_hasta', models.DateTimeField(db_column='BloqueadoHasta', null=True)),
+                ('ultimo_error', models.TextField(blank=True, db_column='UltimoError')),
+                ('creado', models.DateTimeField(auto_now_add=True, db_column='Creado')),
+                ('enviado', models.DateTimeField(db_column='Enviado', null=True)),
+            ],
+            options={
+                'db_table': 'notificacion_saliente',
+                'indexes': [models.Index(fields=['estado', 'proximo_intento'], name='saliente_estado_proximo_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.7 on 2026-10-19 15:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notificaciones', '0003_mensajesaliente'),
+        ('agenda', '0002_agenda_fecha_hora_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RecordatorioCita',
+            fields=[
+                ('id_recordatorio', models.BigAutoField(db_column='ID_Recordatorio', primary_key=True, serialize=False)),
+                ('id_cita', models.IntegerField(db_column='ID_Cita')),
+                ('tipo', models.CharField(db_column='Tipo', max_length=10)),
+                ('corrida', models.CharField(db_column='Corrida', max_length=32)),
+                ('creado', models.DateTimeField(auto_now_add=True, db_column='Creado')),
+            ],
+            options={
+                'db_table': 'notificacion_recordatorio',
+                'indexes': [models.Index(fields=['corrida'], name='recordatorio_corrida_idx')],
+                'constraints': [models.UniqueConstraint(fields=('id_cita', 'tipo'), name='recordatorio_cita_tipo_uniq')],
+            },
+        ),
+    ]
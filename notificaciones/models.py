@@ -1,3 +1,117 @@
 from django.db import models
 
-# Create your models here.
+
+class Notificacion(models.Model):
+    id_notificacion = models.AutoField(db_column='ID_Notificacion', primary_key=True)
+    tipo = models.CharField(db_column='Tipo', max_length=50, null=True)
+    mensaje = models.TextField(db_column='Mensaje', null=True)
+    fecha_envio = models.DateTimeField(db_column='FechaEnvio', null=True)
+    id_cita = models.IntegerField(db_column='ID_Cita', null=True)
+
+    class Meta:
+        managed = False
+        db_table = 'notificacion'
+
+
+class ContadorNotificaciones(models.Model):
+    """
+    No leídas por usuario (para el badge de la barra de navegación).
+
+    Tabla gestionada por Django. 'leido_hasta' es el ID_Notificacion más
+    alto que el usuario marcó como leído: todo lo que está por debajo se
+    considera leído. 'no_leidas' se incrementa desde
+    services.contadores_actualizar, que recorre solo las notificaciones
+    nuevas desde la última marca global.
+    """
+    id_usuario = models.IntegerField(db_column='ID_Usuario', primary_key=True)
+    no_leidas = models.IntegerField(db_column='NoLeidas', default=0)
+    leido_hasta = models.IntegerField(db_column='LeidoHasta', default=0)
+    actualizado = models.DateTimeField(db_column='Actualizado', auto_now=True)
+
+    class Meta:
+        db_table = 'notificacion_contador'
+
+
+class MarcaNotificaciones(models.Model):
+    """
+    Último ID_Notificacion procesado por cada consumidor incremental
+    (p. ej. 'contadores'). Se bloquea con SELECT ... FOR UPDATE para que
+    dos procesos no cuenten la misma notificación.
+    """
+    clave = models.CharField(db_column='Clave', max_length=50, primary_key=True)
+    ultimo_id = models.IntegerField(db_column='UltimoID', default=0)
+
+    class Meta:
+        db_table = 'notificacion_marca'
+
+
+class MensajeSaliente(models.Model):
+    """
+    Bandeja de salida (outbox) de mensajes a pasarelas externas.
+
+    Tabla gestionada por Django. Las vistas de citas insertan aquí un
+    mensaje por destinatario y canal (entrega.encolar_evento_cita); el
+    comando despachar_notificaciones los envía por lotes con reintentos.
+
+    Estados:
+    - Pendiente: listo para enviar cuando llegue 'proximo_intento'
+    - Enviando: reservado por un worker hasta 'bloqueado_hasta'
+    - Enviado / Fallido: final
+    """
+    PENDIENTE = 'Pendiente'
+    ENVIANDO = 'Enviando'
+    ENVIADO = 'Enviado'
+    FALLIDO = 'Fallido'
+
+    id_mensaje = models.BigAutoField(db_column='ID_Mensaje', primary_key=True)
+    id_usuario = models.IntegerField(db_column='ID_Usuario', db_index=True)
+    canal = models.CharField(db_column='Canal', max_length=20)
+    destino = models.CharField(db_column='Destino', max_length=150)
+    evento = models.CharField(db_column='Evento', max_length=40)
+    id_cita = models.IntegerField(db_column='ID_Cita', null=True, db_index=True)
+    asunto = models.CharField(db_column='Asunto', max_length=150, blank=True)
+    cuerpo = models.TextField(db_column='Cuerpo')
+    estado = models.CharField(db_column='Estado', max_length=20, default=PENDIENTE)
+    intentos = models.IntegerField(db_column='Intentos', default=0)
+    proximo_intento = models.DateTimeField(db_column='ProximoIntento')
+    bloqueado_hasta = models.DateTimeField(db_column='BloqueadoHasta', null=True)
+    ultimo_error = models.TextField(db_column='UltimoError', blank=True)
+    creado = models.DateTimeField(db_column='Creado', auto_now_add=True)
+    enviado = models.DateTimeField(db_column='Enviado', null=True)
+
+    class Meta:
+        db_table = 'notificacion_saliente'
+        indexes = [
+            models.Index(
+                fields=['estado', 'proximo_intento'],
+                name='saliente_estado_proximo_idx',
+            ),
+        ]
+
+
+class RecordatorioCita(models.Model):
+    """
+    Recordatorios ya generados (uno por cita y tipo: '24h', '1h').
+
+    Tabla gestionada por Django. La restricción única hace idempotente a
+    generar_recordatorios: se inserta con ignore_conflicts y solo se
+    notifican las filas que quedaron con la 'corrida' propia, así dos
+    ejecuciones simultáneas o un reinicio no duplican avisos.
+    """
+    id_recordatorio = models.BigAutoField(db_column='ID_Recordatorio', primary_key=True)
+    id_cita = models.IntegerField(db_column='ID_Cita')
+    tipo = models.CharField(db_column='Tipo', max_length=10)
+    corrida = models.CharField(db_column='Corrida', max_length=32)
+    creado = models.DateTimeField(db_column='Creado', auto_now_add=True)
+
+    class Meta:
+        db_table = 'notificacion_recordatorio'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['id_cita', 'tipo'],
+                name='recordatorio_cita_tipo_uniq',
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['corrida'], name='recordatorio_corrida_idx'),
+        ]
@@ -0,0 +1,133 @@
+"""
+Recordatorios de citas programadas - Salud Rural
+
+generar_recordatorios() busca las citas 'Programada' que empiezan dentro de
+la ventana de cada recordatorio y crea, por lotes:
+- una fila en notificacion (Tipo 'Recordatorio'), visible en la app y en
+  el stream SSE
+- los mensajes de la bandeja de salida (SMS/email) vía entrega.py
+
+Ventanas (sin solaparse, para no mandar dos avisos seguidos):
+- '24h': la cita empieza entre 1 h y 24 h desde ahora
+- '1h':  la cita empieza dentro de la próxima hora
+
+La búsqueda parte del índice Agenda(Fecha, Hora) (rango de a lo sumo dos
+fechas) y descarta con NOT EXISTS las citas que ya tienen recordatorio,
+así cada corrida solo toca las citas próximas y no toda la tabla. Si el
+proceso estuvo detenido, la siguiente corrida recupera lo pendiente
+mientras la cita no haya empezado.
+"""
+
+import uuid
+from datetime import timedelta
+
+from django.db import connection, transaction
+from django.utils import timezone
+
+from .entrega import datos_citas, mensajes_para_cita
+from .models import MensajeSaliente, Notificacion, RecordatorioCita
+
+
+# tipo → anticipación, de mayor a menor
+RECORDATORIOS = {
+    "24h": timedelta(hours=24),
+    "1h": timedelta(hours=1),
+}
+
+MENSAJE = "Recordatorio: tienes una cita el {fecha} a las {hora}."
+
+LOTE = 1000
+
+SQL_CANDIDATAS = """
+    SELECT c.ID_Cita
+    FROM Agenda a
+    JOIN cita c ON c.ID_Agenda = a.ID_Agenda
+    WHERE a.Fecha BETWEEN %s AND %s
+      AND TIMESTAMP(a.Fecha, a.Hora) > %s
+      AND TIMESTAMP(a.Fecha, a.Hora) <= %s
+      AND c.Estado = 'Programada'
+      AND NOT EXISTS (
+          SELECT 1 FROM notificacion_recordatorio r
+          WHERE r.ID_Cita = c.ID_Cita AND r.Tipo = %s
+      )
+    ORDER BY a.Fecha, a.Hora
+"""
+
+
+def ventanas(ahora):
+    """
+    (tipo, desde, hasta) de cada recordatorio, en hora local sin zona
+    (Agenda guarda Fecha y Hora sin zona horaria).
+    """
+    base = timezone.localtime(ahora).replace(tzinfo=None)
+    anticipaciones = list(RECORDATORIOS.items())
+    resultado = []
+    for i, (tipo, anticipacion) in enumerate(anticipaciones):
+        siguiente = anticipaciones[i + 1][1] if i + 1 < len(anticipaciones) else timedelta(0)
+        resultado.append((tipo, base + siguiente, base + anticipacion))
+    return resultado
+
+
+def citas_en_ventana(tipo, desde, hasta):
+    """IDs de citas programadas que empiezan en (desde, hasta] sin recordatorio 'tipo'."""
+    with connection.cursor() as cursor:
+        cursor.execute(SQL_CANDIDATAS, [desde.date(), hasta.date(), desde, hasta, tipo])
+        return [r[0] for r in cursor.fetchall()]
+
+
+def _registrar_lote(tipo, ids_cita, ahora):
+    """
+    Reserva y notifica un lote de citas en una transacción.
+
+    Solo se notifican las citas cuya fila de recordatorio insertó esta
+    corrida; si otra ejecución ganó alguna, el ignore_conflicts la deja
+    con la corrida ajena y aquí se omite.
+    """
+    corrida = uuid.uuid4().hex
+    evento = f"recordatorio_{tipo}"
+    with transaction.atomic():
+        RecordatorioCita.objects.bulk_create(
+            [RecordatorioCita(id_cita=id_cita, tipo=tipo, corrida=corrida) for id_cita in ids_cita],
+            ignore_conflicts=True,
+        )
+        propias = list(
+            RecordatorioCita.objects.filter(corrida=corrida).values_list("id_cita", flat=True)
+        )
+        datos = datos_citas(propias)
+
+        notificaciones = []
+        mensajes = []
+        for id_cita, dato in datos.items():
+            notificaciones.append(Notificacion(
+                tipo="Recordatorio",
+                mensaje=MENSAJE.format(
+                    fecha=dato["fecha"].strftime("%d/%m/%Y"),
+                    hora=dato["hora"].strftime("%H:%M"),
+                ),
+                fecha_envio=ahora,
+                id_cita=id_cita,
+            ))
+            mensajes.extend(mensajes_para_cita(id_cita, dato, evento, cuando=ahora))
+
+        Notificacion.objects.bulk_create(notificaciones, batch_size=LOTE)
+        MensajeSaliente.objects.bulk_create(mensajes, batch_size=LOTE)
+    return len(notificaciones)
+
+
+def generar_recordatorios(ahora=None, lote=LOTE):
+    """
+    Genera los recordatorios pendientes. Se puede correr cuantas veces se
+    quiera: cada cita recibe a lo sumo un recordatorio de cada tipo.
+
+    Returns:
+        dict: tipo → recordatorios generados en esta corrida
+    """
+    ahora = ahora or timezone.now()
+    generados = {}
+    for tipo, desde, hasta in ventanas(ahora):
+        ids_cita = citas_en_ventana(tipo, desde, hasta)
+        generados[tipo] = sum(
+            _registrar_lote(tipo, ids_cita[i:i + lote], ahora)
+            for i in range(0, len(ids_cita), lote)
+        )
+    return generados
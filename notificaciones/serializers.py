@@ -0,0 +1,11 @@
+from rest_framework import serializers
+
+
+class NotificacionesQuerySerializer(serializers.Serializer):
+    after_id = serializers.IntegerField(min_value=0, required=False)
+    antes_de = serializers.IntegerField(min_value=1, required=False)
+    limite = serializers.IntegerField(min_value=1, max_value=200, default=50)
+
+
+class MarcarLeidasSerializer(serializers.Serializer):
+    hasta_id = serializers.IntegerField(min_value=0, required=False)
@@ -1,4 +1,9 @@
-from django.db import connection, DatabaseError
+from collections import Counter
+
+from django.db import connection, transaction, DatabaseError
+from django.db.models import F
+
+from .models import ContadorNotificaciones, MarcaNotificaciones
 
 
 def sp_notificacion_list_paciente(id_usuario_paciente: int):
@@ -35,3 +40,223 @@ def sp_notificacion_list_medico(id_usuario_medico: int):
             }
             for r in rows
         ]
+
+
+# =============================================================================
+# CONSULTAS INCREMENTALES (por llave primaria, sin recorrer el historial)
+# =============================================================================
+
+# Notificación + destinatarios (paciente y médico de la cita)
+SQL_NOTIFICACIONES = """
+    SELECT n.ID_Notificacion, n.Tipo, n.Mensaje, n.FechaEnvio, n.ID_Cita,
+           a.Fecha, a.Hora, p.ID_Usuario, m.ID_Usuario
+    FROM notificacion n
+    JOIN cita c ON c.ID_Cita = n.ID_Cita
+    JOIN paciente p ON p.ID_Paciente = c.ID_Paciente
+    JOIN medico m ON m.ID_Medico = c.ID_Medico
+    LEFT JOIN Agenda a ON a.ID_Agenda = c.ID_Agenda
+"""
+
+COLUMNA_USUARIO = {
+    "Paciente": "p.ID_Usuario",
+    "Medico": "m.ID_Usuario",
+}
+
+
+def _notificacion(r):
+    """Mismo formato que sp_notificacion_list_*."""
+    return {
+        "id_notificacion": r[0],
+        "tipo": r[1],
+        "mensaje": r[2],
+        "fecha_envio": r[3],
+        "id_cita": r[4],
+        "fecha_cita": r[5],
+        "hora_cita": r[6],
+    }
+
+
+def notificacion_ultimo_id():
+    """ID_Notificacion más alto (0 si no hay ninguna)."""
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT COALESCE(MAX(ID_Notificacion), 0) FROM notificacion")
+        return cursor.fetchone()[0]
+
+
+def notificaciones_nuevas(despues_de, limite=500, hasta=None):
+    """
+    Notificaciones con ID > despues_de (y <= hasta), con sus destinatarios.
+
+    Returns:
+        list: [(notificacion, id_usuario_paciente, id_usuario_medico), ...]
+    """
+    sql = SQL_NOTIFICACIONES + " WHERE n.ID_Notificacion > %s"
+    params = [despues_de]
+    if hasta is not None:
+        sql += " AND n.ID_Notificacion <= %s"
+        params.append(hasta)
+    sql += " ORDER BY n.ID_Notificacion LIMIT %s"
+    params.append(limite)
+
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return [(_notificacion(r), r[7], r[8]) for r in cursor.fetchall()]
+
+
+def notificaciones_usuario(id_usuario, rol, despues_de=None, antes_de=None, limite=50):
+    """
+    Notificaciones de un usuario, por rangos de ID.
+
+    - despues_de: solo las más nuevas que ese ID, en orden ascendente
+      (carga incremental: "¿qué llegó desde la última vez?")
+    - Si no: las más recientes primero, opcionalmente antes de 'antes_de'
+      (paginación hacia atrás)
+
+    Args:
+        rol: 'Paciente' o 'Medico'
+    """
+    sql = SQL_NOTIFICACIONES + f" WHERE {COLUMNA_USUARIO[rol]} = %s"
+    params = [id_usuario]
+    if despues_de is not None:
+        sql += " AND n.ID_Notificacion > %s ORDER BY n.ID_Notificacion"
+        params.append(despues_de)
+    else:
+        if antes_de is not None:
+            sql += " AND n.ID_Notificacion < %s"
+            params.append(antes_de)
+        sql += " ORDER BY n.ID_Notificacion DESC"
+    sql += " LIMIT %s"
+    params.append(limite)
+
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return [_notificacion(r) for r in cursor.fetchall()]
+
+
+# =============================================================================
+# CONTADORES DE NO LEÍDAS
+# =============================================================================
+
+MARCA_CONTADORES = "contadores"
+
+
+def _marca_bloqueada():
+    """Fila de la marca global, bloqueada hasta el fin de la transacción."""
+    marca, _ = MarcaNotificaciones.objects.select_for_update().get_or_create(
+        clave=MARCA_CONTADORES,
+        defaults={"ultimo_id": notificacion_ultimo_id()},
+    )
+    return marca
+
+
+def contadores_actualizar(lote=1000):
+    """
+    Suma a los contadores las notificaciones creadas desde la última marca.
+
+    Una consulta por rango de llave primaria (normalmente vacía) y un
+    UPDATE por cada cantidad distinta de notificaciones nuevas. Los
+    usuarios sin fila se cuentan completos la primera vez que se consultan
+    (contador_obtener).
+
+    Returns:
+        int: Notificaciones procesadas
+    """
+    # Sin bloquear: si no hay nada nuevo (lo normal) termina aquí
+    actual = (
+        MarcaNotificaciones.objects.filter(clave=MARCA_CONTADORES)
+        .values_list("ultimo_id", flat=True)
+        .first()
+    )
+    if actual is not None and notificacion_ultimo_id() <= actual:
+        return 0
+
+    procesadas = 0
+    with transaction.atomic():
+        marca = _marca_bloqueada()
+        while True:
+            nuevas = notificaciones_nuevas(marca.ultimo_id, limite=lote)
+            if not nuevas:
+                break
+
+            incrementos = Counter()
+            for notificacion, id_usuario_paciente, id_usuario_medico in nuevas:
+                incrementos[id_usuario_paciente] += 1
+                incrementos[id_usuario_medico] += 1
+
+            por_cantidad = {}
+            for id_usuario, cantidad in incrementos.items():
+                por_cantidad.setdefault(cantidad, []).append(id_usuario)
+            for cantidad, usuarios in por_cantidad.items():
+                ContadorNotificaciones.objects.filter(
+                    id_usuario__in=usuarios
+                ).update(no_leidas=F("no_leidas") + cantidad)
+
+            marca.ultimo_id = nuevas[-1][0]["id_notificacion"]
+            procesadas += len(nuevas)
+            if len(nuevas) < lote:
+                break
+        marca.save(update_fields=["ultimo_id"])
+    return procesadas
+
+
+def _contar_no_leidas(id_usuario, rol, leido_hasta, hasta):
+    sql = (
+        "SELECT COUNT(*) FROM notificacion n"
+        " JOIN cita c ON c.ID_Cita = n.ID_Cita"
+        " JOIN paciente p ON p.ID_Paciente = c.ID_Paciente"
+        " JOIN medico m ON m.ID_Medico = c.ID_Medico"
+        f" WHERE {COLUMNA_USUARIO[rol]} = %s"
+        " AND n.ID_Notificacion > %s AND n.ID_Notificacion <= %s"
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [id_usuario, leido_hasta, hasta])
+        return cursor.fetchone()[0]
+
+
+def contador_obtener(id_usuario, rol):
+    """
+    Contador de no leídas del usuario, al día.
+
+    Primero aplica las notificaciones nuevas (contadores_actualizar) y
+    luego lee una fila por llave. Si el usuario no tenía fila, se calcula
+    una sola vez con la marca bloqueada para no perder ni duplicar nada.
+    """
+    contadores_actualizar()
+
+    contador = ContadorNotificaciones.objects.filter(id_usuario=id_usuario).first()
+    if contador is not None:
+        return contador
+
+    with transaction.atomic():
+        marca = _marca_bloqueada()
+        contador, creado = ContadorNotificaciones.objects.get_or_create(
+            id_usuario=id_usuario
+        )
+        if creado:
+            contador.no_leidas = _contar_no_leidas(id_usuario, rol, 0, marca.ultimo_id)
+            contador.save(update_fields=["no_leidas", "actualizado"])
+    return contador
+
+
+def contador_marcar_leidas(id_usuario, rol, hasta_id=None):
+    """
+    Marca como leídas las notificaciones hasta 'hasta_id' (todas si None).
+
+    Returns:
+        ContadorNotificaciones: Contador actualizado
+    """
+    contador_obtener(id_usuario, rol)
+
+    with transaction.atomic():
+        marca = _marca_bloqueada()
+        contador = ContadorNotificaciones.objects.select_for_update().get(
+            id_usuario=id_usuario
+        )
+        limite = marca.ultimo_id if hasta_id is None else min(hasta_id, marca.ultimo_id)
+        if limite > contador.leido_hasta:
+            contador.leido_hasta = limite
+            contador.no_leidas = _contar_no_leidas(
+                id_usuario, rol, limite, marca.ultimo_id
+            )
+            contador.save(update_fields=["leido_hasta", "no_leidas", "actualizado"])
+    return contador
@@ -0,0 +1,133 @@
+"""
+Notificaciones en tiempo real (SSE) - Salud Rural
+
+Las notificaciones las crean triggers de MySQL, así que Python no se entera
+cuando aparece una. En lugar de que cada cliente consulte su historial
+completo cada pocos segundos, cada proceso ASGI tiene un único
+CentroNotificaciones que:
+
+- Consulta solo las filas nuevas (ID_Notificacion > último visto, por llave
+  primaria) una vez por intervalo, sin importar cuántos clientes haya.
+- Reparte cada notificación a las colas de los usuarios conectados
+  (paciente y médico de la cita).
+- Se detiene solo cuando no queda nadie conectado.
+
+Un cliente inactivo cuesta un socket abierto y una cola en memoria, no una
+consulta.
+"""
+
+import asyncio
+import logging
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import close_old_connections
+
+from .services import notificacion_ultimo_id, notificaciones_nuevas, notificaciones_usuario
+
+
+logger = logging.getLogger(__name__)
+
+INTERVALO = getattr(settings, "NOTIFICACIONES_SSE_INTERVALO", 2.0)
+
+# Máximo de notificaciones por consulta (nuevas o de reanudación)
+LOTE = 200
+
+# Si un cliente lento acumula más que esto, se le cierra el stream y al
+# reconectar recupera lo pendiente con Last-Event-ID
+COLA_MAXIMA = 100
+
+
+def _sin_conexiones_viejas(funcion):
+    """Las consultas corren en el hilo de sync_to_async, fuera de una petición."""
+    def envoltura(*args, **kwargs):
+        close_old_connections()
+        return funcion(*args, **kwargs)
+    return envoltura
+
+
+ultimo_id = _sin_conexiones_viejas(notificacion_ultimo_id)
+leer_nuevas = _sin_conexiones_viejas(notificaciones_nuevas)
+
+
+@_sin_conexiones_viejas
+def historial(id_usuario, rol, despues_de, limite=LOTE):
+    """Notificaciones de un usuario con ID > despues_de (para reanudar)."""
+    return notificaciones_usuario(id_usuario, rol, despues_de=despues_de, limite=limite)
+
+
+class CentroNotificaciones:
+    """Sondeo compartido y reparto a los clientes SSE de este proceso."""
+
+    def __init__(self, intervalo=INTERVALO):
+        self.intervalo = intervalo
+        self.suscriptores = {}
+        self.ultimo_id = 0
+        self._tarea = None
+        # Evita que dos suscripciones simultáneas arranquen dos sondeos: la
+        # consulta de la marca de agua cede el control antes de crear la tarea
+        self._arranque = asyncio.Lock()
+
+    async def suscribir(self, id_usuario):
+        """
+        Registra un cliente y devuelve su cola.
+
+        Si el sondeo no estaba corriendo, fija la marca de agua antes de
+        devolver: la reanudación que haga el cliente después (historial)
+        cubre todo lo anterior, así no queda hueco entre ambas.
+        """
+        cola = asyncio.Queue(maxsize=COLA_MAXIMA)
+        self.suscriptores.setdefault(id_usuario, set()).add(cola)
+        async with self._arranque:
+            if self._tarea is None or self._tarea.done():
+                self.ultimo_id = await sync_to_async(ultimo_id)()
+                self._tarea = asyncio.create_task(self._sondear())
+        return cola
+
+    def desuscribir(self, id_usuario, cola):
+        colas = self.suscriptores.get(id_usuario)
+        if colas is None:
+            return
+        colas.discard(cola)
+        if not colas:
+            del self.suscriptores[id_usuario]
+
+    def _entregar(self, id_usuario, fila):
+        for cola in list(self.suscriptores.get(id_usuario, ())):
+            try:
+                cola.put_nowait(fila)
+            except asyncio.QueueFull:
+                # None = cerrar el stream; el cliente reanuda desde la BD
+                self.desuscribir(id_usuario, cola)
+                cola.get_nowait()
+                cola.put_nowait(None)
+
+    async def _sondear(self):
+        while self.suscriptores:
+            try:
+                nuevas = await sync_to_async(leer_nuevas)(self.ultimo_id, LOTE)
+            except Exception:
+                logger.exception("Error consultando notificaciones nuevas")
+                nuevas = []
+
+            for fila, id_usuario_paciente, id_usuario_medico in nuevas:
+                self.ultimo_id = fila["id_notificacion"]
+                self._entregar(id_usuario_paciente, fila)
+                self._entregar(id_usuario_medico, fila)
+
+            # Si llegó un lote completo hay más pendientes: seguir sin esperar
+            if len(nuevas) < LOTE:
+                await asyncio.sleep(self.intervalo)
+
+    async def detener(self):
+        if self._tarea is not None:
+            self._tarea.cancel()
+            try:
+                await self._tarea
+            except asyncio.CancelledError:
+                pass
+            self._tarea = None
+
+
+# Un centro por proceso (lo detiene el lifespan de backend/asgi.py)
+centro = CentroNotificaciones()
@@ -0,0 +1,107 @@
+"""
+Transportes de mensajes salientes - Salud Rural
+
+Un transporte entrega un lote de mensajes de un canal (sms, email,
+whatsapp) a una pasarela. Se eligen por canal en settings:
+
+    NOTIFICACIONES_TRANSPORTES = {
+        "sms": "notificaciones.transportes.TransporteConsola",
+        "email": "notificaciones.transportes.TransporteArchivo",
+    }
+
+Para una pasarela real basta una clase con el mismo método enviar().
+Los de consola y archivo sirven para desarrollo y pruebas.
+"""
+
+import json
+import threading
+from pathlib import Path
+
+from django.conf import settings
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+
+class ErrorTransporte(Exception):
+    """
+    Fallo al entregar un mensaje.
+
+    temporal=True: se reintenta con espera exponencial (pasarela caída,
+    límite de la pasarela). temporal=False: destino inválido, no reintentar.
+    """
+
+    def __init__(self, mensaje, temporal=True):
+        super().__init__(mensaje)
+        self.temporal = temporal
+
+
+class Transporte:
+    """Interfaz: enviar() devuelve un resultado por mensaje, en orden."""
+
+    def __init__(self, canal, **opciones):
+        self.canal = canal
+        self.opciones = opciones
+
+    def enviar(self, mensajes):
+        """
+        Args:
+            mensajes: MensajeSaliente del mismo canal
+
+        Returns:
+            list: None si se entregó, o ErrorTransporte si falló
+        """
+        raise NotImplementedError
+
+
+class TransporteConsola(Transporte):
+    """Escribe cada mensaje en la salida estándar."""
+
+    def enviar(self, mensajes):
+        for mensaje in mensajes:
+            print(f"[{self.canal}] → {mensaje.destino}: {mensaje.asunto or ''} {mensaje.cuerpo}")
+        return [None] * len(mensajes)
+
+
+class TransporteArchivo(Transporte):
+    """
+    Agrega cada mensaje como una línea JSON a un archivo por canal
+    (NOTIFICACIONES_CARPETA_SALIDA/<canal>.jsonl).
+    """
+
+    _lock = threading.Lock()
+
+    def enviar(self, mensajes):
+        carpeta = Path(
+            self.opciones.get("carpeta")
+            or getattr(settings, "NOTIFICACIONES_CARPETA_SALIDA", settings.BASE_DIR / "salida")
+        )
+        carpeta.mkdir(parents=True, exist_ok=True)
+        lineas = [
+            json.dumps({
+                "id_mensaje": mensaje.id_mensaje,
+                "canal": self.canal,
+                "destino": mensaje.destino,
+                "asunto": mensaje.asunto,
+                "cuerpo": mensaje.cuerpo,
+                "enviado": timezone.now().isoformat(),
+            }, ensure_ascii=False)
+            for mensaje in mensajes
+        ]
+        with self._lock, open(carpeta / f"{self.canal}.jsonl", "a", encoding="utf-8") as salida:
+            salida.write("\n".join(lineas) + "\n")
+        return [None] * len(mensajes)
+
+
+TRANSPORTE_POR_DEFECTO = "notificaciones.transportes.TransporteConsola"
+
+
+def cargar_transporte(canal):
+    """Instancia el transporte configurado para el canal."""
+    configuracion = getattr(settings, "NOTIFICACIONES_TRANSPORTES", {}).get(
+        canal, TRANSPORTE_POR_DEFECTO
+    )
+    opciones = {}
+    if isinstance(configuracion, dict):
+        opciones = dict(configuracion)
+        configuracion = opciones.pop("clase")
+    return import_string(configuracion)(canal, **opciones)
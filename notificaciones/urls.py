@@ -1,11 +1,26 @@
 from django.urls import path
 from rest_framework.routers import DefaultRouter
-from .views import NotificacionViewSet
+from .views import NotificacionViewSet, stream_notificaciones
 
 router = DefaultRouter()
 # No register porque no hay CRUD principal
 
 urlpatterns = [
+    path(
+        'notificaciones/stream/',
+        stream_notificaciones,
+        name='notificaciones-stream'
+    ),
+    path(
+        'notificaciones/<str:rol>/<int:pk>/contador/',
+        NotificacionViewSet.as_view({'get': 'contador'}),
+        name='notificaciones-contador'
+    ),
+    path(
+        'notificaciones/<str:rol>/<int:pk>/leer/',
+        NotificacionViewSet.as_view({'post': 'marcar_leidas'}),
+        name='notificaciones-leer'
+    ),
     path(
         'notificaciones/paciente/<int:pk>/',
         NotificacionViewSet.as_view({'get': 'list_paciente'})
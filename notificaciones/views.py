@@ -6,21 +6,39 @@ Con PERMISOS implementados para proteger privacidad.
 
 Lógica de permisos:
 - Listar notificaciones: Usuario ve solo sus propias notificaciones
+- Stream en tiempo real (SSE): Usuario recibe solo sus notificaciones
 - Crear notificaciones: Sistema automático (no hay endpoint público)
 """
 
+import asyncio
+import json
+import time
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import JsonResponse, StreamingHttpResponse
 from rest_framework import status, viewsets
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from django.db import DatabaseError
 
+from .serializers import MarcarLeidasSerializer, NotificacionesQuerySerializer
 from .services import (
     sp_notificacion_list_paciente,
-    sp_notificacion_list_medico
+    sp_notificacion_list_medico,
+    notificaciones_usuario,
+    contador_obtener,
+    contador_marcar_leidas,
 )
 
 
+# Segmento de URL → rol del usuario
+ROLES = {
+    'paciente': 'Paciente',
+    'medico': 'Medico',
+}
+
+
 class NotificacionViewSet(viewsets.ViewSet):
     """
     ViewSet para gestión de Notificaciones.
@@ -28,6 +46,12 @@ class NotificacionViewSet(viewsets.ViewSet):
     Endpoints:
     - GET /api/notificaciones/paciente/:id_usuario/  → Notificaciones del paciente
     - GET /api/notificaciones/medico/:id_usuario/    → Notificaciones del médico
+    - GET /api/notificaciones/stream/?token=...      → Stream SSE (ver stream_notificaciones)
+    - GET  /api/notificaciones/:rol/:id/contador/    → No leídas (badge)
+    - POST /api/notificaciones/:rol/:id/leer/        → Marcar como leídas
+    
+    Los listados aceptan ?after_id=, ?antes_de= y ?limite= para no traer
+    el historial completo.
     
     Permisos:
     - list_paciente/list_medico: Autenticado + ownership (solo sus notificaciones)
@@ -91,7 +115,10 @@ class NotificacionViewSet(viewsets.ViewSet):
         
         # Admin puede ver notificaciones de cualquier paciente
         try:
-            data = sp_notificacion_list_paciente(id_usuario_paciente)
+            if self._es_incremental(request):
+                data = self._listar(request, 'Paciente', id_usuario_paciente)
+            else:
+                data = sp_notificacion_list_paciente(id_usuario_paciente)
             
         except DatabaseError as e:
             msg = str(e).lower()
@@ -107,7 +134,10 @@ class NotificacionViewSet(viewsets.ViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        return Response(data, status=status.HTTP_200_OK)
+        return Response(
+            self._con_estado_leida(data, id_usuario_paciente),
+            status=status.HTTP_200_OK
+        )
     
     @action(detail=True, methods=['get'], url_path='medico')
     def list_medico(self, request, pk=None):
@@ -153,7 +183,10 @@ class NotificacionViewSet(viewsets.ViewSet):
         
         # Admin puede ver notificaciones de cualquier médico
         try:
-            data = sp_notificacion_list_medico(id_usuario_medico)
+            if self._es_incremental(request):
+                data = self._listar(request, 'Medico', id_usuario_medico)
+            else:
+                data = sp_notificacion_list_medico(id_usuario_medico)
             
         except DatabaseError as e:
             msg = str(e).lower()
@@ -169,9 +202,270 @@ class NotificacionViewSet(viewsets.ViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        return Response(data, status=status.HTTP_200_OK)
+        return Response(
+            self._con_estado_leida(data, id_usuario_medico),
+            status=status.HTTP_200_OK
+        )
+    
+    # =========================================================================
+    # LECTURA INCREMENTAL Y CONTADOR DE NO LEÍDAS
+    # =========================================================================
+    
+    def _es_incremental(self, request):
+        params = request.query_params
+        return any(p in params for p in ("after_id", "antes_de", "limite"))
+    
+    def _listar(self, request, rol, id_usuario):
+        """
+        Lectura por rango de IDs en lugar del historial completo del SP.
+        
+        Query Params:
+            after_id: Solo notificaciones más nuevas que ese ID (ascendente)
+            antes_de: Página anterior a ese ID (descendente)
+            limite: Máximo de resultados (1-200, por defecto 50)
+        """
+        serializer = NotificacionesQuerySerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+        return notificaciones_usuario(
+            id_usuario,
+            rol,
+            despues_de=data.get("after_id"),
+            antes_de=data.get("antes_de"),
+            limite=data["limite"],
+        )
+    
+    def _con_estado_leida(self, data, id_usuario):
+        """Agrega 'leida' a cada notificación (según leido_hasta del usuario)."""
+        from .models import ContadorNotificaciones
+        leido_hasta = (
+            ContadorNotificaciones.objects.filter(id_usuario=id_usuario)
+            .values_list("leido_hasta", flat=True)
+            .first()
+        ) or 0
+        for notificacion in data:
+            notificacion["leida"] = notificacion["id_notificacion"] <= leido_hasta
+        return data
+    
+    def _verificar_propietario(self, request, rol, id_usuario, permitir_admin=True):
+        """
+        Devuelve (rol del modelo, None) o (None, Response de error).
+        
+        VALIDACIÓN DE OWNERSHIP: cada usuario solo accede a sus contadores;
+        el admin puede consultarlos (no marcarlos como leídos).
+        """
+        rol = ROLES.get(rol)
+        if rol is None:
+            return None, Response(
+                {"detail": "Rol inválido. Usa 'paciente' o 'medico'."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        if permitir_admin and request.user.rol == 'Administrador':
+            return rol, None
+        
+        if request.user.rol != rol or request.user.id_usuario != id_usuario:
+            return None, Response(
+                {
+                    "detail": "No tienes permiso para ver las notificaciones de otros usuarios.",
+                    "hint": "Solo puedes ver tus propias notificaciones."
+                },
+                status=status.HTTP_403_FORBIDDEN
+            )
+        
+        return rol, None
+    
+    def contador(self, request, rol=None, pk=None):
+        """
+        GET /api/notificaciones/:rol/:id_usuario/contador/
+        
+        Cantidad de notificaciones no leídas (badge de la barra superior).
+        
+        Lee una fila por llave (notificacion_contador) después de sumar
+        solo las notificaciones nuevas desde la última vez.
+        
+        Args:
+            rol: 'paciente' o 'medico'
+            pk: ID del usuario
+        
+        Response:
+            200: {"no_leidas": 3, "leido_hasta": 120}
+            403: No es su contador
+        """
+        rol_modelo, error = self._verificar_propietario(request, rol, int(pk))
+        if error:
+            return error
+        
+        contador = contador_obtener(int(pk), rol_modelo)
+        return Response(
+            {
+                "no_leidas": contador.no_leidas,
+                "leido_hasta": contador.leido_hasta,
+            },
+            status=status.HTTP_200_OK
+        )
+    
+    def marcar_leidas(self, request, rol=None, pk=None):
+        """
+        POST /api/notificaciones/:rol/:id_usuario/leer/
+        
+        Marca como leídas las notificaciones hasta un ID (todas si se omite).
+        
+        Request Body:
+            {"hasta_id": 120}   (opcional)
+        
+        Response:
+            200: {"no_leidas": 0, "leido_hasta": 120}
+            403: No es su contador
+        """
+        rol_modelo, error = self._verificar_propietario(
+            request, rol, int(pk), permitir_admin=False
+        )
+        if error:
+            return error
+        
+        serializer = MarcarLeidasSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        
+        contador = contador_marcar_leidas(
+            int(pk), rol_modelo, serializer.validated_data.get("hasta_id")
+        )
+        return Response(
+            {
+                "no_leidas": contador.no_leidas,
+                "leido_hasta": contador.leido_hasta,
+            },
+            status=status.HTTP_200_OK
+        )
+
+
+# =============================================================================
+# STREAM EN TIEMPO REAL (Server-Sent Events)
+# =============================================================================
+
+# Comentario SSE cada tantos segundos para que proxies no cierren el socket
+LATIDO_SEGUNDOS = 20
+
+
+def _evento(fila):
+    datos = json.dumps(fila, cls=DjangoJSONEncoder)
+    return f"id: {fila['id_notificacion']}\nevent: notificacion\ndata: {datos}\n\n"
+
+
+async def _eventos(id_usuario, rol, ultimo_visto, vence):
+    """
+    Generador del stream: reanuda desde la BD y luego escucha el centro.
+    
+    Se suscribe ANTES de leer el historial para no perder lo que llegue
+    entre ambos pasos; los duplicados se descartan por ID.
+    """
+    from asgiref.sync import sync_to_async
+    from .tiempo_real import centro, historial
+    
+    cola = await centro.suscribir(id_usuario)
+    enviado = ultimo_visto or 0
+    try:
+        yield "retry: 5000\n\n"
+        
+        if ultimo_visto is not None:
+            for fila in await sync_to_async(historial)(id_usuario, rol, ultimo_visto):
+                enviado = fila["id_notificacion"]
+                yield _evento(fila)
+        
+        while True:
+            restante = vence - time.time()
+            if restante <= 0:
+                # Token vencido: el cliente reconecta con uno nuevo
+                yield "event: token_expirado\ndata: {}\n\n"
+                return
+            try:
+                fila = await asyncio.wait_for(
+                    cola.get(), timeout=min(LATIDO_SEGUNDOS, restante)
+                )
+            except asyncio.TimeoutError:
+                yield ": ping\n\n"
+                continue
+            if fila is None:
+                # Cliente demasiado lento: cerrar y que reanude con Last-Event-ID
+                return
+            if fila["id_notificacion"] <= enviado:
+                continue
+            enviado = fila["id_notificacion"]
+            yield _evento(fila)
+    finally:
+        centro.desuscribir(id_usuario, cola)
 
 
+async def stream_notificaciones(request):
+    """
+    GET /api/notificaciones/stream/?token=<access>
+    
+    Stream SSE con las notificaciones nuevas del usuario autenticado.
+    Requiere servidor ASGI (uvicorn/daphne con backend.asgi).
+    
+    Autenticación:
+        EventSource no permite headers: el access token va en ?token=
+        (también se acepta Authorization: Bearer).
+    
+    Reanudación:
+        El navegador reenvía Last-Event-ID al reconectar; también se puede
+        pasar ?last_event_id=. Se envía todo lo posterior a ese ID.
+    
+    Eventos:
+        event: notificacion   id: <ID_Notificacion>   data: {...}
+        event: token_expirado (el cliente debe reconectar con token nuevo)
+    
+    Response:
+        200: text/event-stream
+        401: Token inválido o ausente
+        403: Rol sin notificaciones (solo Paciente y Medico)
+    """
+    from rest_framework_simplejwt.exceptions import TokenError
+    from rest_framework_simplejwt.tokens import AccessToken
+    
+    token = request.GET.get("token")
+    if not token:
+        cabecera = request.headers.get("Authorization", "")
+        if cabecera.startswith("Bearer "):
+            token = cabecera[len("Bearer "):]
+    
+    # AccessToken(None) crea un token nuevo en lugar de fallar
+    if not token:
+        return JsonResponse(
+            {"detail": "Token de acceso requerido."},
+            status=status.HTTP_401_UNAUTHORIZED
+        )
+    
+    try:
+        acceso = AccessToken(token)
+    except TokenError:
+        return JsonResponse(
+            {"detail": "Token inválido o expirado."},
+            status=status.HTTP_401_UNAUTHORIZED
+        )
+    
+    rol = acceso.get("rol")
+    if rol not in ("Paciente", "Medico"):
+        return JsonResponse(
+            {"detail": "Solo pacientes y médicos reciben notificaciones."},
+            status=status.HTTP_403_FORBIDDEN
+        )
+    
+    ultimo_visto = request.headers.get("Last-Event-ID") or request.GET.get("last_event_id")
+    try:
+        ultimo_visto = int(ultimo_visto) if ultimo_visto else None
+    except ValueError:
+        ultimo_visto = None
+    
+    respuesta = StreamingHttpResponse(
+        _eventos(acceso["user_id"], rol, ultimo_visto, acceso["exp"]),
+        content_type="text/event-stream",
+    )
+    respuesta["Cache-Control"] = "no-cache"
+    # nginx: no acumular el stream en buffer
+    respuesta["X-Accel-Buffering"] = "no"
+    return respuesta
+
 # =============================================================================
 # NOTAS PARA EL DESARROLLADOR
 # =============================================================================
@@ -201,10 +495,37 @@ class NotificacionViewSet(viewsets.ViewSet):
 #    - Leída: Si el usuario ya la vio
 #    - Tipo: Categoría de la notificación
 #
-# 5. FUTURAS MEJORAS:
-#    - Marcar como leída (PUT /notificaciones/:id/leer/)
+# 5. TIEMPO REAL (SSE):
+#    - GET /api/notificaciones/stream/?token=... (vista async, requiere ASGI)
+#    - Un solo sondeo por proceso (tiempo_real.CentroNotificaciones) lee
+#      las filas nuevas por llave primaria y las reparte a los conectados
+#    - Last-Event-ID: al reconectar se envía lo pendiente desde la BD
+#
+# 6. LECTURA INCREMENTAL Y NO LEÍDAS:
+#    - ?after_id=/?antes_de=/?limite= consultan por rango de ID (sin SP);
+#      sin esos parámetros se usa el SP como antes
+#    - Estado leído por usuario = leido_hasta (todo ID <= es leído)
+#    - notificacion_contador.no_leidas se incrementa recorriendo solo las
+#      notificaciones nuevas desde notificacion_marca ('contadores')
+#    - contador/ = chequeo de MAX(ID) + lectura de una fila por llave
+#
+# 7. ENVÍO POR SMS/EMAIL/WHATSAPP (entrega.py):
+#    - citas/views.py encola en notificacion_saliente al crear, aceptar,
+#      cancelar y completar (después del SP, sin bloquear la respuesta)
+#    - despachar_notificaciones: procesos que reclaman lotes con SKIP
+#      LOCKED, respetan NOTIFICACIONES_LIMITES por canal y reintentan con
+#      espera exponencial (Fallido tras entrega.MAX_INTENTOS)
+#    - Transporte por canal en NOTIFICACIONES_TRANSPORTES (transportes.py)
+#
+# 8. RECORDATORIOS (recordatorios.py):
+#    - generar_recordatorios (cron o --cada N): citas Programada que
+#      empiezan en 1-24 h ('24h') o en menos de 1 h ('1h')
+#    - Ventana sobre el índice Agenda(Fecha, Hora); inserción por lotes en
+#      notificacion y notificacion_saliente
+#    - notificacion_recordatorio (única por cita y tipo) evita duplicados
+#
+# 9. FUTURAS MEJORAS:
 #    - Eliminar notificación (DELETE /notificaciones/:id/)
-#    - Notificaciones push (WebSockets)
 #    - Preferencias de notificación por usuario
 #
 # =============================================================================
\ No newline at end of file
@@ -0,0 +1,41 @@
+"""
+Reconstruye por completo el índice de búsqueda de pacientes.
+
+Uso:
+    python manage.py reconstruir_indice_pacientes
+    python manage.py reconstruir_indice_pacientes --lote 2000
+
+Normalmente no hace falta: el índice se refresca en cada registro,
+actualización, activación/desactivación e importación. Sirve para la carga
+inicial (pacientes ya existentes) y para recuperarse si algún refresco falló.
+"""
+
+from django.core.management.base import BaseCommand
+
+from pacientes.models import IndicePaciente, Paciente, TokenPaciente
+from pacientes.services import indice_refrescar
+
+
+class Command(BaseCommand):
+    help = "Reconstruye las tablas paciente_indice y paciente_indice_token."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--lote", type=int, default=1000, help="Pacientes por lote (1000).")
+
+    def handle(self, *args, **options):
+        ids = list(
+            Paciente.objects.order_by("id_usuario").values_list("id_usuario", flat=True)
+        )
+
+        # Filas de usuarios que ya no tienen perfil de paciente
+        eliminados, _ = IndicePaciente.objects.exclude(id_usuario__in=ids).delete()
+        TokenPaciente.objects.exclude(id_usuario__in=ids).delete()
+
+        lote = options["lote"]
+        for inicio in range(0, len(ids), lote):
+            indice_refrescar(ids[inicio:inicio + lote])
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Índice reconstruido: {len(ids)} pacientes, "
+            f"{eliminados} filas obsoletas eliminadas."
+        ))
@@ -0,0 +1,47 @@
+# Generated by Django 5.2.7 on 2026-10-19 16:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pacientes', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='IndicePaciente',
+            fields=[
+                ('id_usuario', models.IntegerField(db_column='ID_Usuario', primary_key=True, serialize=False)),
+                ('id_paciente', models.IntegerField(db_column='ID_Paciente', unique=True)),
+                ('nombre', models.CharField(db_column='Nombre', max_length=100, null=True)),
+                ('apellidos', models.CharField(db_column='Apellidos', max_length=100, null=True)),
+                ('documento', models.CharField(db_column='Documento', db_index=True, max_length=50, null=True)),
+                ('correo', models.CharField(db_column='Correo', max_length=100, null=True)),
+                ('telefono', models.CharField(db_column='Telefono', max_length=20, null=True)),
+                ('grupo_sanguineo', models.CharField(db_column='GrupoSanguineo', max_length=5, null=True)),
+                ('seguro_medico', models.CharField(db_column='SeguroMedico', max_length=100, null=True)),
+                ('contacto_emergencia', models.CharField(db_column='ContactoEmergencia', max_length=100, null=True)),
+                ('telefono_emergencia', models.CharField(db_column='TelefonoEmergencia', max_length=20, null=True)),
+                ('activo', models.BooleanField(db_column='Activo', default=True)),
+                ('actualizado', models.DateTimeField(auto_now=True, db_column='Actualizado')),
+            ],
+            options={
+                'db_table': 'paciente_indice',
+                'indexes': [models.Index(fields=['apellidos', 'nombre', 'id_usuario'], name='paciente_indice_orden_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='TokenPaciente',
+            fields=[
+                ('id_token', models.BigAutoField(db_column='ID_Token', primary_key=True, serialize=False)),
+                ('id_usuario', models.IntegerField(db_column='ID_Usuario', db_index=True)),
+                ('token', models.CharField(db_column='Token', max_length=50)),
+            ],
+            options={
+                'db_table': 'paciente_indice_token',
+                'indexes': [models.Index(fields=['token', 'id_usuario'], name='paciente_token_idx')],
+            },
+        ),
+    ]
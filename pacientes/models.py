@@ -11,3 +11,51 @@ class Paciente(models.Model):
     class Meta:
         managed = False
         db_table = 'paciente'
+
+
+class IndicePaciente(models.Model):
+    """
+    Índice de búsqueda de pacientes para administradores.
+
+    Una fila por paciente con los datos que muestra la lista (usuario +
+    perfil clínico). Gestionada por Django y recalculada desde
+    pacientes.services (indice_refrescar) cuando cambia el usuario o el
+    perfil; se reconstruye con `manage.py reconstruir_indice_pacientes`.
+    """
+    id_usuario = models.IntegerField(db_column='ID_Usuario', primary_key=True)
+    id_paciente = models.IntegerField(db_column='ID_Paciente', unique=True)
+    nombre = models.CharField(db_column='Nombre', max_length=100, null=True)
+    apellidos = models.CharField(db_column='Apellidos', max_length=100, null=True)
+    # Normalizado como en el registro (sin espacios, puntos ni guiones)
+    documento = models.CharField(db_column='Documento', max_length=50, null=True, db_index=True)
+    correo = models.CharField(db_column='Correo', max_length=100, null=True)
+    telefono = models.CharField(db_column='Telefono', max_length=20, null=True)
+    grupo_sanguineo = models.CharField(db_column='GrupoSanguineo', max_length=5, null=True)
+    seguro_medico = models.CharField(db_column='SeguroMedico', max_length=100, null=True)
+    contacto_emergencia = models.CharField(db_column='ContactoEmergencia', max_length=100, null=True)
+    telefono_emergencia = models.CharField(db_column='TelefonoEmergencia', max_length=20, null=True)
+    activo = models.BooleanField(db_column='Activo', default=True)
+    actualizado = models.DateTimeField(db_column='Actualizado', auto_now=True)
+
+    class Meta:
+        db_table = 'paciente_indice'
+        indexes = [
+            models.Index(fields=['apellidos', 'nombre', 'id_usuario'], name='paciente_indice_orden_idx'),
+        ]
+
+
+class TokenPaciente(models.Model):
+    """
+    Términos normalizados (minúsculas, sin tildes) del nombre y apellidos
+    de cada paciente en IndicePaciente. La búsqueda por nombre es un
+    prefijo sobre Token, que usa el índice (Token, ID_Usuario).
+    """
+    id_token = models.BigAutoField(db_column='ID_Token', primary_key=True)
+    id_usuario = models.IntegerField(db_column='ID_Usuario', db_index=True)
+    token = models.CharField(db_column='Token', max_length=50)
+
+    class Meta:
+        db_table = 'paciente_indice_token'
+        indexes = [
+            models.Index(fields=['token', 'id_usuario'], name='paciente_token_idx'),
+        ]
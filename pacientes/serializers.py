@@ -20,3 +20,11 @@ class PacienteUpdateSerializer(serializers.Serializer):
     seguro_medico = serializers.CharField(max_length=100, allow_null=True)
     contacto_emergencia = serializers.CharField(max_length=100, allow_null=True)
     telefono_emergencia = serializers.CharField(max_length=20, allow_null=True)
+
+
+class BusquedaPacienteSerializer(serializers.Serializer):
+    q = serializers.CharField(max_length=100, required=False, allow_blank=True)
+    documento = serializers.CharField(max_length=50, required=False, allow_blank=True)
+    solo_activos = serializers.BooleanField(default=False)
+    pagina = serializers.IntegerField(min_value=1, default=1)
+    por_pagina = serializers.IntegerField(min_value=1, max_value=100, default=20)
@@ -1,4 +1,15 @@
-from django.db import connection, DatabaseError
+import logging
+
+from django.db import connection, DatabaseError, transaction
+from django.db.models import Q
+
+from medicos.busqueda import normalizar
+
+from .models import IndicePaciente, Paciente, TokenPaciente
+
+
+logger = logging.getLogger(__name__)
+
 
 def dictfetchall(cursor):
     columns = [col[0] for col in cursor.description]
@@ -49,3 +60,141 @@ def sp_paciente_update(id_usuario, **kwargs):
             return row[0] if row else 0
         except DatabaseError as e:
             raise e
+
+
+# ------------------------------
+# Índice de búsqueda (administradores)
+# ------------------------------
+CAMPOS_INDICE = [
+    "id_paciente",
+    "id_usuario",
+    "nombre",
+    "apellidos",
+    "documento",
+    "correo",
+    "telefono",
+    "grupo_sanguineo",
+    "seguro_medico",
+    "contacto_emergencia",
+    "telefono_emergencia",
+    "activo",
+]
+
+
+def normalizar_documento(documento):
+    """Misma limpieza que el registro: sin espacios, puntos ni guiones."""
+    if not documento:
+        return ""
+    return documento.replace(" ", "").replace(".", "").replace("-", "")
+
+
+def tokens_nombre(*textos):
+    """Términos de búsqueda sin tildes: 'María José' -> ['maria', 'jose']."""
+    vistos = []
+    for texto in textos:
+        for token in normalizar(texto).replace(",", " ").split():
+            token = token[:50]
+            if token not in vistos:
+                vistos.append(token)
+    return vistos
+
+
+def indice_refrescar(ids_usuario):
+    """
+    Recalcula las filas del índice de búsqueda para varios pacientes.
+
+    Dos consultas (usuario + perfil) para todo el grupo, y el reemplazo de
+    filas y términos en una transacción. Los usuarios que ya no son
+    pacientes se quitan del índice. Como directorio_refrescar, los errores
+    se registran y no se propagan: el índice es derivado.
+    """
+    from usuarios.models import Usuario
+
+    ids_usuario = list(ids_usuario)
+    if not ids_usuario:
+        return
+    try:
+        perfiles = {
+            p.id_usuario: p
+            for p in Paciente.objects.filter(id_usuario__in=ids_usuario)
+        }
+        usuarios = Usuario.objects.filter(
+            id_usuario__in=list(perfiles), rol="Paciente"
+        )
+
+        filas, tokens = [], []
+        for usuario in usuarios:
+            perfil = perfiles[usuario.id_usuario]
+            filas.append(IndicePaciente(
+                id_usuario=usuario.id_usuario,
+                id_paciente=perfil.id_paciente,
+                nombre=usuario.nombre,
+                apellidos=usuario.apellidos,
+                documento=normalizar_documento(usuario.documento),
+                correo=usuario.correo,
+                telefono=usuario.telefono,
+                grupo_sanguineo=perfil.grupo_sanguineo,
+                seguro_medico=perfil.seguro_medico,
+                contacto_emergencia=perfil.contacto_emergencia,
+                telefono_emergencia=perfil.telefono_emergencia,
+                activo=usuario.activo,
+            ))
+            tokens.extend(
+                TokenPaciente(id_usuario=usuario.id_usuario, token=token)
+                for token in tokens_nombre(usuario.nombre, usuario.apellidos)
+            )
+
+        with transaction.atomic():
+            IndicePaciente.objects.filter(id_usuario__in=ids_usuario).delete()
+            TokenPaciente.objects.filter(id_usuario__in=ids_usuario).delete()
+            IndicePaciente.objects.bulk_create(filas)
+            TokenPaciente.objects.bulk_create(tokens)
+    except DatabaseError:
+        logger.exception("No se pudo refrescar el índice de pacientes %s", ids_usuario[:10])
+
+
+def indice_buscar(q="", documento="", pagina=1, por_pagina=20, solo_activos=False):
+    """
+    Busca pacientes en el índice, paginado.
+
+    - documento: prefijo del documento (el documento completo también es
+      un prefijo, así que cubre la búsqueda exacta)
+    - q: cada término debe ser prefijo de algún término del nombre o los
+      apellidos (sin tildes ni mayúsculas); un término solo de dígitos
+      también se busca como prefijo del documento
+
+    Returns:
+        dict: {"total", "pagina", "por_pagina", "resultados": [...]}
+    """
+    consulta = IndicePaciente.objects.all()
+    if solo_activos:
+        consulta = consulta.filter(activo=True)
+
+    documento = normalizar_documento(documento)
+    if documento:
+        consulta = consulta.filter(documento__startswith=documento)
+
+    for termino in tokens_nombre(q):
+        por_nombre = TokenPaciente.objects.filter(
+            token__startswith=termino
+        ).values("id_usuario")
+        digitos = normalizar_documento(termino)
+        if digitos.isdigit():
+            consulta = consulta.filter(
+                Q(documento__startswith=digitos) | Q(id_usuario__in=por_nombre)
+            )
+        else:
+            consulta = consulta.filter(id_usuario__in=por_nombre)
+
+    total = consulta.count()
+    inicio = (pagina - 1) * por_pagina
+    resultados = list(
+        consulta.order_by("apellidos", "nombre", "id_usuario")
+        .values(*CAMPOS_INDICE)[inicio:inicio + por_pagina]
+    )
+    return {
+        "total": total,
+        "pagina": pagina,
+        "por_pagina": por_pagina,
+        "resultados": resultados,
+    }
@@ -7,15 +7,19 @@ Con PERMISOS para proteger datos personales.
 
 from django.db import DatabaseError
 from rest_framework import status, viewsets
+from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 
 from backend.permissions import IsAdministrador
 
 from .serializers import (
+    BusquedaPacienteSerializer,
     PacienteUpdateSerializer,
 )
 from .services import (
+    indice_buscar,
+    indice_refrescar,
     sp_paciente_list,
     sp_paciente_get_by_usuario,
     sp_paciente_update,
@@ -27,13 +31,13 @@ class PacienteViewSet(viewsets.ViewSet):
     ViewSet para gestión de perfiles de Pacientes.
     
     Permisos:
-    - list: Solo Admin
+    - list/buscar: Solo Admin
     - retrieve: Paciente ve solo su perfil, Médico/Admin ven todos
     - update: Paciente actualiza solo su perfil, Admin actualiza todos
     """
     
     def get_permissions(self):
-        if self.action == 'list':
+        if self.action in ['list', 'buscar']:
             return [IsAdministrador()]
         return [IsAuthenticated()]
     
@@ -42,6 +46,31 @@ class PacienteViewSet(viewsets.ViewSet):
         data = sp_paciente_list()
         return Response(data, status=status.HTTP_200_OK)
     
+    @action(detail=False, methods=['get'], url_path='buscar')
+    def buscar(self, request):
+        """
+        GET /api/pacientes/buscar/ - Solo Admin
+        
+        Búsqueda paginada en el índice de pacientes (IndicePaciente), sin
+        descargar el registro completo.
+        
+        Query Params:
+            q: Nombre y/o apellidos, sin importar tildes ni mayúsculas;
+               cada término es un prefijo ("mar gom" → María Gómez).
+               Un término numérico también busca por documento
+            documento: Documento exacto o prefijo
+            solo_activos: true para omitir usuarios desactivados
+            pagina / por_pagina: Paginación (máx. 100 por página)
+        
+        Response:
+            200: {"total": 42, "pagina": 1, "por_pagina": 20, "resultados": [...]}
+        """
+        serializer = BusquedaPacienteSerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        
+        data = indice_buscar(**serializer.validated_data)
+        return Response(data, status=status.HTTP_200_OK)
+    
     def retrieve(self, request, pk=None):
         """GET /api/pacientes/:id/ - Propio perfil o Admin"""
         # Validación ownership
@@ -108,5 +137,24 @@ class PacienteViewSet(viewsets.ViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
+        indice_refrescar([int(pk)])
+        
         paciente = sp_paciente_get_by_usuario(int(pk))
-        return Response(paciente, status=status.HTTP_200_OK)
\ No newline at end of file
+        return Response(paciente, status=status.HTTP_200_OK)
+
+# =============================================================================
+# NOTAS PARA EL DESARROLLADOR
+# =============================================================================
+#
+# 1. BÚSQUEDA DE PACIENTES (buscar):
+#    - list (sp_paciente_list) devuelve el registro completo; con miles de
+#      pacientes son megabytes. La lista del frontend usa buscar, paginada
+#    - Se sirve desde paciente_indice (una fila por paciente) y
+#      paciente_indice_token (términos del nombre sin tildes), con índices
+#      para prefijo de documento y de término
+#    - indice_refrescar() se llama desde usuarios (registro, update,
+#      activar/desactivar, importación) y desde update de este ViewSet
+#    - Carga inicial / recuperación:
+#      python manage.py reconstruir_indice_pacientes
+#
+# =============================================================================
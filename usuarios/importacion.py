@@ -0,0 +1,258 @@
+"""
+Importación masiva de pacientes desde CSV - Salud Rural
+
+En las brigadas de salud se registran cientos de pacientes sin conexión y
+luego se cargan de una vez. Hacerlo con POST /api/usuarios/ fila por fila
+paga por cada una una petición, un make_password y una transacción.
+
+Aquí el CSV se lee como flujo, por lotes de LOTE filas:
+1. Cada fila se valida y normaliza con PacienteImportacionSerializer
+   (mismas reglas que el registro: correo en minúsculas, documento sin
+   espacios/puntos/guiones, fortaleza de la contraseña).
+2. Documentos y correos repetidos se descartan en memoria: contra las filas
+   anteriores del archivo y, con una consulta por lote, contra la BD. Así
+   no se gasta PBKDF2 en filas que el SP rechazaría.
+3. Las contraseñas del lote se hashean juntas en el pool de procesos
+   (autenticacion.hashing.hashear_lote).
+4. El lote se inserta con sp_usuario_create en UNA transacción, con un
+   savepoint por fila: un error del SP descarta solo esa fila.
+5. Los creados se agregan al índice de búsqueda de pacientes de una vez.
+
+Cada fila rechazada queda en el reporte con su número de línea.
+
+Columnas:
+    obligatorias: nombre, apellidos, documento, correo, contrasena
+    opcionales:   fecha_nacimiento (YYYY-MM-DD), telefono, grupo_sanguineo,
+                  seguro_medico, contacto_emergencia, telefono_emergencia
+"""
+
+import csv
+import io
+
+from django.db import DatabaseError, transaction
+
+
+# Filas por lote (validación, hasheo y transacción)
+LOTE = 200
+
+COLUMNAS_OBLIGATORIAS = ("nombre", "apellidos", "documento", "correo", "contrasena")
+
+COLUMNAS_OPCIONALES = (
+    "fecha_nacimiento",
+    "telefono",
+    "grupo_sanguineo",
+    "seguro_medico",
+    "contacto_emergencia",
+    "telefono_emergencia",
+)
+
+CAMPOS_PACIENTE = (
+    "grupo_sanguineo",
+    "seguro_medico",
+    "contacto_emergencia",
+    "telefono_emergencia",
+)
+
+# Mensajes del SP → (campo, mensaje), como en UsuarioViewSet.create
+ERRORES_SP = (
+    ("documento duplicado", "documento", "El documento ya está registrado."),
+    ("correo duplicado", "correo", "El correo ya está registrado."),
+    ("formato de correo inválido", "correo", "El formato del correo es inválido."),
+)
+
+
+class ArchivoInvalido(ValueError):
+    """El CSV no se puede importar (encabezado incompleto, codificación)."""
+
+
+def _limpiar(fila):
+    """Quita espacios y descarta celdas vacías (cuentan como no enviadas)."""
+    datos = {}
+    for columna in COLUMNAS_OBLIGATORIAS + COLUMNAS_OPCIONALES:
+        valor = (fila.get(columna) or "").strip()
+        if valor:
+            datos[columna] = valor
+    return datos
+
+
+def _error_sp(error):
+    msg = str(error).lower()
+    for texto, campo, mensaje in ERRORES_SP:
+        if texto in msg:
+            return {campo: [mensaje]}
+    return {"detail": [str(error)]}
+
+
+def _leer(archivo):
+    """
+    Returns:
+        iterator: (número de línea, dict de la fila)
+    """
+    if isinstance(archivo, (bytes, bytearray)):
+        archivo = io.BytesIO(archivo)
+    if not isinstance(archivo, io.TextIOBase):
+        # utf-8-sig: Excel agrega BOM al guardar como "CSV UTF-8"
+        archivo = io.TextIOWrapper(archivo, encoding="utf-8-sig", newline="")
+
+    lector = csv.DictReader(archivo)
+    try:
+        encabezado = [c.strip().lower() for c in (lector.fieldnames or [])]
+    except UnicodeDecodeError:
+        raise ArchivoInvalido("El archivo debe estar en UTF-8.")
+    faltantes = [c for c in COLUMNAS_OBLIGATORIAS if c not in encabezado]
+    if faltantes:
+        raise ArchivoInvalido(f"Faltan columnas: {', '.join(faltantes)}.")
+    lector.fieldnames = encabezado
+
+    try:
+        for fila in lector:
+            yield lector.line_num, fila
+    except UnicodeDecodeError:
+        raise ArchivoInvalido("El archivo debe estar en UTF-8.")
+
+
+class Importacion:
+    """Estado de una importación: duplicados vistos y reporte."""
+
+    def __init__(self, lote=LOTE):
+        self.lote = lote
+        self.documentos = set()
+        self.correos = set()
+        self.procesadas = 0
+        self.creados = []
+        self.errores = []
+
+    def _rechazar(self, linea, datos, errores):
+        self.errores.append({
+            "fila": linea,
+            "documento": datos.get("documento"),
+            "errores": errores,
+        })
+
+    def _validar(self, filas):
+        """Valida y normaliza; descarta repetidos dentro del archivo."""
+        from .serializers import PacienteImportacionSerializer
+
+        validas = []
+        for linea, fila in filas:
+            datos = _limpiar(fila)
+            serializer = PacienteImportacionSerializer(data=datos)
+            if not serializer.is_valid():
+                self._rechazar(linea, datos, serializer.errors)
+                continue
+
+            valida = serializer.validated_data
+            if valida["documento"] in self.documentos:
+                self._rechazar(linea, datos, {"documento": ["Repetido en el archivo."]})
+                continue
+            if valida["correo"] in self.correos:
+                self._rechazar(linea, datos, {"correo": ["Repetido en el archivo."]})
+                continue
+            self.documentos.add(valida["documento"])
+            self.correos.add(valida["correo"])
+            validas.append((linea, valida))
+        return validas
+
+    def _descartar_existentes(self, validas):
+        """Una consulta por campo para todo el lote."""
+        from .models import Usuario
+
+        documentos = set(
+            Usuario.objects.filter(
+                documento__in=[v["documento"] for _, v in validas]
+            ).values_list("documento", flat=True)
+        )
+        correos = set(
+            Usuario.objects.filter(
+                correo__in=[v["correo"] for _, v in validas]
+            ).values_list("correo", flat=True)
+        )
+
+        nuevas = []
+        for linea, valida in validas:
+            if valida["documento"] in documentos:
+                self._rechazar(linea, valida, {"documento": ["El documento ya está registrado."]})
+            elif valida["correo"] in correos:
+                self._rechazar(linea, valida, {"correo": ["El correo ya está registrado."]})
+            else:
+                nuevas.append((linea, valida))
+        return nuevas
+
+    def _insertar(self, nuevas):
+        from pacientes.services import indice_refrescar, sp_paciente_update
+
+        from .services import sp_usuario_create
+
+        creados = len(self.creados)
+        with transaction.atomic():
+            for linea, valida in nuevas:
+                valida.setdefault("fecha_nacimiento", None)
+                valida.setdefault("telefono", None)
+                try:
+                    with transaction.atomic():
+                        nuevo_id = sp_usuario_create(**valida)
+                        if any(valida.get(c) for c in CAMPOS_PACIENTE):
+                            sp_paciente_update(
+                                nuevo_id, **{c: valida.get(c) for c in CAMPOS_PACIENTE}
+                            )
+                except DatabaseError as e:
+                    self._rechazar(linea, valida, _error_sp(e))
+                    continue
+                self.creados.append(nuevo_id)
+
+        indice_refrescar(self.creados[creados:])
+
+    def procesar_lote(self, filas):
+        from autenticacion.hashing import hashear_lote
+
+        self.procesadas += len(filas)
+        nuevas = self._validar(filas)
+        if not nuevas:
+            return
+        nuevas = self._descartar_existentes(nuevas)
+        if not nuevas:
+            return
+
+        hashes = hashear_lote([valida["contrasena"] for _, valida in nuevas])
+        for (_, valida), hash_nuevo in zip(nuevas, hashes):
+            valida["contrasena"] = hash_nuevo
+
+        self._insertar(nuevas)
+
+    def reporte(self):
+        return {
+            "procesadas": self.procesadas,
+            "creados": len(self.creados),
+            "rechazadas": len(self.errores),
+            "errores": sorted(self.errores, key=lambda e: e["fila"]),
+        }
+
+
+def importar_pacientes(archivo, lote=LOTE, al_avanzar=None):
+    """
+    Importa pacientes desde un CSV (archivo binario, de texto o bytes).
+
+    Args:
+        lote: Filas por lote
+        al_avanzar: Se llama con la Importacion después de cada lote
+
+    Returns:
+        dict: {"procesadas", "creados", "rechazadas", "errores": [...]}
+
+    Raises:
+        ArchivoInvalido: Encabezado incompleto o codificación no UTF-8
+    """
+    importacion = Importacion(lote)
+    filas = []
+    for linea, fila in _leer(archivo):
+        filas.append((linea, fila))
+        if len(filas) >= lote:
+            importacion.procesar_lote(filas)
+            filas = []
+            if al_avanzar is not None:
+                al_avanzar(importacion)
+    if filas:
+        importacion.procesar_lote(filas)
+        if al_avanzar is not None:
+            al_avanzar(importacion)
+    return importacion.reporte()
@@ -0,0 +1,53 @@
+"""
+Registra pacientes en bloque desde un CSV (brigadas de salud).
+
+Uso:
+    python manage.py importar_pacientes brigada.csv
+    python manage.py importar_pacientes brigada.csv --lote 500 --reporte errores.csv
+
+Mismo proceso que POST /api/usuarios/importar/ (usuarios/importacion.py),
+sin ocupar un worker web. Las filas rechazadas se escriben en --reporte
+(fila, documento, campo, error) para corregirlas y volver a importarlas:
+las ya creadas se rechazan como duplicadas.
+"""
+
+import csv
+
+from django.core.management.base import BaseCommand, CommandError
+
+from usuarios.importacion import LOTE, ArchivoInvalido, importar_pacientes
+
+
+class Command(BaseCommand):
+    help = "Importa pacientes desde un CSV por lotes, con reporte de errores por fila."
+
+    def add_arguments(self, parser):
+        parser.add_argument("archivo", help="CSV UTF-8 con encabezado.")
+        parser.add_argument("--lote", type=int, default=LOTE, help=f"Filas por lote ({LOTE}).")
+        parser.add_argument("--reporte", help="CSV donde escribir las filas rechazadas.")
+
+    def handle(self, *args, **options):
+        def avance(importacion):
+            self.stdout.write(
+                f"{importacion.procesadas} filas, {len(importacion.creados)} creados, "
+                f"{len(importacion.errores)} rechazadas"
+            )
+
+        try:
+            with open(options["archivo"], "rb") as archivo:
+                reporte = importar_pacientes(archivo, options["lote"], avance)
+        except (OSError, ArchivoInvalido) as e:
+            raise CommandError(str(e))
+
+        if options["reporte"] and reporte["errores"]:
+            with open(options["reporte"], "w", newline="", encoding="utf-8") as salida:
+                escritor = csv.writer(salida)
+                escritor.writerow(["fila", "documento", "campo", "error"])
+                for error in reporte["errores"]:
+                    for campo, mensajes in error["errores"].items():
+                        for mensaje in mensajes:
+                            escritor.writerow([error["fila"], error["documento"], campo, mensaje])
+
+        self.stdout.write(self.style.SUCCESS(
+            f"{reporte['creados']} pacientes creados, {reporte['rechazadas']} filas rechazadas."
+        ))
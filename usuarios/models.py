@@ -11,7 +11,6 @@ IMPORTANTE:
 """
 
 from django.db import models
-from django.contrib.auth.hashers import make_password, check_password
 
 
 class Usuario(models.Model):
@@ -171,7 +170,9 @@ class Usuario(models.Model):
             Este método NO guarda en BD automáticamente.
             Debes llamar a .save() después.
         """
-        self.contrasena = make_password(raw_password)
+        # Se calcula en el pool de autenticacion.hashing (no en este hilo)
+        from autenticacion.hashing import hashear_contrasena
+        self.contrasena = hashear_contrasena(raw_password)
     
     def check_password(self, raw_password):
         """
@@ -192,8 +193,17 @@ class Usuario(models.Model):
             else:
                 print('Contraseña incorrecta')
         """
-        # check_password maneja el caso de contrasena=None
-        return check_password(raw_password, self.contrasena)
+        # Se calcula en el pool de autenticacion.hashing (no en este hilo);
+        # contrasena=None devuelve False. Si el hash tiene menos iteraciones
+        # que el objetivo actual, se re-hashea en segundo plano
+        from autenticacion.hashing import rehashear_en_segundo_plano, verificar_contrasena
+        return verificar_contrasena(
+            raw_password,
+            self.contrasena,
+            al_desactualizar=lambda: rehashear_en_segundo_plano(
+                self.id_usuario, raw_password, self.contrasena
+            ),
+        )
     
     # =========================================================================
     # PROPIEDADES DE CONVENIENCIA
@@ -12,7 +12,6 @@ IMPORTANTE:
 """
 
 from rest_framework import serializers
-from django.contrib.auth.hashers import make_password
 
 
 # Opciones válidas de rol
@@ -182,28 +181,56 @@ class UsuarioCreateSerializer(serializers.Serializer):
         Raises:
             ValidationError: Si la contraseña no cumple requisitos
         """
-        # 1. Validar longitud mínima
-        if len(value) < 8:
-            raise serializers.ValidationError(
-                "La contraseña debe tener al menos 8 caracteres"
-            )
+        validar_fortaleza(value)
         
-        # 2. Validar que contenga al menos una letra
-        if not any(char.isalpha() for char in value):
-            raise serializers.ValidationError(
-                "La contraseña debe contener al menos una letra"
-            )
-        
-        # 3. Validar que contenga al menos un número
-        if not any(char.isdigit() for char in value):
-            raise serializers.ValidationError(
-                "La contraseña debe contener al menos un número"
-            )
-        
-        # 4. Hashear la contraseña
-        # make_password usa el algoritmo configurado en settings.py
-        # Por defecto: PBKDF2 con SHA256
-        return make_password(value)
+        # Hashear la contraseña
+        # make_password (algoritmo de settings.py, PBKDF2 con SHA256) en el
+        # pool de procesos de autenticacion.hashing; 503 si está saturado
+        from autenticacion.hashing import hashear_contrasena
+        return hashear_contrasena(value)
+
+
+class PacienteImportacionSerializer(UsuarioCreateSerializer):
+    """
+    Serializer para una fila de la importación masiva de pacientes.
+    
+    Mismas validaciones y normalización que UsuarioCreateSerializer, pero:
+    - El rol siempre es 'Paciente'
+    - La contraseña NO se hashea aquí: usuarios.importacion hashea el
+      lote completo de una vez (hashear_lote)
+    """
+    
+    rol = serializers.HiddenField(default='Paciente')
+    
+    def validate_contrasena(self, value):
+        validar_fortaleza(value)
+        return value
+
+
+def validar_fortaleza(value):
+    """
+    Requisitos mínimos de una contraseña en texto plano.
+    
+    Raises:
+        ValidationError: Si la contraseña no cumple requisitos
+    """
+    # 1. Validar longitud mínima
+    if len(value) < 8:
+        raise serializers.ValidationError(
+            "La contraseña debe tener al menos 8 caracteres"
+        )
+    
+    # 2. Validar que contenga al menos una letra
+    if not any(char.isalpha() for char in value):
+        raise serializers.ValidationError(
+            "La contraseña debe contener al menos una letra"
+        )
+    
+    # 3. Validar que contenga al menos un número
+    if not any(char.isdigit() for char in value):
+        raise serializers.ValidationError(
+            "La contraseña debe contener al menos un número"
+        )
 
 
 class UsuarioUpdateSerializer(serializers.Serializer):
@@ -11,6 +11,7 @@ Lógica de permisos:
 - Actualizar (update): Usuario actualiza solo su info, Admin actualiza todo
 - Desactivar (destroy): Solo Administradores
 - Activar (activate): Solo Administradores
+- Importar pacientes (importar): Solo Administradores
 """
 
 from django.db import DatabaseError
@@ -47,6 +48,7 @@ class UsuarioViewSet(viewsets.ViewSet):
     - PUT    /api/usuarios/:id/          → Actualizar (propio o admin)
     - DELETE /api/usuarios/:id/          → Desactivar (solo admin)
     - POST   /api/usuarios/:id/activar/  → Activar (solo admin)
+    - POST   /api/usuarios/importar/     → Importar pacientes CSV (solo admin)
     
     Permisos implementados:
     - create: Público (AllowAny)
@@ -55,6 +57,7 @@ class UsuarioViewSet(viewsets.ViewSet):
     - update: Usuario actualiza solo su info, Admin actualiza cualquiera
     - destroy: Solo Administradores
     - activate: Solo Administradores
+    - importar: Solo Administradores
     """
     
     def get_permissions(self):
@@ -78,7 +81,7 @@ class UsuarioViewSet(viewsets.ViewSet):
             # Solo administradores pueden listar todos los usuarios
             return [IsAdministrador()]
         
-        elif self.action in ['destroy', 'activate']:
+        elif self.action in ['destroy', 'activate', 'importar']:
             # Solo administradores pueden activar/desactivar usuarios
             return [IsAdministrador()]
         
@@ -214,6 +217,11 @@ class UsuarioViewSet(viewsets.ViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
+        # Índice de búsqueda de pacientes (administradores)
+        if serializer.validated_data["rol"] == 'Paciente':
+            from pacientes.services import indice_refrescar
+            indice_refrescar([nuevo_id])
+        
         # Obtener y retornar el usuario creado
         usuario = sp_usuario_get(nuevo_id)
         return Response(usuario, status=status.HTTP_201_CREATED)
@@ -297,6 +305,12 @@ class UsuarioViewSet(viewsets.ViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
+        # Nombre/estado visibles en el directorio público de médicos
+        from medicos.services import directorio_refrescar
+        directorio_refrescar(int(pk))
+        from pacientes.services import indice_refrescar
+        indice_refrescar([int(pk)])
+        
         # Obtener y retornar el usuario actualizado
         usuario = sp_usuario_get(int(pk))
         return Response(usuario, status=status.HTTP_200_OK)
@@ -343,6 +357,11 @@ class UsuarioViewSet(viewsets.ViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
+        from medicos.services import directorio_refrescar
+        directorio_refrescar(int(pk))
+        from pacientes.services import indice_refrescar
+        indice_refrescar([int(pk)])
+        
         return Response(
             {
                 "detail": "Usuario desactivado exitosamente.",
@@ -390,11 +409,51 @@ class UsuarioViewSet(viewsets.ViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
+        from medicos.services import directorio_refrescar
+        directorio_refrescar(int(pk))
+        from pacientes.services import indice_refrescar
+        indice_refrescar([int(pk)])
+        
         return Response(
             {"detail": "Usuario activado exitosamente."},
             status=status.HTTP_200_OK
         )
 
+    @action(detail=False, methods=['post'], url_path='importar')
+    def importar(self, request):
+        """
+        POST /api/usuarios/importar/
+        
+        Registra pacientes en bloque desde un CSV (brigadas de salud).
+        
+        Permiso: Solo Administradores
+        
+        Request (multipart/form-data):
+            archivo: CSV UTF-8 con encabezado
+                     nombre,apellidos,documento,correo,contrasena
+                     [,fecha_nacimiento,telefono,grupo_sanguineo,...]
+        
+        Response:
+            200: Reporte {"procesadas", "creados", "rechazadas", "errores"}
+                 (cada error trae fila, documento y errores por campo)
+            400: Sin archivo, encabezado incompleto o no es UTF-8
+        """
+        from .importacion import ArchivoInvalido, importar_pacientes
+        
+        archivo = request.FILES.get('archivo')
+        if archivo is None:
+            return Response(
+                {"detail": "Debe enviar el CSV en el campo 'archivo'.", "field": "archivo"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        try:
+            reporte = importar_pacientes(archivo.file)
+        except ArchivoInvalido as e:
+            return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        
+        return Response(reporte, status=status.HTTP_200_OK)
+
 
 # =============================================================================
 # NOTAS PARA EL DESARROLLADOR
@@ -426,4 +485,11 @@ class UsuarioViewSet(viewsets.ViewSet):
 #    - Probar ownership (intentar acceder a ID ajeno)
 #    - Probar sin token (debe dar 401)
 #
-# =============================================================================
\ No newline at end of file
+# 6. IMPORTACIÓN MASIVA (importar):
+#    - usuarios/importacion.py: lee el CSV por lotes, descarta duplicados
+#      en memoria, hashea el lote en el pool y lo inserta en una sola
+#      transacción (un savepoint por fila)
+#    - Para archivos grandes usar el comando (no ocupa un worker web):
+#      python manage.py importar_pacientes brigada.csv --reporte errores.csv
+#
+# =============================================================================
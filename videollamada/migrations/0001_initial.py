@@ -0,0 +1,32 @@
+# Generated by Django 5.2.7 on 2026-10-19 16:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SondaVideollamada',
+            fields=[
+                ('id_sonda', models.BigAutoField(db_column='ID_Sonda', primary_key=True, serialize=False)),
+                ('id_cita', models.IntegerField(db_column='ID_Cita')),
+                ('id_usuario', models.IntegerField(db_column='ID_Usuario')),
+                ('rol', models.CharField(db_column='Rol', max_length=20)),
+                ('bajada_kbps', models.FloatField(db_column='BajadaKbps')),
+                ('subida_kbps', models.FloatField(db_column='SubidaKbps')),
+                ('rtt_ms', models.FloatField(db_column='RttMs')),
+                ('perfil', models.CharField(db_column='Perfil', max_length=10)),
+                ('creado', models.DateTimeField(auto_now_add=True, db_column='Creado')),
+            ],
+            options={
+                'db_table': 'videollamada_sonda',
+                'indexes': [models.Index(fields=['id_cita', 'creado'], name='sonda_cita_creado_idx')],
+            },
+        ),
+    ]
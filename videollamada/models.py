@@ -1,3 +1,26 @@
 from django.db import models
 
-# Create your models here.
+
+class SondaVideollamada(models.Model):
+    """
+    Resultado de una medición de enlace antes de una videollamada.
+
+    Tabla gestionada por Django. Se guarda una fila por medición (paciente
+    o médico) para elegir el perfil de la llamada y para revisar después
+    desde dónde se conectan con enlaces lentos.
+    """
+    id_sonda = models.BigAutoField(db_column='ID_Sonda', primary_key=True)
+    id_cita = models.IntegerField(db_column='ID_Cita')
+    id_usuario = models.IntegerField(db_column='ID_Usuario')
+    rol = models.CharField(db_column='Rol', max_length=20)
+    bajada_kbps = models.FloatField(db_column='BajadaKbps')
+    subida_kbps = models.FloatField(db_column='SubidaKbps')
+    rtt_ms = models.FloatField(db_column='RttMs')
+    perfil = models.CharField(db_column='Perfil', max_length=10)
+    creado = models.DateTimeField(db_column='Creado', auto_now_add=True)
+
+    class Meta:
+        db_table = 'videollamada_sonda'
+        indexes = [
+            models.Index(fields=['id_cita', 'creado'], name='sonda_cita_creado_idx'),
+        ]
@@ -0,0 +1,312 @@
+"""
+Señalización WebRTC para teleconsultas - Salud Rural
+
+WebSocket ASGI (sin Django Channels) que retransmite offer/answer/ICE
+entre el paciente y el médico de una cita; el audio y el video viajan
+directo entre navegadores (o por TURN), el servidor solo pasa mensajes
+chicos.
+
+    ws(s)://<host>/ws/videollamada/<id_cita>/?token=<access JWT o token de ingreso>
+
+- Autorización: access token JWT (se verifica en la BD que el usuario sea
+  paciente o médico de la cita, una vez por conexión) o token de ingreso
+  de tokens.py (solo firma, sin BD). La sala se cierra (4401) al
+  vencimiento del token de ingreso (tokens.vencimiento de la cita), también
+  si se entró con JWT: su 'exp' no corta la llamada.
+- Cada conexión es una tarea asyncio esperando mensajes: una sala inactiva
+  no consume CPU, así un proceso sostiene miles de salas.
+- Los mensajes pasan por una capa de canales (grupo por cita). Por defecto
+  CapaLocal, en memoria del proceso; con varios procesos se configura en
+  VIDEOLLAMADA_CAPA_SENALIZACION una capa compartida con la misma interfaz.
+
+Protocolo (JSON por frame de texto):
+    cliente → {"tipo": "offer" | "answer" | "ice" | "colgar", "datos": ...}
+    servidor → {"tipo": ..., "rol": "Paciente" | "Medico", "datos": ...}
+    además: "bienvenida" (con ice_servers), "entro", "presente", "salio", "error"
+"""
+
+import asyncio
+import json
+import re
+import time
+import uuid
+from urllib.parse import parse_qs
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import close_old_connections
+from django.utils.module_loading import import_string
+
+
+RUTA = re.compile(r"^/ws/videollamada/(?P<id_cita>\d+)/?$")
+
+# Mensajes del cliente que se retransmiten al otro participante
+TIPOS_RELEVO = {"offer", "answer", "ice", "colgar"}
+
+# Un SDP ronda 2-10 KB; más que esto no es señalización
+MENSAJE_MAXIMO = 64 * 1024
+
+# Mensajes pendientes por conexión antes de considerarla saturada
+COLA_MAXIMA = 256
+
+ICE_SERVERS = getattr(settings, "VIDEOLLAMADA_ICE_SERVERS", [
+    {"urls": "stun:stun.l.google.com:19302"},
+])
+
+# Códigos de cierre (4000-4999 son de la aplicación)
+CIERRE_NO_ENCONTRADO = 4404
+CIERRE_NO_AUTORIZADO = 4403
+CIERRE_TOKEN_VENCIDO = 4401
+CIERRE_REEMPLAZADO = 4409
+CIERRE_SATURADO = 4429
+CIERRE_MENSAJE_GRANDE = 1009
+
+
+# =============================================================================
+# CAPA DE CANALES
+# =============================================================================
+
+class CapaLocal:
+    """
+    Capa de canales en memoria (un solo proceso).
+
+    Misma forma que la de Django Channels: canales con nombre, grupos y
+    envío a grupo. Si la cola de un canal se llena, se vacía y se deja un
+    aviso '_saturado' para que esa conexión se cierre (el cliente reconecta).
+    """
+
+    def __init__(self, capacidad=COLA_MAXIMA):
+        self.capacidad = capacidad
+        self.canales = {}
+        self.grupos = {}
+
+    async def nuevo_canal(self):
+        nombre = f"local.{uuid.uuid4().hex}"
+        self.canales[nombre] = asyncio.Queue(maxsize=self.capacidad)
+        return nombre
+
+    async def cerrar_canal(self, canal):
+        self.canales.pop(canal, None)
+
+    async def recibir(self, canal):
+        return await self.canales[canal].get()
+
+    async def enviar(self, canal, mensaje):
+        cola = self.canales.get(canal)
+        if cola is None:
+            return
+        try:
+            cola.put_nowait(mensaje)
+        except asyncio.QueueFull:
+            while not cola.empty():
+                cola.get_nowait()
+            cola.put_nowait({"tipo": "_saturado"})
+
+    async def grupo_agregar(self, grupo, canal):
+        self.grupos.setdefault(grupo, set()).add(canal)
+
+    async def grupo_descartar(self, grupo, canal):
+        miembros = self.grupos.get(grupo)
+        if miembros is None:
+            return
+        miembros.discard(canal)
+        if not miembros:
+            del self.grupos[grupo]
+
+    async def grupo_enviar(self, grupo, mensaje):
+        for canal in list(self.grupos.get(grupo, ())):
+            await self.enviar(canal, mensaje)
+
+
+def cargar_capa():
+    ruta = getattr(
+        settings, "VIDEOLLAMADA_CAPA_SENALIZACION", "videollamada.senalizacion.CapaLocal"
+    )
+    return import_string(ruta)()
+
+
+# Una capa por proceso
+capa = cargar_capa()
+
+
+# =============================================================================
+# AUTORIZACIÓN
+# =============================================================================
+
+def _participantes(id_cita):
+    from .services import cita_participantes
+    close_old_connections()
+    return cita_participantes(id_cita)
+
+
+async def autorizar(id_cita, token):
+    """
+    Returns:
+        tuple | None: (id_usuario, rol, vence en epoch) si puede entrar
+    """
+    from rest_framework_simplejwt.exceptions import TokenError
+    from rest_framework_simplejwt.tokens import AccessToken
+
+    from . import tokens
+
+    if not token:
+        return None
+
+    try:
+        acceso = AccessToken(token)
+    except TokenError:
+        acceso = None
+
+    if acceso is None:
+        # Token de ingreso: solo firma y vencimiento
+        try:
+            datos = tokens.validar(token)
+        except tokens.TokenInvalido:
+            return None
+        if datos["id_cita"] != id_cita:
+            return None
+        return datos["id_usuario"], datos["rol"], datos["expira"].timestamp()
+
+    rol = acceso.get("rol")
+    id_usuario = acceso["user_id"]
+    cita = await sync_to_async(_participantes)(id_cita)
+    if cita is None:
+        return None
+    # El JWT solo autoriza la entrada: la sala dura lo mismo que con un
+    # token de ingreso, no hasta el 'exp' del access (60 min desde el login)
+    vence = tokens.vencimiento(cita["fecha"], cita["hora"]).timestamp()
+    if rol == "Medico" and cita["id_usuario_medico"] == id_usuario:
+        return id_usuario, rol, vence
+    if rol == "Paciente" and cita["id_usuario_paciente"] == id_usuario:
+        return id_usuario, rol, vence
+    return None
+
+
+# =============================================================================
+# CONEXIÓN
+# =============================================================================
+
+class Participante:
+    """Una conexión WebSocket dentro de la sala de una cita."""
+
+    def __init__(self, id_cita, id_usuario, rol, vence, receive, send):
+        self.grupo = f"videollamada.{id_cita}"
+        self.id_usuario = id_usuario
+        self.rol = rol
+        self.vence = vence
+        self.receive = receive
+        self.send = send
+        self.canal = None
+        self.reemplazado = False
+
+    def _sobre(self, tipo, datos=None):
+        return {
+            "tipo": tipo,
+            "datos": datos,
+            "de": self.canal,
+            "rol": self.rol,
+            "id_usuario": self.id_usuario,
+        }
+
+    async def _enviar(self, mensaje):
+        await self.send({"type": "websocket.send", "text": json.dumps(mensaje)})
+
+    async def _desde_cliente(self):
+        """Retransmite lo que manda el navegador; None si se desconectó."""
+        while True:
+            evento = await self.receive()
+            if evento["type"] == "websocket.disconnect":
+                return None
+
+            texto = evento.get("text")
+            if texto is None or len(texto) > MENSAJE_MAXIMO:
+                return CIERRE_MENSAJE_GRANDE
+
+            try:
+                mensaje = json.loads(texto)
+                tipo = mensaje.get("tipo")
+            except (ValueError, AttributeError):
+                tipo = None
+            if tipo not in TIPOS_RELEVO:
+                await self._enviar({"tipo": "error", "detail": "Mensaje no soportado."})
+                continue
+
+            await capa.grupo_enviar(self.grupo, self._sobre(tipo, mensaje.get("datos")))
+
+    async def _desde_sala(self):
+        """Entrega al navegador lo que llega del otro participante."""
+        while True:
+            sobre = await capa.recibir(self.canal)
+            tipo = sobre["tipo"]
+            if tipo == "_saturado":
+                return CIERRE_SATURADO
+            if sobre["de"] == self.canal:
+                continue
+            if sobre["id_usuario"] == self.id_usuario:
+                # El mismo usuario entró desde otra pestaña: esa conexión gana
+                if tipo == "entro":
+                    self.reemplazado = True
+                    return CIERRE_REEMPLAZADO
+                continue
+            if tipo == "entro":
+                await capa.enviar(sobre["de"], self._sobre("presente"))
+            await self._enviar({"tipo": tipo, "rol": sobre["rol"], "datos": sobre["datos"]})
+
+    async def atender(self):
+        self.canal = await capa.nuevo_canal()
+        await capa.grupo_agregar(self.grupo, self.canal)
+        codigo = None
+        try:
+            await self._enviar({
+                "tipo": "bienvenida",
+                "rol": self.rol,
+                "ice_servers": ICE_SERVERS,
+            })
+            await capa.grupo_enviar(self.grupo, self._sobre("entro"))
+
+            tareas = {
+                asyncio.ensure_future(self._desde_cliente()),
+                asyncio.ensure_future(self._desde_sala()),
+            }
+            hechas, pendientes = await asyncio.wait(
+                tareas,
+                timeout=max(self.vence - time.time(), 0),
+                return_when=asyncio.FIRST_COMPLETED,
+            )
+            for tarea in pendientes:
+                tarea.cancel()
+            await asyncio.gather(*pendientes, return_exceptions=True)
+
+            codigo = hechas.pop().result() if hechas else CIERRE_TOKEN_VENCIDO
+        finally:
+            await capa.grupo_descartar(self.grupo, self.canal)
+            if not self.reemplazado:
+                await capa.grupo_enviar(self.grupo, self._sobre("salio"))
+            await capa.cerrar_canal(self.canal)
+
+        if codigo is not None:
+            await self.send({"type": "websocket.close", "code": codigo})
+
+
+async def aplicacion(scope, receive, send):
+    """Aplicación ASGI para scope 'websocket' (la enruta backend/asgi.py)."""
+    evento = await receive()
+    if evento["type"] != "websocket.connect":
+        return
+
+    coincidencia = RUTA.match(scope["path"])
+    if coincidencia is None:
+        await send({"type": "websocket.close", "code": CIERRE_NO_ENCONTRADO})
+        return
+
+    id_cita = int(coincidencia["id_cita"])
+    parametros = parse_qs(scope.get("query_string", b"").decode())
+    token = parametros.get("token", [None])[0]
+
+    sesion = await autorizar(id_cita, token)
+    if sesion is None:
+        await send({"type": "websocket.close", "code": CIERRE_NO_AUTORIZADO})
+        return
+
+    await send({"type": "websocket.accept"})
+    await Participante(id_cita, *sesion, receive, send).atender()
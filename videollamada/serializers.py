@@ -0,0 +1,7 @@
+from rest_framework import serializers
+
+
+class SondaResultadoSerializer(serializers.Serializer):
+    bajada_kbps = serializers.FloatField(min_value=0)
+    subida_kbps = serializers.FloatField(min_value=0)
+    rtt_ms = serializers.FloatField(min_value=0)
@@ -1,4 +1,10 @@
+from datetime import timedelta
+
 from django.db import connection, DatabaseError
+from django.utils import timezone
+
+from .models import SondaVideollamada
+from .sonda import perfil_mas_bajo, perfil_recomendado
 
 
 def sp_videollamada_crear(id_cita, enlace):
@@ -28,3 +34,76 @@ def sp_videollamada_get(id_cita):
 
         except DatabaseError as e:
             raise e
+
+
+def cita_participantes(id_cita):
+    """
+    Usuarios (paciente y médico) y horario de una cita en una consulta.
+
+    Returns:
+        dict | None: {"id_usuario_paciente", "id_usuario_medico", "fecha", "hora"}
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT p.ID_Usuario, m.ID_Usuario, a.Fecha, a.Hora
+            FROM cita c
+            JOIN paciente p ON p.ID_Paciente = c.ID_Paciente
+            JOIN medico m ON m.ID_Medico = c.ID_Medico
+            LEFT JOIN Agenda a ON a.ID_Agenda = c.ID_Agenda
+            WHERE c.ID_Cita = %s
+            """,
+            [id_cita],
+        )
+        row = cursor.fetchone()
+    if not row:
+        return None
+    return {
+        "id_usuario_paciente": row[0],
+        "id_usuario_medico": row[1],
+        "fecha": row[2],
+        "hora": row[3],
+    }
+
+
+# =============================================================================
+# SONDA DE ANCHO DE BANDA
+# =============================================================================
+
+# Mediciones más viejas no representan el enlace actual
+SONDA_VIGENCIA = timedelta(hours=1)
+
+
+def sonda_registrar(id_cita, id_usuario, rol, bajada_kbps, subida_kbps, rtt_ms):
+    """Guarda una medición y devuelve la fila (con su perfil recomendado)."""
+    return SondaVideollamada.objects.create(
+        id_cita=id_cita,
+        id_usuario=id_usuario,
+        rol=rol,
+        bajada_kbps=bajada_kbps,
+        subida_kbps=subida_kbps,
+        rtt_ms=rtt_ms,
+        perfil=perfil_recomendado(bajada_kbps, subida_kbps, rtt_ms),
+    )
+
+
+def sonda_perfil_llamada(id_cita):
+    """
+    Perfil de la llamada según la última medición reciente de cada rol.
+
+    Returns:
+        dict: {"perfil", "por_rol": {rol: perfil}}; perfil None si nadie midió
+    """
+    por_rol = {}
+    recientes = (
+        SondaVideollamada.objects
+        .filter(id_cita=id_cita, creado__gte=timezone.now() - SONDA_VIGENCIA)
+        .order_by("-creado")
+        .values_list("rol", "perfil")
+    )
+    for rol, perfil in recientes:
+        por_rol.setdefault(rol, perfil)
+    return {
+        "perfil": perfil_mas_bajo(por_rol.values()) if por_rol else None,
+        "por_rol": por_rol,
+    }
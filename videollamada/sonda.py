@@ -0,0 +1,76 @@
+"""
+Sonda de ancho de banda para videollamadas - Salud Rural
+
+El navegador mide su enlace antes de la llamada:
+1. RTT: varios GET /sonda/?bytes=0 (se toma el menor tiempo)
+2. Bajada: GET /sonda/?bytes=N y mide cuánto tarda en llegar
+3. Subida: PUT /sonda/ con N bytes; el servidor los lee y descarta
+4. POST /sonda/ con los resultados → se guardan y se devuelve el perfil
+
+La bajada usa bytes aleatorios (generados una vez por proceso) para que
+ningún proxy ni compresión gzip altere la medición.
+
+Perfiles (límites pensados para WebRTC con VP8/Opus):
+- hd:    720p, requiere ~1.5 Mbps en ambos sentidos y RTT < 300 ms
+- baja:  240p a 15 fps, requiere ~300 kbps
+- audio: solo audio (Opus ~32 kbps), para 2G/3G
+"""
+
+import os
+
+from django.conf import settings
+
+
+# Máximo de bytes por descarga/subida de prueba
+TAMANO_MAXIMO = getattr(settings, "VIDEOLLAMADA_SONDA_TAMANO_MAXIMO", 2 * 1024 * 1024)
+
+TAMANO_BLOQUE = 64 * 1024
+
+_bloque_aleatorio = os.urandom(TAMANO_BLOQUE)
+
+# De mejor a peor: (perfil, kbps mínimos en cada sentido, RTT máximo en ms)
+UMBRALES = [
+    ("hd", 1500, 300),
+    ("baja", 300, 800),
+]
+
+PERFILES = {
+    "hd": {"video": {"ancho": 1280, "alto": 720, "fps": 30}, "bitrate_max_kbps": 1500},
+    "baja": {"video": {"ancho": 320, "alto": 240, "fps": 15}, "bitrate_max_kbps": 300},
+    "audio": {"video": None, "bitrate_max_kbps": 32},
+}
+
+ORDEN = ["audio", "baja", "hd"]
+
+
+def carga(tamano):
+    """Genera 'tamano' bytes incompresibles por bloques."""
+    while tamano > 0:
+        bloque = _bloque_aleatorio[:min(tamano, TAMANO_BLOQUE)]
+        tamano -= len(bloque)
+        yield bloque
+
+
+def descartar(flujo, cantidad):
+    """Lee y descarta hasta 'cantidad' bytes del cuerpo. Devuelve los leídos."""
+    leidos = 0
+    while leidos < cantidad:
+        bloque = flujo.read(min(TAMANO_BLOQUE, cantidad - leidos))
+        if not bloque:
+            break
+        leidos += len(bloque)
+    return leidos
+
+
+def perfil_recomendado(bajada_kbps, subida_kbps, rtt_ms):
+    """Mejor perfil que el enlace sostiene (el sentido más lento manda)."""
+    capacidad = min(bajada_kbps, subida_kbps)
+    for perfil, kbps_minimos, rtt_maximo in UMBRALES:
+        if capacidad >= kbps_minimos and rtt_ms <= rtt_maximo:
+            return perfil
+    return "audio"
+
+
+def perfil_mas_bajo(perfiles):
+    """Perfil de la llamada: el del participante con peor enlace."""
+    return min(perfiles, key=ORDEN.index)
@@ -0,0 +1,82 @@
+"""
+Tokens de acceso a videollamadas - Salud Rural
+
+Al configurar el enlace (sp_videollamada_crear) se emite un token firmado
+(HMAC con SECRET_KEY, django.core.signing) por participante. El token
+lleva cita, usuario, rol, enlace y vencimiento, así que validar un ingreso
+es solo verificar la firma y la fecha: no se consulta la BD.
+
+- Vence VIGENCIA_HORAS después del inicio de la cita (o de la emisión, si
+  la cita no tiene horario o ya empezó).
+- La sal separa estos tokens de cualquier otro valor firmado del proyecto.
+- Si el médico cambia el enlace, los tokens anteriores siguen llevando el
+  enlace viejo hasta vencer: conviene reconfigurar solo antes de la cita.
+"""
+
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.core import signing
+from django.utils import timezone
+
+
+SAL = "videollamada.union"
+
+VIGENCIA_HORAS = getattr(settings, "VIDEOLLAMADA_TOKEN_VIGENCIA_HORAS", 2)
+
+
+class TokenInvalido(Exception):
+    """Firma incorrecta, token alterado o vencido."""
+
+
+def vencimiento(fecha, hora, ahora=None):
+    """Inicio de la cita (hora local de Agenda) + VIGENCIA_HORAS."""
+    ahora = ahora or timezone.now()
+    margen = timedelta(hours=VIGENCIA_HORAS)
+    if fecha is None or hora is None:
+        return ahora + margen
+    inicio = timezone.make_aware(datetime.combine(fecha, hora))
+    return max(inicio, ahora) + margen
+
+
+def emitir(id_cita, id_usuario, rol, enlace, expira):
+    """Token firmado para que un participante entre a la videollamada."""
+    return signing.dumps(
+        {
+            "c": id_cita,
+            "u": id_usuario,
+            "r": rol,
+            "e": enlace,
+            "x": int(expira.timestamp()),
+        },
+        salt=SAL,
+        compress=True,
+    )
+
+
+def validar(token):
+    """
+    Verifica firma y vencimiento.
+
+    Returns:
+        dict: {"id_cita", "id_usuario", "rol", "enlace", "expira"}
+
+    Raises:
+        TokenInvalido
+    """
+    try:
+        datos = signing.loads(token, salt=SAL)
+    except signing.BadSignature:
+        raise TokenInvalido("Token de videollamada inválido.")
+
+    expira = datetime.fromtimestamp(datos["x"], tz=timezone.get_current_timezone())
+    if expira <= timezone.now():
+        raise TokenInvalido("El token de videollamada venció.")
+
+    return {
+        "id_cita": datos["c"],
+        "id_usuario": datos["u"],
+        "rol": datos["r"],
+        "enlace": datos["e"],
+        "expira": expira,
+    }
@@ -1,7 +1,24 @@
 from django.urls import path
+from rest_framework.permissions import AllowAny
+
 from .views import VideollamadaViewSet
 
 urlpatterns = [
+    # Sin autenticación: el token firmado es la credencial y así no se
+    # consulta el usuario del JWT en la BD
+    path(
+        'videollamada/unirse/',
+        VideollamadaViewSet.as_view(
+            {'get': 'unirse'},
+            authentication_classes=[],
+            permission_classes=[AllowAny],
+        ),
+    ),
     path('videollamada/<int:pk>/', VideollamadaViewSet.as_view({'get': 'retrieve'})),
+    path('videollamada/<int:pk>/sonda/', VideollamadaViewSet.as_view({
+        'get': 'sonda_descarga',
+        'put': 'sonda_subida',
+        'post': 'sonda_resultado',
+    })),
     path('videollamada/configurar/<int:pk>/', VideollamadaViewSet.as_view({'post': 'crear'})),
 ]
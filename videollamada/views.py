@@ -7,16 +7,23 @@ Con PERMISOS implementados para proteger privacidad.
 Lógica de permisos:
 - Crear enlace: Solo el médico de la cita
 - Ver enlace: Solo médico o paciente involucrados en la cita
+- Unirse: token firmado emitido al crear/ver el enlace (sin BD)
 """
 
 from rest_framework import status, viewsets
 from rest_framework.response import Response
-from rest_framework.permissions import IsAuthenticated
+from django.http import StreamingHttpResponse
+from rest_framework.permissions import AllowAny, IsAuthenticated
 from django.db import DatabaseError
 
 from backend.permissions import IsMedico
 
+from . import sonda, tokens
+from .serializers import SondaResultadoSerializer
 from .services import (
+    cita_participantes,
+    sonda_perfil_llamada,
+    sonda_registrar,
     sp_videollamada_crear,
     sp_videollamada_get
 )
@@ -29,10 +36,13 @@ class VideollamadaViewSet(viewsets.ViewSet):
     Endpoints:
     - POST /api/videollamada/:id_cita/  → Crear enlace (médico de la cita)
     - GET  /api/videollamada/:id_cita/  → Ver enlace (involucrados en la cita)
+    - GET  /api/videollamada/unirse/?token=  → Validar token de ingreso
+    - GET/PUT/POST /api/videollamada/:id_cita/sonda/  → Medir enlace
     
     Permisos:
     - crear: Solo el médico asignado a la cita
     - retrieve: Solo médico o paciente de la cita
+    - unirse: El token firmado es la credencial
     
     Uso: Teleconsulta mediante videollamada (Zoom, Google Meet, etc.)
     """
@@ -43,11 +53,31 @@ class VideollamadaViewSet(viewsets.ViewSet):
         
         - crear: Solo Médicos (validación adicional en el método)
         - retrieve: Autenticado (validación adicional en el método)
+        - unirse: Público (valida el token firmado)
         """
         if self.action == 'crear':
             return [IsMedico()]
+        if self.action == 'unirse':
+            return [AllowAny()]
         return [IsAuthenticated()]
     
+    def get_authenticators(self):
+        """
+        Sonda de descarga/subida: JWT sin consultar la BD.
+        
+        JWTAuthentication carga el Usuario en cada petición; en la sonda ese
+        viaje a la BD se sumaría al RTT medido. JWTStatelessUserAuthentication
+        solo verifica firma y vencimiento (request.user es un TokenUser).
+        
+        DRF crea los autenticadores antes de fijar self.action, por eso se
+        resuelve la acción desde action_map.
+        """
+        accion = getattr(self, 'action_map', {}).get(self.request.method.lower())
+        if accion in ('sonda_descarga', 'sonda_subida'):
+            from rest_framework_simplejwt.authentication import JWTStatelessUserAuthentication
+            return [JWTStatelessUserAuthentication()]
+        return super().get_authenticators()
+    
     # =========================================================================
     # ENDPOINTS DE ESCRITURA
     # =========================================================================
@@ -69,7 +99,8 @@ class VideollamadaViewSet(viewsets.ViewSet):
             }
         
         Response:
-            200: Enlace creado/actualizado
+            200: Enlace creado/actualizado, con tokens de ingreso
+                 {"paciente": ..., "medico": ...} para compartir
             400: Falta enlace o datos inválidos
             403: No es el médico de la cita
             404: Cita no encontrada
@@ -89,25 +120,23 @@ class VideollamadaViewSet(viewsets.ViewSet):
             )
         
         # Validar que el médico está asignado a esta cita
-        from citas.models import Cita
-        try:
-            cita = Cita.objects.get(id_cita=int(pk))
-            
-            # Verificar que el médico autenticado es el asignado a la cita
-            if cita.id_usuario_medico.id_usuario != request.user.id_usuario:
-                return Response(
-                    {
-                        "detail": "Solo el médico asignado a la cita puede crear el enlace.",
-                        "hint": "Esta cita no te fue asignada."
-                    },
-                    status=status.HTTP_403_FORBIDDEN
-                )
-        except Cita.DoesNotExist:
+        cita = cita_participantes(int(pk))
+        if cita is None:
             return Response(
                 {"detail": "La cita no existe."},
                 status=status.HTTP_404_NOT_FOUND
             )
         
+        # Verificar que el médico autenticado es el asignado a la cita
+        if cita["id_usuario_medico"] != request.user.id_usuario:
+            return Response(
+                {
+                    "detail": "Solo el médico asignado a la cita puede crear el enlace.",
+                    "hint": "Esta cita no te fue asignada."
+                },
+                status=status.HTTP_403_FORBIDDEN
+            )
+        
         try:
             mensaje = sp_videollamada_crear(
                 int(pk),
@@ -128,10 +157,22 @@ class VideollamadaViewSet(viewsets.ViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
+        # Tokens de ingreso: desde aquí unirse no consulta la BD
+        expira = tokens.vencimiento(cita["fecha"], cita["hora"])
+        
         return Response(
             {
                 "detail": mensaje,
-                "enlace": enlace
+                "enlace": enlace,
+                "tokens": {
+                    "paciente": tokens.emitir(
+                        int(pk), cita["id_usuario_paciente"], "Paciente", enlace, expira
+                    ),
+                    "medico": tokens.emitir(
+                        int(pk), cita["id_usuario_medico"], "Medico", enlace, expira
+                    ),
+                },
+                "expira": expira
             },
             status=status.HTTP_200_OK
         )
@@ -152,39 +193,36 @@ class VideollamadaViewSet(viewsets.ViewSet):
             pk: ID de la cita
         
         Response:
-            200: Enlace de videollamada
+            200: Enlace de videollamada (+ token de ingreso del participante)
             403: No es participante de la cita
             404: Cita o enlace no encontrado
         """
         # VALIDACIÓN DE OWNERSHIP: Solo involucrados en la cita
-        from citas.models import Cita
-        try:
-            cita = Cita.objects.get(id_cita=int(pk))
-            
-            # Verificar que el usuario es médico o paciente de esta cita
-            es_medico_cita = (request.user.rol == 'Medico' and 
-                            cita.id_usuario_medico.id_usuario == request.user.id_usuario)
-            
-            es_paciente_cita = (request.user.rol == 'Paciente' and 
-                            cita.id_usuario_paciente.id_usuario == request.user.id_usuario)
-            
-            es_admin = request.user.rol == 'Administrador'
-            
-            if not (es_medico_cita or es_paciente_cita or es_admin):
-                return Response(
-                    {
-                        "detail": "No tienes permiso para ver este enlace.",
-                        "hint": "Solo los participantes de la cita pueden acceder al enlace."
-                    },
-                    status=status.HTTP_403_FORBIDDEN
-                )
-                
-        except Cita.DoesNotExist:
+        cita = cita_participantes(int(pk))
+        if cita is None:
             return Response(
                 {"detail": "La cita no existe."},
                 status=status.HTTP_404_NOT_FOUND
             )
         
+        # Verificar que el usuario es médico o paciente de esta cita
+        es_medico_cita = (request.user.rol == 'Medico' and 
+                        cita["id_usuario_medico"] == request.user.id_usuario)
+        
+        es_paciente_cita = (request.user.rol == 'Paciente' and 
+                        cita["id_usuario_paciente"] == request.user.id_usuario)
+        
+        es_admin = request.user.rol == 'Administrador'
+        
+        if not (es_medico_cita or es_paciente_cita or es_admin):
+            return Response(
+                {
+                    "detail": "No tienes permiso para ver este enlace.",
+                    "hint": "Solo los participantes de la cita pueden acceder al enlace."
+                },
+                status=status.HTTP_403_FORBIDDEN
+            )
+        
         try:
             data = sp_videollamada_get(int(pk))
             
@@ -211,7 +249,168 @@ class VideollamadaViewSet(viewsets.ViewSet):
                 status=status.HTTP_404_NOT_FOUND
             )
         
+        # Token para los siguientes ingresos (el admin no participa)
+        enlace = data.get("enlace") or data.get("Enlace")
+        if enlace and not es_admin:
+            expira = tokens.vencimiento(cita["fecha"], cita["hora"])
+            data["token"] = tokens.emitir(
+                int(pk), request.user.id_usuario, request.user.rol, enlace, expira
+            )
+            data["expira"] = expira
+        
         return Response(data, status=status.HTTP_200_OK)
+    
+    def unirse(self, request):
+        """
+        GET /api/videollamada/unirse/?token=...
+        
+        Valida un token de ingreso y devuelve el enlace. Solo verifica la
+        firma HMAC y el vencimiento: no consulta la BD (ni siquiera el
+        usuario del JWT, la ruta no usa autenticación).
+        
+        Response:
+            200: {"id_cita", "id_usuario", "rol", "enlace", "expira"}
+            400: Falta el token
+            403: Token inválido o vencido
+        """
+        token = request.query_params.get("token")
+        if not token:
+            return Response(
+                {"detail": "Debe proporcionar el token de la videollamada."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        try:
+            datos = tokens.validar(token)
+        except tokens.TokenInvalido as e:
+            return Response(
+                {
+                    "detail": str(e),
+                    "hint": "Solicita nuevamente el enlace desde tus citas."
+                },
+                status=status.HTTP_403_FORBIDDEN
+            )
+        
+        return Response(datos, status=status.HTTP_200_OK)
+    
+    # =========================================================================
+    # SONDA DE ANCHO DE BANDA
+    # =========================================================================
+    
+    def sonda_descarga(self, request, pk=None):
+        """
+        GET /api/videollamada/:id_cita/sonda/?bytes=N
+        
+        Devuelve N bytes aleatorios para medir bajada (bytes=0 para RTT).
+        No consulta la cita: no expone datos y así la medición no incluye
+        el tiempo de la BD.
+        
+        Response:
+            200: application/octet-stream de N bytes
+            400: N inválido o mayor al máximo
+        """
+        try:
+            tamano = int(request.query_params.get("bytes", 0))
+        except ValueError:
+            tamano = -1
+        if not 0 <= tamano <= sonda.TAMANO_MAXIMO:
+            return Response(
+                {"detail": f"'bytes' debe estar entre 0 y {sonda.TAMANO_MAXIMO}."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        respuesta = StreamingHttpResponse(
+            sonda.carga(tamano), content_type="application/octet-stream"
+        )
+        respuesta["Content-Length"] = str(tamano)
+        respuesta["Cache-Control"] = "no-store"
+        respuesta["Content-Encoding"] = "identity"
+        return respuesta
+    
+    def sonda_subida(self, request, pk=None):
+        """
+        PUT /api/videollamada/:id_cita/sonda/
+        
+        Recibe y descarta el cuerpo (application/octet-stream) para medir
+        subida; el cliente mide el tiempo total de la petición.
+        
+        Response:
+            200: {"recibidos": N}
+            400: Content-Length inválido
+            413: Cuerpo mayor al máximo
+        """
+        try:
+            cantidad = int(request.META.get("CONTENT_LENGTH") or 0)
+        except ValueError:
+            cantidad = -1
+        if cantidad < 0:
+            return Response(
+                {"detail": "Content-Length inválido."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if cantidad > sonda.TAMANO_MAXIMO:
+            return Response(
+                {"detail": f"Máximo {sonda.TAMANO_MAXIMO} bytes por prueba."},
+                status=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+            )
+        
+        recibidos = sonda.descartar(request.stream, cantidad) if cantidad else 0
+        return Response({"recibidos": recibidos}, status=status.HTTP_200_OK)
+    
+    def sonda_resultado(self, request, pk=None):
+        """
+        POST /api/videollamada/:id_cita/sonda/
+        
+        Registra la medición del participante y recomienda un perfil.
+        
+        Request Body:
+            {"bajada_kbps": 850, "subida_kbps": 240, "rtt_ms": 320}
+        
+        Response:
+            201: {
+                "perfil": "audio" | "baja" | "hd",      (enlace propio)
+                "configuracion": {...},                  (resolución/bitrate)
+                "perfil_llamada": ...,                   (peor de ambos)
+                "por_rol": {"Paciente": ..., "Medico": ...}
+            }
+            403: No es participante de la cita
+            404: Cita no encontrada
+        """
+        serializer = SondaResultadoSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        
+        cita = cita_participantes(int(pk))
+        if cita is None:
+            return Response(
+                {"detail": "La cita no existe."},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        
+        participante = {
+            "Medico": cita["id_usuario_medico"],
+            "Paciente": cita["id_usuario_paciente"],
+        }.get(request.user.rol)
+        if participante != request.user.id_usuario:
+            return Response(
+                {"detail": "Solo los participantes de la cita pueden registrar mediciones."},
+                status=status.HTTP_403_FORBIDDEN
+            )
+        
+        medicion = sonda_registrar(
+            int(pk), request.user.id_usuario, request.user.rol, **serializer.validated_data
+        )
+        llamada = sonda_perfil_llamada(int(pk))
+        
+        return Response(
+            {
+                "perfil": medicion.perfil,
+                "configuracion": sonda.PERFILES[medicion.perfil],
+                "perfil_llamada": llamada["perfil"],
+                "configuracion_llamada": sonda.PERFILES[llamada["perfil"]],
+                "por_rol": llamada["por_rol"],
+            },
+            status=status.HTTP_201_CREATED
+        )
 
 
 # =============================================================================
@@ -221,6 +420,7 @@ class VideollamadaViewSet(viewsets.ViewSet):
 # 1. PERMISOS IMPLEMENTADOS:
 #    - crear: IsMedico + validación que sea el médico de la cita
 #    - retrieve: IsAuthenticated + validación de participación en la cita
+#    - unirse: AllowAny, sin autenticación (el token firmado es la credencial)
 #
 # 2. VALIDACIÓN DE OWNERSHIP:
 #    - Solo médico de la cita puede crear enlace
@@ -245,7 +445,28 @@ class VideollamadaViewSet(viewsets.ViewSet):
 #    - No se pueden ver enlaces de citas ajenas
 #    - Enlaces temporales (válidos solo durante la cita)
 #
-# 6. MEJORAS FUTURAS:
+# 6. TOKENS DE INGRESO (tokens.py):
+#    - crear devuelve un token por participante; retrieve, el del usuario
+#    - Llevan cita, usuario, rol, enlace y vencimiento (inicio de la cita
+#      + VIDEOLLAMADA_TOKEN_VIGENCIA_HORAS), firmados con SECRET_KEY
+#    - unirse solo verifica firma y fecha: cero consultas por ingreso
+#
+# 7. SEÑALIZACIÓN PROPIA (senalizacion.py):
+#    - ws://<host>/ws/videollamada/<id_cita>/?token=... (backend/asgi.py)
+#    - Retransmite offer/answer/ice entre paciente y médico para WebRTC
+#      directo, sin depender de una sala de terceros
+#    - Capa de canales en memoria por defecto (un proceso); configurable
+#      en VIDEOLLAMADA_CAPA_SENALIZACION
+#
+# 8. SONDA DE ENLACE (sonda.py):
+#    - GET ?bytes=N (bajada/RTT), PUT (subida), POST (resultado)
+#    - GET y PUT autentican con JWTStatelessUserAuthentication (sin cargar
+#      el Usuario): la medición no incluye la BD
+#    - Perfil: hd (>= 1.5 Mbps), baja (>= 300 kbps) o audio (2G/3G)
+#    - perfil_llamada = el peor de las mediciones recientes de ambos
+#    - Se guarda en videollamada_sonda para revisar conexiones lentas
+#
+# 9. MEJORAS FUTURAS:
 #    - Integración directa con APIs de Zoom/Meet
 #    - Generación automática de enlaces
 #    - Grabación de consultas (con consentimiento)